@@ -1,54 +1,201 @@
--- participants Tablosu
-CREATE TABLE participants (
-    id SERIAL PRIMARY KEY,                     -- Otomatik artan benzersiz ID
-    serial_number VARCHAR(50) UNIQUE NOT NULL, -- 'MCWorldBK-01' gibi benzersiz seri no
-    video_url TEXT NOT NULL,                   -- Bunny CDN video linki
-    like_count INTEGER DEFAULT 0 NOT NULL,     -- Beğeni sayısı (güncel tutulacak)
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-);
-
--- students Tablosu
-CREATE TABLE students (
+-- Veritabanı şemasının okunabilir özeti.
+-- Şemanın asıl kaynağı app/db/migrations/ altındaki sürümlü SQL dosyalarıdır;
+-- uygulama başlarken bekleyenleri uygular (veya: python -m app.db.migrate).
+-- Bu dosya o migration'ların sırayla birleştirilmiş halidir; şema değişikliği
+-- için yeni bir migration ekleyin ve bu dosyayı yeniden üretin:
+--   cat app/db/migrations/*.sql > SQLQueries.sql  (bu başlığı koruyarak)
+
+-- 0001: Başlangıç şeması (app/models ile birebir aynı)
+-- Tablolar zaten varsa (ör. daha önce Base.metadata.create_all ile oluşturulmuş
+-- bir veritabanı) dokunulmaz; böylece mevcut veritabanları da bu sürümü benimser.
+
+-- Eski elle yazılmış şema (students.student_number) otomatik taşınamaz
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+               WHERE table_schema = current_schema() AND table_name = 'students' AND column_name = 'student_number')
+       AND NOT EXISTS (SELECT 1 FROM information_schema.columns
+                       WHERE table_schema = current_schema() AND table_name = 'students' AND column_name = 'email') THEN
+        RAISE EXCEPTION 'students tablosu eski şemada (student_number). email/hashed_password/full_name kolonlarına elle taşıyın.';
+    END IF;
+END
+$$;
+
+CREATE TABLE IF NOT EXISTS participants (
     id SERIAL PRIMARY KEY,
-    student_number VARCHAR(100) UNIQUE NOT NULL, -- Öğrenci Numarası (Giriş için)
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-    -- Not: Öğrenci bilgilerini (isim vb.) burada tutmak yerine,
-    -- sadece giriş ve oy takibi için gerekli minimum bilgiyi (numara) tutabiliriz.
-    -- İleride gerekirse eklenebilir.
+    serial_number VARCHAR(50) NOT NULL,        -- 'MCWorldBK-01' gibi benzersiz seri no
+    video_url VARCHAR NOT NULL,                -- Bunny CDN video linki
+    like_count INTEGER NOT NULL DEFAULT 0,     -- Beğeni sayısı (oy yolu günceller)
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    updated_at TIMESTAMP WITH TIME ZONE
 );
+CREATE UNIQUE INDEX IF NOT EXISTS ix_participants_serial_number ON participants (serial_number);
 
--- votes Tablosu
-CREATE TABLE votes (
+CREATE TABLE IF NOT EXISTS students (
     id SERIAL PRIMARY KEY,
-    student_id INTEGER NOT NULL,               -- Oy veren öğrencinin ID'si
-    participant_id INTEGER NOT NULL,           -- Oy verilen dünyanın ID'si
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    email VARCHAR(255) NOT NULL,               -- Giriş için kullanılır
+    hashed_password VARCHAR(255) NOT NULL,
+    full_name VARCHAR(200),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    updated_at TIMESTAMP WITH TIME ZONE
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_students_email ON students (email);
+
+CREATE TABLE IF NOT EXISTS votes (
+    id SERIAL PRIMARY KEY,
+    student_id INTEGER NOT NULL REFERENCES students (id) ON DELETE CASCADE,
+    participant_id INTEGER NOT NULL REFERENCES participants (id) ON DELETE CASCADE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    -- Bir öğrencinin aynı dünyaya birden fazla oy vermesini engeller
+    CONSTRAINT unique_student_vote UNIQUE (student_id, participant_id)
+);
+-- 0002: Katalog sürüm sayacı (ETag / 304, bkz. app/core/catalog_version.py)
+-- participants veya votes tablosunu değiştiren her statement sayacı artırır ve
+-- yeni değeri 'catalog_version' kanalına NOTIFY eder. Statement seviyesinde
+-- trigger: toplu yazımlar (import, oy tamponu) tek artış yapar.
+
+CREATE SEQUENCE IF NOT EXISTS catalog_version_seq;
+
+CREATE OR REPLACE FUNCTION bump_catalog_version() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('catalog_version', nextval('catalog_version_seq')::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER participants_catalog_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON participants
+FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version();
+
+CREATE OR REPLACE TRIGGER votes_catalog_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON votes
+FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version();
+-- 0003: Oy ve skor tablosu sıcak yolları için indeksler
+-- (scripts/check_query_plans.py bu sorguların sıralı taramaya düşmediğini doğrular)
+
+-- Skor tablosu: ORDER BY like_count DESC, id LIMIT n
+-- (get_participants_top5 / get_participants_top ve like_count'a göre keyset sayfalama)
+CREATE INDEX IF NOT EXISTS ix_participants_like_count_id ON participants (like_count DESC, id);
 
-    -- Bir öğrencinin aynı dünyaya birden fazla oy vermesini engelleme
-    CONSTRAINT unique_student_vote UNIQUE (student_id, participant_id),
+-- Bir dünyanın oyları: dünya silinirken ON DELETE CASCADE ve dünya bazlı oy sayımı
+CREATE INDEX IF NOT EXISTS ix_votes_participant_id ON votes (participant_id);
 
-    -- students tablosu ile ilişki (öğrenci silinirse oyları da silinebilir - CASCADE)
-    FOREIGN KEY (student_id) REFERENCES students (id) ON DELETE CASCADE,
+-- Öğrencinin oyları (get_votes_by_student, get_voted_participant_ids, toggle'daki
+-- limit sayımı ve silme) unique_student_vote (student_id, participant_id) indeksini
+-- kullanır; participant_id'ler indeksten okunur (index-only scan), ek indeks gerekmez.
 
-    -- participants tablosu ile ilişki (dünya silinirse oyları da silinebilir - CASCADE)
-    FOREIGN KEY (participant_id) REFERENCES participants (id) ON DELETE CASCADE
+-- Birincil anahtarla aynı kolonu indeksleyen gereksiz indeksler (eski modellerdeki
+-- index=True); her oy INSERT'inde boşuna güncelleniyorlardı
+DROP INDEX IF EXISTS ix_votes_id;
+DROP INDEX IF EXISTS ix_participants_id;
+DROP INDEX IF EXISTS ix_students_id;
+-- 0004: like_count uzlaştırması için değişiklik izleme (bkz. app/crud/crud_reconcile.py)
+-- Uzlaştırma işi sadece son çalışmasından (watermark) bu yana oyu değişen
+-- dünyaları sayar: eklenen oylar votes.created_at ile, silinenler vote_deletions
+-- kaydıyla bulunur.
+
+-- Yeni oyları zamana göre bulmak için
+CREATE INDEX IF NOT EXISTS ix_votes_created_at ON votes (created_at);
+
+-- Silinen oyların kaydı (statement seviyesinde trigger doldurur)
+CREATE TABLE IF NOT EXISTS vote_deletions (
+    id BIGSERIAL PRIMARY KEY,
+    participant_id INTEGER NOT NULL,
+    student_id INTEGER NOT NULL,
+    vote_created_at TIMESTAMP WITH TIME ZONE,
+    -- now(): silen transaction'ın başlangıç zamanı (votes.created_at ile aynı anlam)
+    deleted_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
 );
+CREATE INDEX IF NOT EXISTS ix_vote_deletions_deleted_at ON vote_deletions (deleted_at);
 
--- updated_at sütununu otomatik güncellemek için bir trigger (isteğe bağlı ama önerilir)
--- Bu trigger, participants ve students tablolarındaki satırlar güncellendiğinde
--- updated_at alanını otomatik olarak ayarlar.
-CREATE OR REPLACE FUNCTION update_updated_at_column()
-RETURNS TRIGGER AS $$
+CREATE OR REPLACE FUNCTION log_vote_deletions() RETURNS trigger AS $$
 BEGIN
-   NEW.updated_at = NOW();
-   RETURN NEW;
+    INSERT INTO vote_deletions (participant_id, student_id, vote_created_at)
+    SELECT participant_id, student_id, created_at FROM removed_votes;
+    RETURN NULL;
 END;
-$$ language 'plpgsql';
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER votes_log_deletions
+AFTER DELETE ON votes
+REFERENCING OLD TABLE AS removed_votes
+FOR EACH STATEMENT EXECUTE FUNCTION log_vote_deletions();
+
+-- Periyodik işlerin kaldığı yer
+CREATE TABLE IF NOT EXISTS job_watermarks (
+    job_name VARCHAR(100) PRIMARY KEY,
+    watermark TIMESTAMP WITH TIME ZONE NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+);
+-- 0005: Parçalı (sharded) beğeni sayaçları (bkz. app/crud/crud_like_shards.py)
+-- LIKE_COUNTER_SHARDS > 0 iken oy yolu participants satırını güncellemez;
+-- değişimi dünyanın K sayaç satırından birine (öğrenci id'sine göre) ekler.
+-- Popüler bir dünyanın oyları böylece tek bir satır kilidinde sıraya girmez.
+-- Gerçek sayı: participants.like_count + sum(delta). Periyodik toplama (rollup)
+-- bu satırları silip participants.like_count'a ekler.
+
+CREATE TABLE IF NOT EXISTS participant_like_shards (
+    participant_id INTEGER NOT NULL REFERENCES participants (id) ON DELETE CASCADE,
+    shard SMALLINT NOT NULL,
+    delta INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (participant_id, shard)
+);
+-- 0006: Oylama analitiği için önceden toplanmış zaman kovaları (bkz. app/crud/crud_vote_stats.py)
+-- Dünya başına dakikalık ve saatlik eklenen/silinen oy sayıları. Periyodik iş
+-- sadece son çalışmasından (job_watermarks: vote_stats_rollup) bu yana eklenen
+-- oyları (votes.created_at) ve silinenleri (vote_deletions) kovalara ekler;
+-- /stats endpoint'leri votes tablosunu hiç taramaz. Kovalar UTC'ye göre hizalıdır.
+-- Dünya silinse de geçmişi kalsın diye participants'a FK yoktur.
+
+CREATE TABLE IF NOT EXISTS vote_stats_minute (
+    participant_id INTEGER NOT NULL,
+    bucket TIMESTAMP WITH TIME ZONE NOT NULL,
+    added INTEGER NOT NULL DEFAULT 0,
+    removed INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (participant_id, bucket)
+);
+-- Tüm dünyaların toplamı (/stats/overview) zaman aralığıyla okunur
+CREATE INDEX IF NOT EXISTS ix_vote_stats_minute_bucket ON vote_stats_minute (bucket);
+
+CREATE TABLE IF NOT EXISTS vote_stats_hour (
+    participant_id INTEGER NOT NULL,
+    bucket TIMESTAMP WITH TIME ZONE NOT NULL,
+    added INTEGER NOT NULL DEFAULT 0,
+    removed INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (participant_id, bucket)
+);
+CREATE INDEX IF NOT EXISTS ix_vote_stats_hour_bucket ON vote_stats_hour (bucket);
+-- 0007: Oy yolunda NOTIFY yok (bkz. app/core/catalog_version.py)
+-- NOTIFY gönderen transaction commit'te PostgreSQL'in global bildirim kuyruğu
+-- kilidini alır; 0002'deki trigger'lar her oyda NOTIFY ettiği için tüm
+-- worker'ların oy commit'leri bu kilitte sıraya giriyordu. Artık:
+--   - votes değişiklikleri ve participants.like_count güncellemeleri sayacı
+--     sadece artırır (nextval). Oyu yazan worker yeni sürümü kendi LISTEN
+--     bağlantısından, oy transaction'ı dışında ve birleştirerek duyurur; diğer
+--     worker'lar ayrıca periyodik sorguyla yakalar.
+--   - Katalog değişiklikleri (dünya ekleme/silme, serial_number/video_url) eskisi
+--     gibi NOTIFY eder.
+-- CREATE OR REPLACE TRIGGER (0002, 0004) PostgreSQL 14 gerektirir; bu migration
+-- DROP/CREATE kullanır.
+
+CREATE OR REPLACE FUNCTION bump_catalog_version_quiet() RETURNS trigger AS $$
+BEGIN
+    PERFORM nextval('catalog_version_seq');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS votes_catalog_version ON votes;
+CREATE TRIGGER votes_catalog_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON votes
+FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version_quiet();
 
-CREATE TRIGGER update_participants_updated_at BEFORE UPDATE
-ON participants FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+DROP TRIGGER IF EXISTS participants_catalog_version ON participants;
+CREATE TRIGGER participants_catalog_version
+AFTER INSERT OR DELETE OR TRUNCATE OR UPDATE OF serial_number, video_url, created_at ON participants
+FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version();
 
-CREATE TRIGGER update_students_updated_at BEFORE UPDATE
-ON students FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
\ No newline at end of file
+DROP TRIGGER IF EXISTS participants_like_count_version ON participants;
+CREATE TRIGGER participants_like_count_version
+AFTER UPDATE OF like_count ON participants
+FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version_quiet();
@@ -1,22 +1,35 @@
 # backend/app/api/deps.py
 
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
+import secrets
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import APIKeyHeader, OAuth2PasswordBearer
 from jose import JWTError, jwt
 from pydantic import ValidationError 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud, models, schemas
 from app.core.config import settings
-from app.db.database import SessionLocal, get_db 
+from app.core.principal_cache import principal_cache
+from app.core.rate_limit import (
+    ConcurrencyLimitReached, RateLimited, vote_concurrency_limiter, vote_rate_limiter,
+)
+from app.core.read_your_writes import recent_writers
+from app.db.database import AsyncReadSessionLocal, AsyncSessionLocal, get_async_db, has_read_replica
 
 # OAuth2 şeması. tokenUrl, token'ın alınacağı endpoint'i göstermeli.
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
 # Token'ı doğrulayıp mevcut öğrenciyi döndüren dependency
 async def get_current_student(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> models.Student:
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)
+) -> schemas.Student:
+    # Önbellekte doğrulanmış bir kayıt varsa JWT çözümü ve DB sorgusu yapılmaz
+    cached_student = principal_cache.get(token)
+    if cached_student is not None:
+        return cached_student
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -40,7 +53,101 @@ async def get_current_student(
         raise credentials_exception
 
     # ID ile öğrenciyi bul
-    student = crud.crud_student.get_student(db, student_id=user_id) # crud.get_student yerine
+    student = await crud.crud_student_async.get_student(db, student_id=user_id)
     if student is None:
         raise credentials_exception
-    return student
\ No newline at end of file
+
+    # ORM nesnesi yerine session'dan bağımsız bir anlık görüntü önbelleğe alınır
+    # (DB'den gelen veri zaten geçerli kabul edilir, tekrar doğrulanmaz)
+    principal = schemas.Student.model_construct(
+        **{field: getattr(student, field) for field in schemas.Student.model_fields}
+    )
+    principal_cache.put(token, principal, token_exp=payload.get("exp"))
+    # Bağlantı havuza geri verilir: okuma endpoint'leri ikinci bir session
+    # (get_read_db) açar; ilk bağlantı istek sonuna kadar tutulursa eşzamanlı
+    # soğuk istekler havuzu birbirini bekleyerek tüketir. Session endpoint'te
+    # tekrar kullanılırsa yeni bağlantı alır.
+    await db.close()
+    return principal
+
+# İstemcinin kendi yazdığını görmek için birincili istediği başlık (ör. birden
+# fazla worker varken oy verdikten hemen sonra): X-Read-Your-Writes: 1
+READ_YOUR_WRITES_HEADER = "x-read-your-writes"
+
+
+def _wants_primary(request: Request) -> bool:
+    if request.headers.get(READ_YOUR_WRITES_HEADER, "0") not in ("", "0"):
+        return True
+    # Token önbellekteyse (oy vermiş öğrencininki her zaman öyledir) son yazım penceresine bakılır
+    authorization = request.headers.get("authorization", "")
+    if authorization[:7].lower() == "bearer ":
+        principal = principal_cache.peek(authorization[7:])
+        return principal is not None and recent_writers.is_recent(principal.id)
+    return False
+
+
+# Okuma endpoint'leri için session: READ_DATABASE_URL tanımlıysa replika, değilse
+# birincil. Son READ_YOUR_WRITES_SECONDS içinde oy veren öğrenci veya
+# X-Read-Your-Writes başlığı gönderen istemci birincile yönlendirilir.
+async def get_read_db(request: Request):
+    session_factory = AsyncReadSessionLocal
+    if not has_read_replica or _wants_primary(request):
+        session_factory = AsyncSessionLocal
+    async with session_factory() as db:
+        yield db
+
+
+# Token'ın öğrenci id'si, DB'ye gitmeden: önbellekteki principal ya da JWT'nin
+# kendisi (imza doğrulanır). Geçersizse None; asıl 401'i get_current_student verir.
+def _token_student_id(token: str) -> Optional[int]:
+    principal = principal_cache.peek(token)
+    if principal is not None:
+        return principal.id
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        return int(payload["sub"])
+    except (JWTError, KeyError, TypeError, ValueError):
+        return None
+
+
+# /votes için giriş kontrolü (load shedding). Endpoint'in ilk dependency'si
+# olmalıdır: öğrenci başına hız limiti ve eşzamanlılık sınırı DB oturumu veya
+# öğrenci sorgusundan önce uygulanır, reddedilen istek DB'ye hiç ulaşmaz.
+# Önce eşzamanlılık sınırına bakılır: sunucunun 503 ile reddettiği istek
+# öğrencinin hız limiti hakkından düşmez (hemen tekrar denemesi 429 almaz).
+async def vote_admission(token: str = Depends(oauth2_scheme)):
+    try:
+        vote_concurrency_limiter.acquire()
+    except ConcurrencyLimitReached:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Sunucu şu anda çok yoğun, lütfen birkaç saniye sonra tekrar deneyin.",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        student_id = _token_student_id(token)
+        if student_id is not None:
+            try:
+                vote_rate_limiter.acquire(student_id)
+            except RateLimited as e:
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Çok hızlı oy veriyorsunuz, lütfen biraz bekleyin.",
+                    headers={"Retry-After": e.retry_after_header},
+                )
+        yield
+    finally:
+        vote_concurrency_limiter.release()
+
+
+# Yönetici endpoint'leri (api/endpoints/admin.py) için anahtar: X-Admin-API-Key
+# başlığı ADMIN_API_KEY ile eşleşmeli. ADMIN_API_KEY tanımlı değilse bu
+# endpoint'ler tamamen kapalıdır.
+admin_api_key_header = APIKeyHeader(name="X-Admin-API-Key", auto_error=False)
+
+
+async def require_admin_api_key(api_key: Optional[str] = Depends(admin_api_key_header)):
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not api_key or not secrets.compare_digest(api_key.encode(), settings.ADMIN_API_KEY.encode()):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin API key")
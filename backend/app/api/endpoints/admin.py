@@ -0,0 +1,93 @@
+# backend/app/api/endpoints/admin.py
+
+import asyncio
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, Path, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app import crud
+from app.api import deps
+from app.core.config import settings
+from app.core.export import EXPORT_CSV, ExportWriter, GzipEncoder, export_writer
+from app.db.database import AsyncReadSessionLocal
+
+# Tüm endpoint'ler X-Admin-API-Key ister (bkz. api/deps.py require_admin_api_key)
+router = APIRouter(dependencies=[Depends(deps.require_admin_api_key)])
+
+
+# Akışın gövdesi: satırlar cursor'dan parça parça okunur, kodlanır ve
+# (gerekirse) sıkıştırılarak gönderilir. Kodlama/sıkıştırma CPU işi olduğu
+# için thread'de yapılır; dışa aktarım sürerken oy istekleri beklemez.
+# Session burada açılır (istek dependency'lerinden bağımsız, akış bitene
+# kadar yaşar); tek transaction olduğu için çıktı tutarlı bir snapshot'tır.
+async def _export_body(dataset: str, writer: ExportWriter, chunk_size: int, compress: bool):
+    gzip = GzipEncoder() if compress else None
+
+    def encode(rows=None, last: bool = False) -> bytes:
+        data = writer.write(rows) if rows is not None else (writer.finish() if last else writer.begin())
+        if gzip is not None:
+            data = gzip.compress(data) + (gzip.flush() if last else b"")
+        return data
+
+    async with AsyncReadSessionLocal() as db:
+        data = encode()
+        if data:
+            yield data
+        async for rows in crud.crud_export.stream_export_rows_async(db, dataset, chunk_size):
+            data = await asyncio.to_thread(encode, rows)
+            if data:
+                yield data
+    yield await asyncio.to_thread(encode, last=True)
+
+
+# Accept-Encoding gzip'i kabul ediyor mu (RFC 9110): q-değerleri dikkate alınır,
+# "gzip;q=0" reddetmektir; gzip adıyla geçmiyorsa "*" kuralı geçerlidir.
+def _accepts_gzip(header: str) -> bool:
+    qualities = {}
+    for item in header.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
+
+# Turnuva sonuçlarının dışa aktarımı:
+#   ranking: dünyalar, beğeni sayıları ve nihai sıraları
+#   ballots: her oy, öğrencisi (id, email, ad) ve dünyasıyla
+# format: csv, jsonl veya parquet. İstemci gzip kabul ediyorsa
+# CSV/JSON Lines anında sıkıştırılır (Content-Encoding: gzip). Okuma replikası
+# tanımlıysa oradan okunur.
+@router.get("/admin/export/{dataset}")
+async def export_results(
+    request: Request,
+    dataset: str = Path(..., pattern="^(ranking|ballots)$"),
+    format: str = Query(EXPORT_CSV, pattern="^(csv|jsonl|parquet)$"),
+    chunk_size: int = Query(settings.EXPORT_CHUNK_SIZE, ge=100, le=100_000),
+):
+    writer = export_writer(format, crud.crud_export.export_columns(dataset))
+
+    compress = writer.compressible and _accepts_gzip(request.headers.get("accept-encoding", ""))
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    headers = {
+        "Content-Disposition": f'attachment; filename="mcworlds-{dataset}-{stamp}.{writer.extension}"',
+        "Cache-Control": "no-store",
+        "Vary": "Accept-Encoding",
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        _export_body(dataset, writer, chunk_size, compress), media_type=writer.media_type, headers=headers
+    )
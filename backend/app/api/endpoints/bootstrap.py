@@ -0,0 +1,77 @@
+# backend/app/api/endpoints/bootstrap.py
+
+import json
+
+from fastapi import APIRouter, Depends, Query
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+from app import crud, schemas
+from app.api import deps
+from app.api.endpoints.participants import PAGE_LIMIT_MAX
+from app.api.endpoints.votes import voted_participant_ids
+from app.core.catalog_version import catalog_version
+from app.core.leaderboard import leaderboard
+from app.core.pagination import ORDER_BY_ID, cursor_key, encode_cursor
+from app.core.response_cache import catalog_response_cache, json_bytes_response
+from app.core.shared_tally import overlay_like_counts, sync_leaderboard, tally_stamp
+from app.db.database import get_async_db
+
+router = APIRouter()
+
+_STUDENT = TypeAdapter(schemas.Student)
+_PARTICIPANT_LIST = TypeAdapter(List[schemas.Participant])
+_VOTE_LIST = TypeAdapter(List[schemas.VoteOutSimple])
+
+
+# Kataloğun ilk sayfasının hazır JSON gövdesi ve sonraki sayfa cursor'ı.
+# Sürüm başına bir kez üretilir (bkz. core/response_cache.py).
+async def _catalog_page(db: AsyncSession, limit: int):
+    version = await catalog_version.current(db)
+    cache_key = ("bootstrap_worlds", limit, tally_stamp())
+    cached = catalog_response_cache.get(version, cache_key)
+    if cached is not None:
+        return cached[0], cached[1].get("X-Next-Cursor")
+    rows = await crud.crud_participant_async.get_participants_keyset(db, limit=limit, order_by=ORDER_BY_ID)
+    next_cursor = None
+    if len(rows) == limit:
+        next_cursor = encode_cursor(ORDER_BY_ID, cursor_key(ORDER_BY_ID, {"id": rows[-1].id}))
+    body = _PARTICIPANT_LIST.dump_json(overlay_like_counts(_PARTICIPANT_LIST.validate_python(rows, from_attributes=True)))
+    catalog_response_cache.put(version, cache_key, body, {"X-Next-Cursor": next_cursor} if next_cursor else {})
+    return body, next_cursor
+
+
+# Frontend açılışı için tek istek: öğrenci (/auth/me), kataloğun ilk sayfası
+# (/worlds), öğrencinin oyları (/votes/my-votes) ve skor tablosu (/worlds/top5).
+# Tüm okumalar tek DB session'ında yapılır (get_current_student ile aynı
+# session). Sıcak durumda (token ve katalog önbellekte, skor tablosu bellekte)
+# sadece oy listesi için tek sorgu çalışır; write-behind modunda hiç sorgu çalışmaz.
+# Cevap öğrenciye özel olduğu için ETag üretilmez.
+@router.get("/bootstrap", response_model=schemas.Bootstrap)
+async def bootstrap(
+    db: AsyncSession = Depends(get_async_db),
+    current_student: schemas.Student = Depends(deps.get_current_student),
+    limit: int = Query(100, ge=1, le=PAGE_LIMIT_MAX),
+    top: int = Query(5, ge=1, le=50),
+):
+    worlds_body, next_cursor = await _catalog_page(db, limit)
+    participant_ids = await voted_participant_ids(db, current_student.id)
+    if leaderboard.loaded:
+        sync_leaderboard()
+        top_participants = leaderboard.top(top)
+    else:
+        top_participants = _PARTICIPANT_LIST.validate_python(
+            await crud.crud_participant_async.get_participants_top(db, top), from_attributes=True
+        )
+
+    # Katalog gövdesi önbellekten byte olarak gelir; cevap parçalar birleştirilerek üretilir
+    body = b"".join((
+        b'{"student":', _STUDENT.dump_json(current_student),
+        b',"worlds":', worlds_body,
+        b',"next_cursor":', json.dumps(next_cursor).encode(),
+        b',"my_votes":', _VOTE_LIST.dump_json([schemas.VoteOutSimple(participant_id=i) for i in participant_ids]),
+        b',"top":', _PARTICIPANT_LIST.dump_json(top_participants),
+        b"}",
+    ))
+    return json_bytes_response(body, {"Cache-Control": "no-store"})
@@ -0,0 +1,19 @@
+# backend/app/api/endpoints/health.py
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.core.warmup import startup_report
+
+router = APIRouter()
+
+
+# Readiness probe: başlangıç ısınması (core/warmup.py) bitene kadar 503 döner.
+# Load balancer / platform health check'i buraya yönlendirilirse ilk istekler
+# soğuk havuz ve boş önbelleklere düşmez. Gövdede adım süreleri de vardır.
+@router.get("/health/ready", include_in_schema=False)
+async def ready():
+    report = startup_report.as_dict()
+    if startup_report.ready:
+        return JSONResponse({"status": "ready", **report})
+    return JSONResponse({"status": "starting", **report}, status_code=503)
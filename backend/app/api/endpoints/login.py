@@ -2,25 +2,39 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta 
 
 from app import crud, schemas, models 
 from app.api import deps
-from app.core.security import create_access_token, verify_password
+from app.core.security import PasswordHasherBusy, create_access_token, verify_password_async
 from app.core.config import settings 
-from app.db.database import get_db
+from app.db.database import get_async_db
 
 router = APIRouter()
 
 # Login endpoint'i
 @router.post("/auth/login", response_model=schemas.Token)
 async def login_for_access_token(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ):
-    student = crud.crud_student.get_student_by_email(db, email=form_data.username) 
-    if not student or not verify_password(form_data.password, student.hashed_password):
+    student = await crud.crud_student_async.get_student_by_email(db, email=form_data.username) 
+    # Bcrypt kuyruğunda beklerken DB bağlantısı tutulmasın, havuza geri verilsin
+    # (close sonrası nesne detached olur ama yüklenmiş alanlar okunabilir)
+    await db.close()
+    try:
+        # Bcrypt event loop'u bloklamasın diye ayrı havuzda çalışır
+        password_ok = student is not None and await verify_password_async(
+            form_data.password, student.hashed_password
+        )
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Sunucu şu anda çok yoğun, lütfen birkaç saniye sonra tekrar deneyin.",
+            headers={"Retry-After": "1"},
+        )
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Geçersiz email veya şifre",
@@ -36,6 +50,6 @@ async def login_for_access_token(
 # Mevcut kullanıcının bilgisini alma endpoint'i (Token gerektirir)
 @router.get("/auth/me", response_model=schemas.Student)
 async def read_users_me(
-    current_student: models.Student = Depends(deps.get_current_student)
+    current_student: schemas.Student = Depends(deps.get_current_student)
 ):
     return current_student
\ No newline at end of file
@@ -0,0 +1,92 @@
+# backend/app/api/endpoints/metrics.py
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from app.core.broadcaster import broadcaster
+from app.core.catalog_version import catalog_version
+from app.core.config import settings
+from app.core.metrics import CONTENT_TYPE, registry
+from app.core.principal_cache import principal_cache
+from app.core.rate_limit import vote_concurrency_limiter, vote_rate_limiter
+from app.core.response_cache import catalog_response_cache
+from app.core.security import password_verifier
+from app.core.shared_tally import shared_tally
+from app.core.vote_buffer import vote_buffer
+from app.core.vote_stats import stats_response_cache
+from app.db.database import async_engine, async_read_engine, engine, has_read_replica
+
+router = APIRouter()
+
+
+# Bileşenlerin kendi tuttuğu sayaçlar; sadece /metrics okunurken toplanır
+def _collect_components():
+    pools = {"async": async_engine.pool, "sync": engine.pool}
+    if has_read_replica:
+        pools["async_read"] = async_read_engine.pool
+    yield ("db_pool_connections", "gauge", "Havuzdaki bağlantılar (durumuna göre)", [
+        ({"engine": name, "state": state}, value)
+        for name, pool in pools.items()
+        for state, value in (
+            ("size", pool.size()), ("checked_out", pool.checkedout()),
+            ("checked_in", pool.checkedin()), ("overflow", max(0, pool.overflow())),
+        )
+    ])
+
+    principal = principal_cache.stats()
+    yield ("principal_cache_requests_total", "counter", "Token önbelleği sorguları", [
+        ({"result": "hit"}, principal["hits"]), ({"result": "miss"}, principal["misses"]),
+    ])
+    yield ("principal_cache_evictions_total", "counter", "Token önbelleğinden LRU ile atılan kayıtlar",
+           [({}, principal["evictions"])])
+    yield ("principal_cache_entries", "gauge", "Token önbelleğindeki kayıt sayısı", [({}, principal["size"])])
+
+    yield ("response_cache_requests_total", "counter", "Hazır JSON gövdesi önbelleği sorguları", [
+        ({"result": "hit"}, catalog_response_cache.hits), ({"result": "miss"}, catalog_response_cache.misses),
+    ])
+    yield ("stats_cache_requests_total", "counter", "/stats cevap önbelleği sorguları", [
+        ({"result": "hit"}, stats_response_cache.hits), ({"result": "miss"}, stats_response_cache.misses),
+    ])
+
+    yield ("password_hash_pending", "gauge", "bcrypt havuzunda çalışan + bekleyen doğrulamalar",
+           [({}, password_verifier.pending)])
+    yield ("password_hash_rejected_total", "counter", "Havuz dolu olduğu için 503 ile reddedilen girişler",
+           [({}, password_verifier.shed)])
+
+    yield ("vote_buffer_pending", "gauge", "Yazılmayı bekleyen oy değişiklikleri", [({}, vote_buffer.pending_count)])
+    yield ("vote_buffer_flushed_votes_total", "counter", "Tampondan yazılan oy değişiklikleri",
+           [({}, vote_buffer.flushed_votes)])
+    yield ("vote_buffer_flushes_total", "counter", "Tampon yazma turları", [
+        ({"result": "ok"}, vote_buffer.flush_count), ({"result": "error"}, vote_buffer.flush_failures),
+    ])
+
+    yield ("vote_requests_shed_total", "counter", "DB'ye ulaşmadan reddedilen /votes istekleri", [
+        ({"reason": "rate_limit"}, vote_rate_limiter.rejected),
+        ({"reason": "concurrency"}, vote_concurrency_limiter.shed),
+    ])
+    yield ("vote_requests_in_flight", "gauge", "İşlenmekte olan /votes istekleri",
+           [({}, vote_concurrency_limiter.in_flight)])
+    yield ("vote_rate_limiter_entries", "gauge", "Bellekteki öğrenci kovaları", [({}, len(vote_rate_limiter))])
+    yield ("vote_rate_limiter_evictions_total", "counter", "LRU ile atılan öğrenci kovaları",
+           [({}, vote_rate_limiter.evictions)])
+
+    if settings.SHARED_TALLY_ENABLED:
+        yield ("shared_tally_ready", "gauge", "Ortak sayaç tablosu kurulu mu", [({}, int(shared_tally.ready))])
+        yield ("shared_tally_corrections_total", "counter", "Tutarlılık kontrolünde düzeltilen slotlar",
+               [({}, shared_tally.corrections)])
+
+    yield ("stream_subscribers", "gauge", "Açık /worlds/stream bağlantıları", [({}, broadcaster.subscriber_count)])
+    yield ("stream_messages_sent_total", "counter", "Yayınlanan SSE mesajları", [({}, broadcaster.messages_sent)])
+
+    yield ("catalog_version_listening", "gauge", "Katalog sürümü için LISTEN bağlantısı açık mı",
+           [({}, int(catalog_version.listening))])
+
+
+registry.register_collector(_collect_components)
+
+
+# Prometheus metin formatında metrikler (bkz. core/metrics.py). Herkese açıktır;
+# production'da erişimi reverse proxy ile iç ağa kısıtlayın.
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
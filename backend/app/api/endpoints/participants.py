@@ -1,39 +1,209 @@
 # backend/app/api/endpoints/participants.py
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
 from app import crud, schemas
-from app.db.database import get_db
+from app.core.catalog_version import catalog_headers, catalog_version, not_modified
+from app.core.leaderboard import leaderboard, refresh_leaderboard
+from app.core.pagination import ORDER_BY_ID, cursor_key, decode_cursor, encode_cursor
+from app.core.response_cache import catalog_response_cache, json_bytes_response
+from app.core.shared_tally import overlay_like_counts, sync_leaderboard, tally_stamp
+from app.api.deps import get_read_db
 
 router = APIRouter()
 
+# /worlds için sayfa başına en fazla kayıt ve fields= ile seçilebilecek kolonlar
+PAGE_LIMIT_MAX = 500
+BATCH_IDS_MAX = 100 # /worlds/batch?ids= ile tek istekte istenebilecek dünya sayısı
+PROJECTABLE_FIELDS = tuple(schemas.ParticipantFields.model_fields)
+
+# Sıcak okuma endpoint'leri cevabı kendileri JSON'a çevirip Response döndürür:
+# FastAPI'nin response_model üzerinden ikinci kez doğrulama + jsonable_encoder
+# adımı atlanır. response_model'ler OpenAPI şeması için dekoratörlerde kalır.
+_PARTICIPANT_FIELDS_LIST = TypeAdapter(List[schemas.ParticipantFields])
+_PARTICIPANT_LIST = TypeAdapter(List[schemas.Participant])
+_PARTICIPANT = TypeAdapter(schemas.Participant)
+
 # Tüm dünyaları listeleme endpoint'i (karosel için)
-@router.get("/worlds", response_model=List[schemas.Participant])
+# Keyset (cursor) sayfalama: sıradaki sayfanın cursor'ı X-Next-Cursor
+# başlığında döner (son sayfada başlık yoktur). order_by=id (varsayılan) veya
+# like_count (azalan, eşitlikte id). fields=id,serial_number,video_url gibi bir
+# liste verilirse sadece bu kolonlar SELECT edilir ve döner.
+# skip eski istemciler için desteklenir (OFFSET; order_by ve fields ile birlikte
+# kullanılabilir, cursor ile kullanılamaz).
+# Katalog değişmediyse If-None-Match ile 304 döner (bkz. core/catalog_version.py);
+# değiştiyse aynı sorgunun hazır JSON gövdesi sürüm başına bir kez üretilir.
+# Okuma endpoint'leri READ_DATABASE_URL tanımlıysa replikadan okur (bkz. api/deps.py).
+# SHARED_TALLY_ENABLED açıksa like_count'lar worker'lar arası ortak tablodan gelir;
+# tablonun damgası ETag'e ve önbellek anahtarına katılır (bkz. core/shared_tally.py).
+# Varsayılan cevap şeması tam Participant listesidir; fields= verildiğinde öğeler
+# sadece istenen alanları içerir (ParticipantFields).
+@router.get(
+    "/worlds",
+    response_model=List[schemas.Participant],
+    responses={200: {"description": (
+        "Dünya listesi. fields= verilirse her öğe sadece istenen alanları içerir "
+        f"(ParticipantFields; seçilebilecek alanlar: {', '.join(PROJECTABLE_FIELDS)})."
+    )}},
+)
 async def read_participants(
-    db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100 # İsterseniz varsayılan limiti düşürebilirsiniz
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    limit: int = Query(100, ge=1, le=PAGE_LIMIT_MAX),
+    cursor: Optional[str] = None,
+    order_by: str = Query(ORDER_BY_ID, pattern="^(id|like_count)$"),
+    fields: Optional[str] = None,
+    skip: int = Query(0, ge=0),
 ):
-    participants = crud.crud_participant.get_participants(db, skip=skip, limit=limit)
-    return participants
+    version = await catalog_version.current(db)
+    cache_key = ("worlds", tuple(sorted(request.query_params.multi_items())), tally_stamp())
+    headers = catalog_headers(version, *cache_key)
+    unchanged = not_modified(request, headers)
+    if unchanged is not None:
+        return unchanged
+    cached = catalog_response_cache.get(version, cache_key)
+    if cached is not None:
+        body, extra_headers = cached
+        return json_bytes_response(body, {**headers, **extra_headers})
+    if not await catalog_version.replica_caught_up(db):
+        # Replika geride: veri sunulur ama bu sürümle etiketlenmez/önbelleğe alınmaz
+        version, headers = None, {}
+
+    columns = None
+    if fields:
+        requested = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [field for field in requested if field not in PROJECTABLE_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        # Cursor'ı üretebilmek için sıralama anahtarı her zaman seçilir
+        key_columns = ["id"] if order_by == ORDER_BY_ID else ["like_count", "id"]
+        columns = list(dict.fromkeys(requested + key_columns))
+
+    if skip and cursor:
+        raise HTTPException(status_code=400, detail="skip and cursor cannot be used together")
+    try:
+        after = decode_cursor(cursor, order_by)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    rows = await crud.crud_participant_async.get_participants_keyset(
+        db, limit=limit, order_by=order_by, after=after, columns=columns, offset=skip
+    )
+    extra_headers = {}
+    if len(rows) == limit:
+        last = rows[-1] if columns else {"id": rows[-1].id, "like_count": rows[-1].like_count}
+        extra_headers["X-Next-Cursor"] = encode_cursor(order_by, cursor_key(order_by, last))
+
+    if columns:
+        # Sadece istenen alanlar set edilir; sıralama için eklenenler cevapta yer almaz
+        items = _PARTICIPANT_FIELDS_LIST.validate_python([{field: row[field] for field in requested} for row in rows])
+        body = _PARTICIPANT_FIELDS_LIST.dump_json(overlay_like_counts(items), exclude_unset=True)
+    else:
+        items = _PARTICIPANT_LIST.validate_python(rows, from_attributes=True)
+        body = _PARTICIPANT_LIST.dump_json(overlay_like_counts(items))
+    catalog_response_cache.put(version, cache_key, body, extra_headers)
+    return json_bytes_response(body, {**headers, **extra_headers})
 
 # En iyi 5 dünyayı listeleme endpoint'i (scoreboard için)
+# Skor tablosu process içinde tutulur; yüklenmemişse (ör. başlangıçta DB'ye
+# ulaşılamadıysa) DB sorgusuna düşülür
 @router.get("/worlds/top5", response_model=List[schemas.Participant])
 async def read_top_participants(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    top_participants = crud.crud_participant.get_participants_top5(db)
+    if leaderboard.loaded:
+        sync_leaderboard()
+        return json_bytes_response(_PARTICIPANT_LIST.dump_json(leaderboard.top(5)), {})
+    top_participants = await crud.crud_participant_async.get_participants_top5(db)
     return top_participants
 
+# En iyi n dünyayı listeleme endpoint'i
+@router.get("/worlds/top", response_model=List[schemas.Participant])
+async def read_top_n_participants(
+    n: int = Query(5, ge=1, le=500),
+    db: AsyncSession = Depends(get_read_db)
+):
+    if leaderboard.loaded:
+        sync_leaderboard()
+        return json_bytes_response(_PARTICIPANT_LIST.dump_json(leaderboard.top(n)), {})
+    return await crud.crud_participant_async.get_participants_top(db, n)
+
+# Birden fazla dünyayı tek istekte getirme: /worlds/batch?ids=3,7,12
+# Tek bir IN sorgusu çalışır; sonuç id sırasıyladır, bulunamayan id'ler atlanır.
+# /worlds/{participant_id}'den önce tanımlanmalı (yoksa "batch" id olarak eşleşir).
+@router.get("/worlds/batch", response_model=List[schemas.Participant])
+async def read_participants_batch(
+    request: Request,
+    ids: str = Query(..., description="Virgülle ayrılmış dünya id'leri"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    try:
+        participant_ids = sorted({int(value) for value in ids.split(",") if value.strip()})
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be a comma-separated list of integers")
+    if not participant_ids:
+        raise HTTPException(status_code=400, detail="ids must not be empty")
+    if len(participant_ids) > BATCH_IDS_MAX:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_IDS_MAX} ids can be requested")
+
+    version = await catalog_version.current(db)
+    cache_key = ("batch", tuple(participant_ids), tally_stamp())
+    headers = catalog_headers(version, *cache_key)
+    unchanged = not_modified(request, headers)
+    if unchanged is not None:
+        return unchanged
+    cached = catalog_response_cache.get(version, cache_key)
+    if cached is not None:
+        return json_bytes_response(cached[0], headers)
+    if not await catalog_version.replica_caught_up(db):
+        version, headers = None, {}
+    rows = await crud.crud_participant_async.get_participants_by_ids(db, participant_ids)
+    body = _PARTICIPANT_LIST.dump_json(overlay_like_counts(_PARTICIPANT_LIST.validate_python(rows, from_attributes=True)))
+    catalog_response_cache.put(version, cache_key, body, {})
+    return json_bytes_response(body, headers)
+
 # Belirli bir dünyayı ID ile getirme (belki detay sayfası için?)
+# /worlds ile aynı şekilde ETag / 304 ve hazır JSON önbelleği kullanır
 @router.get("/worlds/{participant_id}", response_model=schemas.Participant)
 async def read_participant(
     participant_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_read_db)
 ):
-    db_participant = crud.crud_participant.get_participant(db, participant_id=participant_id)
+    version = await catalog_version.current(db)
+    cache_key = ("world", participant_id, tally_stamp())
+    headers = catalog_headers(version, *cache_key)
+    unchanged = not_modified(request, headers)
+    if unchanged is not None:
+        return unchanged
+    cached = catalog_response_cache.get(version, cache_key)
+    if cached is not None:
+        return json_bytes_response(cached[0], headers)
+    if not await catalog_version.replica_caught_up(db):
+        version, headers = None, {}
+    db_participant = await crud.crud_participant_async.get_participant(db, participant_id=participant_id)
     if db_participant is None:
         raise HTTPException(status_code=404, detail="Participant not found")
-    return db_participant
\ No newline at end of file
+    item = _PARTICIPANT.validate_python(db_participant, from_attributes=True)
+    body = _PARTICIPANT.dump_json(overlay_like_counts([item])[0])
+    catalog_response_cache.put(version, cache_key, body, {})
+    return json_bytes_response(body, headers)
+
+# Bir dünyanın skor tablosundaki sırası
+@router.get("/worlds/{participant_id}/rank", response_model=schemas.ParticipantRank)
+async def read_participant_rank(participant_id: int):
+    if not leaderboard.loaded:
+        await refresh_leaderboard()
+    sync_leaderboard()
+    rank = leaderboard.rank(participant_id)
+    if rank is None:
+        raise HTTPException(status_code=404, detail="Participant not found")
+    return schemas.ParticipantRank(
+        participant_id=participant_id,
+        rank=rank,
+        like_count=leaderboard.get(participant_id).like_count,
+        total=len(leaderboard),
+    )
@@ -0,0 +1,58 @@
+# backend/app/api/endpoints/stats.py
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import schemas
+from app.api.deps import get_read_db
+from app.core.config import settings
+from app.core.response_cache import json_bytes_response
+from app.core.vote_stats import (
+    STATS_INTERVAL_AUTO, STATS_MAX_POINTS, overview, participant_timeline, resolve_interval, stats_response_cache,
+)
+
+router = APIRouter()
+
+_TIMELINE = TypeAdapter(schemas.VoteTimeline)
+_OVERVIEW = TypeAdapter(schemas.StatsOverview)
+
+# Cevaplar öğrenciye özel değildir; proxy/tarayıcı da önbellek süresi kadar tutabilir
+_CACHE_HEADERS = {"Cache-Control": f"public, max-age={settings.VOTE_STATS_CACHE_SECONDS}"}
+
+
+# Bir dünyanın "zamana göre oylar" grafiği: son `hours` saat, `interval`
+# aralıklı kovalar (auto: en fazla ~360 nokta). Önceden toplanmış kovalardan
+# okunur (bkz. core/vote_stats.py); en fazla bir toplama aralığı geridedir (as_of).
+@router.get("/stats/worlds/{participant_id}/timeline", response_model=schemas.VoteTimeline)
+async def read_participant_timeline(
+    participant_id: int,
+    interval: str = Query(STATS_INTERVAL_AUTO, pattern="^(auto|1m|5m|15m|1h|1d)$"),
+    hours: int = Query(24, ge=1, le=24 * 31),
+    db: AsyncSession = Depends(get_read_db),
+):
+    cache_key = ("timeline", participant_id, interval, hours)
+    cached = stats_response_cache.get(cache_key)
+    if cached is not None:
+        return json_bytes_response(*cached)
+    interval_seconds = resolve_interval(interval, hours)
+    if hours * 3600 // interval_seconds > STATS_MAX_POINTS:
+        raise HTTPException(status_code=400, detail="Too many points, choose a larger interval")
+    timeline = await participant_timeline(db, participant_id, interval_seconds, hours)
+    if timeline is None:
+        raise HTTPException(status_code=404, detail="Participant not found")
+    body = _TIMELINE.dump_json(timeline)
+    stats_response_cache.put(cache_key, body, _CACHE_HEADERS)
+    return json_bytes_response(body, _CACHE_HEADERS)
+
+
+# Tüm dünyaların oylama özeti: toplamlar, son saat (dakikalık) ve son gün
+# (saatlik) serileri, son saatte en çok oy alan dünyalar
+@router.get("/stats/overview", response_model=schemas.StatsOverview)
+async def read_stats_overview(db: AsyncSession = Depends(get_read_db)):
+    cached = stats_response_cache.get(("overview",))
+    if cached is not None:
+        return json_bytes_response(*cached)
+    body = _OVERVIEW.dump_json(await overview(db))
+    stats_response_cache.put(("overview",), body, _CACHE_HEADERS)
+    return json_bytes_response(body, _CACHE_HEADERS)
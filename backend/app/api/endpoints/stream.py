@@ -0,0 +1,31 @@
+# backend/app/api/endpoints/stream.py
+
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from app.core.broadcaster import TooManySubscribers, broadcaster
+
+router = APIRouter()
+
+# Beğeni sayıları ve skor tablosu için canlı yayın (Server-Sent Events)
+# İlk mesaj "snapshot" (tüm sayaçlar + skor tablosu), sonrakiler "update"
+# (sadece değişen sayaçlar ve değiştiyse skor tablosu). Frontend'in /worlds ve
+# /worlds/top5'i tekrar tekrar çekmesine gerek kalmaz.
+@router.get("/worlds/stream")
+async def stream_worlds():
+    try:
+        subscriber = broadcaster.subscribe()
+    except TooManySubscribers:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Canlı yayın kapasitesi dolu, lütfen daha sonra tekrar deneyin.",
+            headers={"Retry-After": "5"},
+        )
+    return StreamingResponse(
+        broadcaster.stream(subscriber),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no", # nginx gibi proxy'ler tamponlamasın
+        },
+    )
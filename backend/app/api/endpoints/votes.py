@@ -1,12 +1,19 @@
 # backend/app/api/endpoints/votes.py
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
 from app import crud, models, schemas
 from app.api import deps # Mevcut kullanıcıyı almak için dependency
-from app.db.database import get_db
+from app.core.broadcaster import broadcaster
+from app.core.catalog_version import catalog_version
+from app.core.config import settings
+from app.core.leaderboard import leaderboard
+from app.core.read_your_writes import recent_writers
+from app.core.shared_tally import active_tally, sync_leaderboard
+from app.core.vote_buffer import VoteBufferFull, vote_buffer
+from app.db.database import get_async_db
 
 router = APIRouter()
 
@@ -15,79 +22,89 @@ router = APIRouter()
 @router.post("/votes", response_model=schemas.Participant)
 async def cast_or_retract_vote(
     *, # Keyword-only argümanlar için
-    db: Session = Depends(get_db),
+    _admitted: None = Depends(deps.vote_admission), # İlk sırada: limit aşılırsa DB'ye gidilmez
+    db: AsyncSession = Depends(get_async_db),
     vote_in: schemas.VoteCreate, # Request body'den participant_id'yi alacak
-    current_student: models.Student = Depends(deps.get_current_student) # Token'dan öğrenciyi al
+    current_student: schemas.Student = Depends(deps.get_current_student) # Token'dan öğrenciyi al
 ):
-    # 1. Oy verilmek istenen katılımcı var mı?
-    participant = crud.crud_participant.get_participant(db, participant_id=vote_in.participant_id)
-    if not participant:
+    if settings.VOTE_WRITE_BEHIND:
+        # Write-behind: bellekte doğrula, hemen onayla, gruplar halinde yaz
+        try:
+            result = await vote_buffer.toggle(
+                db, student_id=current_student.id, participant_id=vote_in.participant_id
+            )
+        except VoteBufferFull:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Oylar şu anda kaydedilemiyor, lütfen birkaç saniye sonra tekrar deneyin.",
+                headers={"Retry-After": "2"},
+            )
+    else:
+        # Toggle, limit kontrolü ve beğeni sayacı tek transaction'da yapılır
+        result = await crud.crud_vote_async.toggle_vote(
+            db,
+            student_id=current_student.id,
+            participant_id=vote_in.participant_id,
+            max_votes=settings.MAX_VOTES_PER_STUDENT,
+            shards=settings.LIKE_COUNTER_SHARDS,
+        )
+        if result.delta:
+            catalog_version.mark_stale()
+            catalog_version.announce()
+
+    if result.action == crud.crud_vote_async.VOTE_PARTICIPANT_NOT_FOUND:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Oy verilmek istenen katılımcı bulunamadı."
         )
 
-    # 2. Öğrenci bu katılımcıya daha önce oy vermiş mi?
-    existing_vote = crud.crud_vote.get_vote_by_student_and_participant(
-        db, student_id=current_student.id, participant_id=vote_in.participant_id
-    )
-
-    if existing_vote:
-        # --- Oy Geri Alma (Unlike) ---
-        # Oyu sil
-        deleted = crud.crud_vote.delete_vote_by_student_and_participant(
-            db, student_id=current_student.id, participant_id=vote_in.participant_id
+    if result.action == crud.crud_vote_async.VOTE_LIMIT_EXCEEDED:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Oy limiti aşıldı (en fazla {settings.MAX_VOTES_PER_STUDENT} farklı dünyaya oy verebilirsiniz)."
         )
-        if not deleted:
-            # Normalde buraya düşmemeli ama olursa diye loglama/hata düşünülebilir
-            raise HTTPException(status_code=500, detail="Oy silinirken bir hata oluştu.")
 
-        # Katılımcının beğeni sayısını azalt
-        updated_participant = crud.crud_participant.update_participant_like_count(
-            db, participant_id=vote_in.participant_id, increment=-1
+    # Process içi skor tablosunu artımsal güncelle ve canlı yayına bildir
+    if result.delta:
+        # Öğrencinin sonraki okumaları bir süre birincilden yapılır (kendi oyunu görsün)
+        recent_writers.record(current_student.id)
+        leaderboard.apply_vote(result.participant, result.delta)
+        tally = active_tally()
+        if tally is not None:
+            # Diğer worker'lar da görsün; skor tablosu ortak değerle eşitlenir
+            tally.apply_vote(result.participant.id, result.delta, result.participant.like_count)
+            sync_leaderboard()
+        current = leaderboard.get(result.participant.id)
+        broadcaster.publish_like_count(
+            result.participant.id,
+            current.like_count if current is not None else result.participant.like_count,
         )
-        if not updated_participant:
-            # Katılımcı bulunamazsa (silinmiş olabilir?) veya güncelleme olmazsa
-            raise HTTPException(status_code=500, detail="Beğeni sayısı güncellenirken bir hata oluştu.")
 
-        return updated_participant
+    # Beğeni (liked), geri alma (unliked) veya eşzamanlı tekrar (unchanged):
+    # güncel katılımcı bilgisini döndür
+    return result.participant
 
-    else:
-        # --- Yeni Oy Verme (Like) ---
-        # Öğrencinin mevcut oy sayısını kontrol et
-        current_votes = crud.crud_vote.get_votes_by_student(db, student_id=current_student.id)
-        if len(current_votes) >= 2:
-            # Oy limiti aşıldı
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Oy limiti aşıldı (en fazla 2 farklı dünyaya oy verebilirsiniz)."
-            )
-
-        # Yeni oyu oluştur
-        new_vote = crud.crud_vote.create_vote(db, vote=vote_in, student_id=current_student.id)
-        if not new_vote:
-            raise HTTPException(status_code=500, detail="Oy oluşturulurken bir hata oluştu.")
-
-        # Katılımcının beğeni sayısını artır
-        updated_participant = crud.crud_participant.update_participant_like_count(
-            db, participant_id=vote_in.participant_id, increment=1
-        )
-        if not updated_participant:
-            raise HTTPException(status_code=500, detail="Beğeni sayısı güncellenirken bir hata oluştu.")
 
-        return updated_participant
+# Öğrencinin oy verdiği dünyaların id'leri (artan). Write-behind modunda henüz
+# yazılmamış oylar da dahildir; pusula bellekteyse DB'ye gidilmez.
+async def voted_participant_ids(db: AsyncSession, student_id: int) -> List[int]:
+    if settings.VOTE_WRITE_BEHIND:
+        ballot = vote_buffer.ballot(student_id)
+        if ballot is not None:
+            return sorted(ballot)
+    # Mevcut öğrencinin oy verdiği dünyaların id'lerini al (indeksten okunur)
+    return await crud.crud_vote_async.get_voted_participant_ids(db, student_id=student_id)
 
 
 # Giriş yapmış öğrencinin oylarını getirme endpoint'i
 @router.get("/votes/my-votes", response_model=List[schemas.VoteOutSimple])
 async def read_my_votes(
-    db: Session = Depends(get_db),
-    current_student: models.Student = Depends(deps.get_current_student)
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_student: schemas.Student = Depends(deps.get_current_student)
 ):
-    # Mevcut öğrencinin tüm oylarını (Vote nesneleri olarak) al
-    db_votes = crud.crud_vote.get_votes_by_student(db, student_id=current_student.id)
+    participant_ids = await voted_participant_ids(db, current_student.id)
 
     # Sonucu VoteOutSimple şemasına uygun hale getir (sadece participant_id listesi)
-    my_votes_simple = [schemas.VoteOutSimple(participant_id=vote.participant_id) for vote in db_votes]
+    my_votes_simple = [schemas.VoteOutSimple(participant_id=participant_id) for participant_id in participant_ids]
 
     return my_votes_simple
\ No newline at end of file
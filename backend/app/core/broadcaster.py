@@ -0,0 +1,136 @@
+# backend/app/core/broadcaster.py
+
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.leaderboard import leaderboard
+
+logger = logging.getLogger(__name__)
+
+
+# Abonelik sınırı dolduğunda fırlatılır; endpoint 503 döndürmelidir
+class TooManySubscribers(Exception):
+    pass
+
+
+# Bir SSE istemcisinin henüz gönderilmemiş durumu.
+# Kuyruk yerine "son değer" tutulur: istemci yavaş okusa bile aynı dünyanın
+# art arda gelen sayaçları tek değerde birleşir, bellek dünya sayısıyla sınırlı
+# kalır (backpressure'da mesaj biriktirmek yerine birleştirme).
+class Subscriber:
+    __slots__ = ("likes", "top", "event")
+
+    def __init__(self):
+        self.likes: Dict[int, int] = {}
+        self.top: Optional[List[Tuple[int, int]]] = None
+        self.event = asyncio.Event()
+
+
+# Beğeni sayacı değişikliklerini ve skor tablosunu abonelere iter (push).
+# Oy yolu publish_like_count çağırır; değişiklikler her tick'te (ör. 250 ms)
+# toplanır ve her istemciye tek mesaj olarak gider.
+class LikeBroadcaster:
+    def __init__(self, tick_seconds: float, top_n: int, heartbeat_seconds: float, max_subscribers: int):
+        self.tick_seconds = tick_seconds
+        self.top_n = top_n
+        self.heartbeat_seconds = heartbeat_seconds
+        self.max_subscribers = max_subscribers
+        self._subscribers: Set[Subscriber] = set()
+        self._pending_likes: Dict[int, int] = {}
+        self._last_top: Optional[List[Tuple[int, int]]] = None
+        self.messages_sent = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    # Bir dünyanın güncel beğeni sayısını yayın kuyruğuna ekler (bir sonraki tick'te gider)
+    def publish_like_count(self, participant_id: int, like_count: int):
+        self._pending_likes[participant_id] = like_count
+
+    def subscribe(self) -> Subscriber:
+        if len(self._subscribers) >= self.max_subscribers:
+            raise TooManySubscribers()
+        subscriber = Subscriber()
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self._subscribers.discard(subscriber)
+
+    def _current_top(self) -> List[Tuple[int, int]]:
+        return [(p.id, p.like_count) for p in leaderboard.top(self.top_n)]
+
+    # Bekleyen değişiklikleri tüm abonelerin durumuna birleştirir
+    def flush(self):
+        top = self._current_top()
+        top_changed = top != self._last_top
+        if not self._pending_likes and not top_changed:
+            return
+        pending, self._pending_likes = self._pending_likes, {}
+        self._last_top = top
+        for subscriber in self._subscribers:
+            if pending:
+                subscriber.likes.update(pending)
+            if top_changed:
+                subscriber.top = top
+            subscriber.event.set()
+
+    # Tick döngüsü (lifespan içinde arka plan görevi olarak çalışır)
+    async def run(self):
+        self._last_top = self._current_top()
+        while True:
+            await asyncio.sleep(self.tick_seconds)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Beğeni yayını sırasında hata")
+
+    @staticmethod
+    def _format(event: str, payload: dict) -> bytes:
+        return f"event: {event}\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n".encode()
+
+    @staticmethod
+    def _top_payload(top: List[Tuple[int, int]]) -> list:
+        return [{"id": participant_id, "like_count": like_count} for participant_id, like_count in top]
+
+    # Bir abonenin SSE akışı: önce tam anlık görüntü, sonra birleştirilmiş güncellemeler.
+    # İstemci bağlantıyı kapatınca Starlette generator'ı iptal eder, abonelik silinir.
+    async def stream(self, subscriber: Subscriber) -> AsyncIterator[bytes]:
+        try:
+            snapshot = {
+                "likes": {str(k): v for k, v in leaderboard.like_counts().items()},
+                "top": self._top_payload(self._current_top()),
+            }
+            yield self._format("snapshot", snapshot)
+            while True:
+                try:
+                    await asyncio.wait_for(subscriber.event.wait(), timeout=self.heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    # Boşta bekleyen bağlantıların proxy'lerde kapanmaması için yorum satırı
+                    yield b": ping\n\n"
+                    continue
+                subscriber.event.clear()
+                payload = {}
+                if subscriber.likes:
+                    payload["likes"] = {str(k): v for k, v in subscriber.likes.items()}
+                    subscriber.likes = {}
+                if subscriber.top is not None:
+                    payload["top"] = self._top_payload(subscriber.top)
+                    subscriber.top = None
+                if payload:
+                    self.messages_sent += 1
+                    yield self._format("update", payload)
+        finally:
+            self.unsubscribe(subscriber)
+
+
+broadcaster = LikeBroadcaster(
+    tick_seconds=settings.STREAM_TICK_MS / 1000,
+    top_n=settings.STREAM_TOP_N,
+    heartbeat_seconds=settings.STREAM_HEARTBEAT_SECONDS,
+    max_subscribers=settings.STREAM_MAX_SUBSCRIBERS,
+)
@@ -0,0 +1,204 @@
+# backend/app/core/catalog_version.py
+
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Dict, Optional
+
+import asyncpg
+from fastapi import Request, Response
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.database import SQLALCHEMY_DATABASE_URL, AsyncSessionLocal, async_engine, has_read_replica
+
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION_CHANNEL = "catalog_version"
+
+# Katalog sürüm sayacı: participants veya votes tablosunu değiştiren her
+# statement bir sequence'i artırır (trigger'lar: app/db/migrations/0002, 0007).
+# Sequence DB'de tek olduğu için tüm uvicorn worker'ları aynı sürümü görür.
+# Katalog değişiklikleri (dünya ekleme/silme/düzenleme) yeni değeri trigger'dan
+# NOTIFY eder. Oylar ise etmez: NOTIFY eden her transaction commit'te global
+# bildirim kuyruğu kilidini alır ve oy commit'leri bu kilitte sıraya girerdi.
+# Oyu yazan worker yeni sürümü kendi LISTEN bağlantısından, oy transaction'ı
+# dışında duyurur (announce); NOTIFY_MS içindeki oylar tek bildirimde birleşir.
+# Okuma replikası varsa sürüm yine birincilden okunur; replikadan okunan veri
+# ancak replika o sürümün WAL konumuna ulaşmışsa sürümle etiketlenir.
+
+# Hiç nextval çağrılmamış sequence'te last_value başlangıç değeridir (is_called=false).
+# Sürümle birlikte birincilin WAL konumu da okunur: replika bu konuma ulaştıysa
+# o sürümün verisini görüyordur (bkz. replica_caught_up). Sadece birincilde çalışır.
+_SELECT_VERSION_SQL = (
+    "SELECT CASE WHEN is_called THEN last_value ELSE 0 END, pg_current_wal_lsn()::text FROM catalog_version_seq"
+)
+# Sürümü okur ve diğer worker'lara duyurur (autocommit: bildirim hemen gider)
+_ANNOUNCE_VERSION_SQL = """
+SELECT version, lsn, pg_notify('catalog_version', version::text)
+FROM (
+    SELECT CASE WHEN is_called THEN last_value ELSE 0 END AS version, pg_current_wal_lsn()::text AS lsn
+    FROM catalog_version_seq
+) v
+"""
+# Replikada değilse (recovery yoksa) pg_last_wal_replay_lsn() NULL döner: birincil kabul edilir
+_REPLICA_CAUGHT_UP_SQL = text("SELECT coalesce(pg_last_wal_replay_lsn() >= CAST(CAST(:lsn AS text) AS pg_lsn), true)")
+
+
+# Worker'ın bildiği katalog sürümü.
+# Değer LISTEN ile anında, ayrıca her poll_seconds'da bir sorgu ile güncellenir
+# (bildirim kaçarsa veya LISTEN bağlantısı koparsa yedek). Sürüm güvenilir
+# değilse (hiç okunamadı ya da uzun süredir yenilenemedi) current() None döner
+# ve endpoint'ler ETag üretmez; yani bayat veri için asla 304 dönülmez.
+class CatalogVersion:
+    def __init__(self, poll_seconds: float, announce_delay_seconds: float = 0):
+        self.poll_seconds = poll_seconds
+        self.announce_delay_seconds = announce_delay_seconds
+        self.value: Optional[int] = None
+        # value'nun yazıldığı (en geç) WAL konumu; bildirimle gelen sürümde bir sonraki sorguya kadar bilinmez
+        self.lsn: Optional[str] = None
+        self.listening = False
+        self._wakeup = asyncio.Event()
+        self._refreshed_at = 0.0
+        # Bu worker bir yazım yaptı ama bildirimi henüz gelmemiş olabilir
+        self._stale = False
+        # Bu worker oy yazdı; yeni sürüm diğer worker'lara henüz duyurulmadı
+        self._announce_pending = False
+
+    # lsn bir sürüm için bir kez belirlenir; sonraki okumalardaki daha ileri
+    # konumlar replikadan gereksiz yere daha fazlasını beklemeye yol açardı
+    def _set(self, value: int, lsn: Optional[str]):
+        if self.value is None or value > self.value:
+            self.value = value
+            self.lsn = lsn
+        elif value == self.value and self.lsn is None:
+            self.lsn = lsn
+        self._refreshed_at = time.monotonic()
+
+    # Bu worker'da bir yazım commit edildiğinde çağrılır; bir sonraki okuma
+    # sürümü DB'den alır (kendi yazdığını hemen görmeyen istemciye 304 dönülmesin)
+    def mark_stale(self):
+        self._stale = True
+
+    # Bu worker'da oy yazımı commit edildiğinde çağrılır: yeni sürüm run()
+    # görevinin LISTEN bağlantısından NOTIFY edilir. Bağlantı yoksa diğer
+    # worker'lar sürümü periyodik sorguyla (poll_seconds) öğrenir.
+    def announce(self):
+        self._announce_pending = True
+        self._wakeup.set()
+
+    # db bir replika session'ı olabilir; sürüm her zaman birincilden okunur
+    async def current(self, db: AsyncSession) -> Optional[int]:
+        if self._stale:
+            self._stale = False
+            try:
+                if db.bind is async_engine:
+                    row = (await db.execute(text(_SELECT_VERSION_SQL))).one()
+                else:
+                    async with AsyncSessionLocal() as primary:
+                        row = (await primary.execute(text(_SELECT_VERSION_SQL))).one()
+                self._set(*row)
+            except Exception:
+                logger.exception("Katalog sürümü okunamadı")
+                return None
+        if self.value is None or time.monotonic() - self._refreshed_at > self.poll_seconds * 3:
+            return None
+        return self.value
+
+    # Replika session'ı, bilinen sürümün WAL konumuna ulaştı mı? Ulaşmadıysa o
+    # session'dan okunan veri bu sürümle etiketlenmemeli (ETag/önbellek yok).
+    # Birincil session'da her zaman True.
+    async def replica_caught_up(self, db: AsyncSession) -> bool:
+        if db.bind is async_engine:
+            return True
+        if self.lsn is None:
+            return False
+        return bool((await db.execute(_REPLICA_CAUGHT_UP_SQL, {"lsn": self.lsn})).scalar_one())
+
+    def _on_notify(self, connection, pid, channel, payload):
+        try:
+            self._set(int(payload), None)
+        except ValueError:
+            return
+        if has_read_replica:
+            # Yeni sürümün WAL konumunu hemen öğren (replika kontrolleri için)
+            self._wakeup.set()
+
+    # Arka plan görevi: LISTEN bağlantısını açık tutar, düşerse yeniden bağlanır
+    async def run(self):
+        dsn = make_url(SQLALCHEMY_DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(dsn)
+                await connection.add_listener(CATALOG_VERSION_CHANNEL, self._on_notify)
+                self.listening = True
+                while True:
+                    self._wakeup.clear()
+                    if self._announce_pending:
+                        self._announce_pending = False
+                        row = await connection.fetchrow(_ANNOUNCE_VERSION_SQL)
+                    else:
+                        row = await connection.fetchrow(_SELECT_VERSION_SQL)
+                    self._set(row[0], row[1])
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+                    except asyncio.TimeoutError:
+                        pass
+                    if self._announce_pending and self.announce_delay_seconds > 0:
+                        # Art arda gelen oylar tek bildirimde birleşsin
+                        await asyncio.sleep(self.announce_delay_seconds)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Katalog sürümü dinlenemiyor, %s sn sonra tekrar denenecek", self.poll_seconds)
+            finally:
+                self.listening = False
+                if connection is not None:
+                    await connection.close(timeout=1)
+            await asyncio.sleep(self.poll_seconds)
+
+
+catalog_version = CatalogVersion(
+    poll_seconds=settings.CATALOG_VERSION_POLL_SECONDS,
+    announce_delay_seconds=settings.CATALOG_VERSION_NOTIFY_MS / 1000,
+)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match zayıf karşılaştırma kullanır: W/ öneki yok sayılır
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+# Koşullu GET başlıkları: katalog sürümü ve gösterim anahtarından (ör. sorgu
+# parametreleri) güçlü bir ETag ve Cache-Control üretir. Sürüm bilinmiyorsa
+# boş döner (ETag yok, 304 yok).
+def catalog_headers(version: Optional[int], *representation) -> Dict[str, str]:
+    if version is None:
+        return {}
+    digest = hashlib.blake2b("|".join(map(str, representation)).encode(), digest_size=8).hexdigest()
+    return {
+        "ETag": f'"{version}-{digest}"',
+        "Cache-Control": f"public, max-age={settings.CATALOG_CACHE_MAX_AGE_SECONDS}, must-revalidate",
+    }
+
+
+# İstemcinin If-None-Match'i eşleşirse 304 cevabı döner (DB sorgusu ve serialize
+# yapılmadan); eşleşmezse None döner ve endpoint normal cevabını üretir.
+def not_modified(request: Request, headers: Dict[str, str]) -> Optional[Response]:
+    if headers and _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return None
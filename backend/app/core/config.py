@@ -9,16 +9,148 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1" # API versiyon prefix'i
 
     DATABASE_URL: str
+    # İsteğe bağlı okuma replikası (fiziksel streaming replika). Tanımlıysa /worlds,
+    # /worlds/top5, /worlds/{id} ve /votes/my-votes buradan okunur (bkz. api/deps.py get_read_db).
+    READ_DATABASE_URL: Optional[str] = None
+    # Oy veren öğrencinin okumaları bu süre boyunca birincile gider (kendi oyunu hemen görsün).
+    # Süre worker içinde tutulur; birden fazla worker varsa istemci X-Read-Your-Writes: 1 gönderebilir.
+    READ_YOUR_WRITES_SECONDS: int = 5
+
+    # Bağlantı havuzu (her engine ve her worker için ayrı)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30 # Havuz doluyken bağlantı bekleme sınırı
+    DB_POOL_PRE_PING: bool = False # Her checkout'ta bağlantıyı yokla (düşen bağlantılara karşı)
+    DB_POOL_RECYCLE_SECONDS: int = -1 # Bu süreden eski bağlantıları yenile (-1: kapalı)
+    # API sorguları için statement_timeout (ms, 0: kapalı). Script'lere ve migration'lara uygulanmaz.
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+
+    # Başlangıçta bekleyen migration'ları uygula (app/db/migrations). Şemayı
+    # deploy sırasında ayrı bir adımda (python -m app.db.migrate) uyguluyorsanız kapatın.
+    RUN_MIGRATIONS_ON_STARTUP: bool = True
 
     # JWT Ayarları (varsayılan değerler .env dosyasından okunacak)
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Şifre doğrulama (bcrypt) havuzu. Bcrypt event loop dışında, en fazla
+    # PASSWORD_HASH_WORKERS thread'de çalışır; kuyrukta PASSWORD_HASH_MAX_QUEUE'dan
+    # fazla login beklerse yeni istekler 503 ile hemen reddedilir.
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
+    # Doğrulanmış token önbelleği (get_current_student). 0 verilirse kapatılır.
+    # Önbellek her worker'ın belleğindedir ve öğrenci değişikliklerinde
+    # temizlenmez: DB'de silinen veya değiştirilen bir öğrencinin token'ı en
+    # fazla PRINCIPAL_CACHE_TTL_SECONDS boyunca eski haliyle kabul edilebilir.
+    # Bu süre, öğrenci silme/değiştirme sonrası kabul edilebilir gecikmeyi aşmamalı.
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+
+    # Oylama Ayarları
+    MAX_VOTES_PER_STUDENT: int = 2 # Bir öğrencinin oy verebileceği farklı dünya sayısı
+
+    # /votes giriş kontrolü (bkz. core/rate_limit.py); limiti aşan istekler DB'ye ulaşmadan reddedilir.
+    # Öğrenci başına token bucket: saniyede VOTE_RATE_LIMIT_PER_SECOND oy, en fazla
+    # VOTE_RATE_LIMIT_BURST art arda (aşılırsa 429). 0: kapalı. Worker başına tutulur.
+    VOTE_RATE_LIMIT_PER_SECOND: float = 2
+    VOTE_RATE_LIMIT_BURST: int = 5
+    VOTE_RATE_LIMIT_MAX_STUDENTS: int = 100000 # Bellekte tutulan kova sayısı (LRU)
+    # Worker başına aynı anda işlenen en fazla oy isteği (aşılırsa 503). 0: sınırsız.
+    VOTE_MAX_CONCURRENCY: int = 32
+
+    # Write-behind oy modu (bkz. core/vote_buffer.py). Açıkken oylar bellekte
+    # doğrulanıp hemen onaylanır ve gruplar halinde yazılır; çökmede en fazla
+    # VOTE_BUFFER_FLUSH_MS kadarlık onaylanmış oy kaybolabilir. Tek worker ile kullanın.
+    VOTE_WRITE_BEHIND: bool = False
+    VOTE_BUFFER_FLUSH_MS: int = 200
+    VOTE_BUFFER_MAX_BATCH: int = 500 # Bu kadar oy birikince aralık beklenmeden yazılır
+    VOTE_BUFFER_MAX_PENDING: int = 5000 # Aşılırsa yeni oylar 503 ile reddedilir
+
+    # Parçalı beğeni sayaçları (bkz. crud/crud_like_shards.py). 0: kapalı, oy yolu
+    # participants.like_count'u doğrudan günceller. K > 0: oylar dünya başına K sayaç
+    # satırından birine yazılır (popüler dünyada satır kilidi yarışı olmaz) ve
+    # LIKE_COUNTER_ROLLUP_MS'de bir like_count'a toplanır. /worlds listesi toplanmış
+    # değeri okur (en fazla bir toplama aralığı geride); oy cevabı ve skor tablosu
+    # bekleyen sayaçları da sayar. Write-behind modu (VOTE_WRITE_BEHIND) zaten dünya
+    # başına toplu yazdığı için bu ayarı kullanmaz.
+    LIKE_COUNTER_SHARDS: int = 0
+    LIKE_COUNTER_ROLLUP_MS: int = 1000
+    LIKE_COUNTER_ROLLUP_BATCH_SIZE: int = 1000
+
+    # Başlangıç ısınması (bkz. core/warmup.py). Açıkken lifespan trafik almadan önce
+    # havuz bağlantılarını açar, sıcak sorguları her bağlantıda bir kez çalıştırır,
+    # katalog önbelleklerini ve bcrypt backend'ini yükler; /health/ready ancak
+    # bunlar bitince 200 döner. Başarısız olursa WARMUP_RETRY_SECONDS'ta bir tekrar denenir.
+    WARMUP_ENABLED: bool = True
+    WARMUP_DB_CONNECTIONS: Optional[int] = None # Açılacak bağlantı sayısı (None: DB_POOL_SIZE)
+    WARMUP_RETRY_SECONDS: int = 5
+
+    # Worker'lar arası ortak beğeni sayacı tablosu (bkz. core/shared_tally.py).
+    # Açıkken like_count'lar aynı makinedeki tüm uvicorn worker'larının paylaştığı
+    # mmap dosyasında (varsayılan /dev/shm altında) tutulur; /worlds, /worlds/top5,
+    # /worlds/{id} sayıları buradan sunar. Kapasite: en büyük participant id + 1
+    # (id başına 8 byte); dışındaki dünyalar DB değeriyle sunulur. Tablo başlangıçta
+    # DB'den kurulur ve CHECK_SECONDS'ta bir participants.like_count ile karşılaştırılır.
+    SHARED_TALLY_ENABLED: bool = False
+    SHARED_TALLY_PATH: Optional[str] = None
+    SHARED_TALLY_CAPACITY: int = 65536
+    SHARED_TALLY_CHECK_SECONDS: int = 30
+
+    # Process içi skor tablosunun participants tablosu ile uzlaştırılma aralığı
+    LEADERBOARD_RECONCILE_SECONDS: int = 30
+
+    # Katalog sürümü ve koşullu GET (ETag / 304, bkz. core/catalog_version.py)
+    CATALOG_VERSION_POLL_SECONDS: int = 5 # LISTEN'a ek yedek sorgu aralığı
+    # Oy yazan worker yeni sürümü bu kadar bekleyip tek NOTIFY ile duyurur (bu
+    # sürede gelen oylar birleşir); diğer worker'ların ETag'i en fazla bu kadar geride kalır
+    CATALOG_VERSION_NOTIFY_MS: int = 100
+    CATALOG_CACHE_MAX_AGE_SECONDS: int = 0 # 0: istemci her seferinde doğrular (304)
+    RESPONSE_CACHE_MAX_ENTRIES: int = 256 # Sürüm başına saklanan hazır JSON gövdesi sayısı
+
+    # participants.like_count'un votes ile artımsal uzlaştırılması (bkz. crud/crud_reconcile.py).
+    # 0: arka plan görevi kapalı (scripts/reconcile_like_counts.py ile elle çalıştırılır)
+    LIKE_COUNT_RECONCILE_SECONDS: int = 0
+    LIKE_COUNT_RECONCILE_BATCH_SIZE: int = 500
+
+    # Oylama analitiği (/stats, bkz. core/vote_stats.py). Dakikalık/saatlik oy kovaları
+    # VOTE_STATS_ROLLUP_SECONDS'ta bir yeni oylarla güncellenir (0: arka plan görevi
+    # kapalı); cevaplar VOTE_STATS_CACHE_SECONDS boyunca önbellekte tutulur.
+    VOTE_STATS_ROLLUP_SECONDS: int = 10
+    VOTE_STATS_CACHE_SECONDS: int = 10
+
+    # /metrics (Prometheus metin formatı) ve route bazlı gecikme/DB metrikleri (bkz. core/metrics.py)
+    METRICS_ENABLED: bool = True
+
+    # İstek başına SQL profili (bkz. db/profiler.py). Açıkken sorgu sayısı veya DB
+    # süresi eşiği aşan ya da aynı sorguyu REPEAT_THRESHOLD kez tekrarlayan (olası
+    # N+1) istekler, sorgular ve çağrı yerleriyle loglanır. 0 verilen eşik kapalıdır.
+    SQL_PROFILER_ENABLED: bool = False
+    SQL_PROFILER_MAX_QUERIES: int = 10
+    SQL_PROFILER_MAX_DB_MS: float = 100
+    SQL_PROFILER_REPEAT_THRESHOLD: int = 3
+
+    # Cevaplara X-DB-Query-Count / X-DB-Time-Ms başlıklarını ekle (bkz. db/query_counter.py).
+    # Yük testleri (scripts/loadtest.py) için; production'da kapalı tutun.
+    DB_QUERY_COUNT_HEADER: bool = False
+
+    # Canlı beğeni yayını (SSE, /worlds/stream)
+    STREAM_TICK_MS: int = 250 # Bu süre içindeki oylar tek mesajda birleştirilir
+    STREAM_TOP_N: int = 5 # Yayında gönderilen skor tablosu uzunluğu
+    STREAM_HEARTBEAT_SECONDS: int = 15
+    STREAM_MAX_SUBSCRIBERS: int = 10000 # Worker başına
+
+    # Yönetici endpoint'leri (dışa aktarım, bkz. api/endpoints/admin.py) için
+    # X-Admin-API-Key başlığıyla gönderilecek anahtar. Tanımlı değilse kapalıdır (404).
+    ADMIN_API_KEY: Optional[str] = None
+    EXPORT_CHUNK_SIZE: int = 5000 # Dışa aktarımda cursor'dan tek seferde okunan satır
+
     # CORS Ayarları
     BACKEND_CORS_ORIGINS: Optional[List[str]] = None
     class Config:
-        env_file = ".env"
+        # backend/.env; çalışma dizininden bağımsız (ayarlar sadece buradan yüklenir)
+        env_file = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), ".env")
         env_file_encoding = 'utf-8'
 
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,159 @@
+# backend/app/core/export.py
+# Dışa aktarım biçimleri (CSV, JSON Lines, Parquet). Her yazıcı satır
+# parçalarını (crud/crud_export.py) alır ve hemen gönderilebilecek byte'lar
+# döndürür; çıktının tamamı bellekte tutulmaz. HTTP tarafında CSV ve JSON
+# Lines gzip ile anında sıkıştırılır (GzipEncoder); Parquet zaten kendi içinde
+# sıkıştırılmış (zstd) olduğu için sıkıştırılmaz.
+#
+# Parquet pyarrow ile yazılır (requirements.txt). pyarrow'un import'u ağır olduğu
+# için uygulama açılışında değil, ilk Parquet yazıcısı oluşturulurken yapılır.
+
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from typing import Iterable, List, Sequence, Tuple
+
+EXPORT_CSV = "csv"
+EXPORT_JSONL = "jsonl"
+EXPORT_PARQUET = "parquet"
+EXPORT_FORMATS = (EXPORT_CSV, EXPORT_JSONL, EXPORT_PARQUET)
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} JSON'a çevrilemez")
+
+
+class ExportWriter:
+    media_type = "application/octet-stream"
+    extension = ""
+    compressible = True # HTTP'de gzip uygulanır mı
+
+    def __init__(self, columns: Sequence[Tuple[str, str]]):
+        self.columns = columns
+        self.names = [name for name, _ in columns]
+
+    # Başlık (ilk parçadan önce), satır parçası ve bitiş byte'ları
+    def begin(self) -> bytes:
+        return b""
+
+    def write(self, rows: List[tuple]) -> bytes:
+        raise NotImplementedError
+
+    def finish(self) -> bytes:
+        return b""
+
+
+class CSVExportWriter(ExportWriter):
+    media_type = "text/csv; charset=utf-8"
+    extension = "csv"
+
+    def _encode(self, rows: Iterable[Sequence]) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerows(
+            [value.isoformat() if isinstance(value, (datetime, date)) else value for value in row] for row in rows
+        )
+        return buffer.getvalue().encode("utf-8")
+
+    def begin(self) -> bytes:
+        return self._encode([self.names])
+
+    def write(self, rows: List[tuple]) -> bytes:
+        return self._encode(rows)
+
+
+class JSONLinesExportWriter(ExportWriter):
+    media_type = "application/x-ndjson"
+    extension = "jsonl"
+
+    def write(self, rows: List[tuple]) -> bytes:
+        return "".join(
+            json.dumps(dict(zip(self.names, row)), default=_json_default, ensure_ascii=False) + "\n" for row in rows
+        ).encode("utf-8")
+
+
+# pyarrow'un yazdığı byte'ları toplar; her parçadan sonra boşaltılır
+class _DrainSink:
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+# Her satır parçası bir row group olarak yazılır; dosya sonu (footer) finish'te gelir
+class ParquetExportWriter(ExportWriter):
+    media_type = "application/vnd.apache.parquet"
+    extension = "parquet"
+    compressible = False
+
+    def __init__(self, columns: Sequence[Tuple[str, str]]):
+        super().__init__(columns)
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        types = {"int": pa.int64(), "str": pa.string(), "timestamp": pa.timestamp("us", tz="UTC")}
+        self._pa = pa
+        self._schema = pa.schema([(name, types[kind]) for name, kind in columns])
+        self._sink = _DrainSink()
+        self._writer = pq.ParquetWriter(self._sink, self._schema, compression="zstd")
+
+    def write(self, rows: List[tuple]) -> bytes:
+        if rows:
+            arrays = [
+                self._pa.array(values, type=field.type)
+                for values, field in zip(zip(*rows), self._schema)
+            ]
+            self._writer.write_batch(self._pa.RecordBatch.from_arrays(arrays, schema=self._schema))
+        return self._sink.drain()
+
+    def finish(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+
+
+_WRITERS = {
+    EXPORT_CSV: CSVExportWriter,
+    EXPORT_JSONL: JSONLinesExportWriter,
+    EXPORT_PARQUET: ParquetExportWriter,
+}
+
+
+def export_writer(export_format: str, columns: Sequence[Tuple[str, str]]) -> ExportWriter:
+    return _WRITERS[export_format](columns)
+
+
+# Parça parça gzip sıkıştırma (Content-Encoding: gzip); compress çıktısı boş
+# olabilir, akışın sonu flush ile alınır
+class GzipEncoder:
+    def __init__(self, level: int = 6):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
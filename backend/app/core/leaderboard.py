@@ -0,0 +1,194 @@
+# backend/app/core/leaderboard.py
+
+import asyncio
+import logging
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app import schemas
+
+logger = logging.getLogger(__name__)
+
+# Skor tablosunun process içi kopyası.
+# Başlangıçta participants tablosundan bir kez yüklenir, oy yolu her +1/-1'de
+# apply_vote ile artımsal günceller; /worlds/top ve sıralama sorguları DB'ye
+# gitmeden cevaplanır. Sıralama deterministiktir: like_count azalan, eşitlikte
+# id artan (önce kaydolan dünya önde).
+#
+# Her uvicorn worker'ının kendi kopyası vardır; diğer worker'larda verilen oylar
+# periyodik reconcile ile (LEADERBOARD_RECONCILE_SECONDS) yansır. SHARED_TALLY_ENABLED
+# açıksa sayılar okumadan önce worker'lar arası ortak tablodan eşitlenir
+# (bkz. core/shared_tally.py sync_leaderboard).
+class Leaderboard:
+    def __init__(self):
+        self._participants: Dict[int, schemas.Participant] = {}
+        # (-like_count, id) sıralı anahtar listesi
+        self._order: List[Tuple[int, int]] = []
+        self.loaded = False
+
+    @staticmethod
+    def _key(participant: schemas.Participant) -> Tuple[int, int]:
+        return (-participant.like_count, participant.id)
+
+    def __len__(self) -> int:
+        return len(self._participants)
+
+    # Tüm durumu verilen satırlarla değiştirir; düzeltilen (farklı like_count'a
+    # sahip, eklenen veya silinen) katılımcı sayısını döndürür
+    def load(self, rows: Iterable) -> int:
+        participants = {row.id: schemas.Participant.model_validate(row) for row in rows}
+        corrections = 0
+        if self.loaded:
+            for participant_id, participant in participants.items():
+                current = self._participants.get(participant_id)
+                if current is None or current.like_count != participant.like_count:
+                    corrections += 1
+            corrections += len(self._participants.keys() - participants.keys())
+        self._participants = participants
+        self._order = sorted(self._key(p) for p in participants.values())
+        self.loaded = True
+        return corrections
+
+    # Oy motorunun döndürdüğü satır ve değişim (delta) ile tabloyu günceller.
+    # Delta uygulanır (değişmeli işlem); böylece eşzamanlı oyların cevapları
+    # hangi sırayla gelirse gelsin sonuç aynı olur.
+    def apply_vote(self, row, delta: int):
+        if not self.loaded:
+            return
+        current = self._participants.get(row.id)
+        if current is None:
+            updated = schemas.Participant.model_validate(row)
+        else:
+            self._remove_key(self._key(current))
+            updated = current.model_copy(
+                update={"like_count": current.like_count + delta, "updated_at": row.updated_at}
+            )
+        self._participants[updated.id] = updated
+        insort(self._order, self._key(updated))
+
+    # Beğeni sayısını mutlak değerle değiştirir (ortak sayaç tablosundan eşitleme,
+    # bkz. core/shared_tally.py); bilinmeyen katılımcılar bir sonraki yüklemede eklenir
+    def set_like_count(self, participant_id: int, like_count: int):
+        current = self._participants.get(participant_id)
+        if current is None or current.like_count == like_count:
+            return
+        self._remove_key(self._key(current))
+        updated = current.model_copy(update={"like_count": like_count})
+        self._participants[participant_id] = updated
+        insort(self._order, self._key(updated))
+
+    # En çok beğeni alan ilk n katılımcı
+    def top(self, n: int) -> List[schemas.Participant]:
+        return [self._participants[participant_id] for _, participant_id in self._order[:n]]
+
+    # 1'den başlayan sıra; katılımcı yoksa None
+    def rank(self, participant_id: int) -> Optional[int]:
+        participant = self._participants.get(participant_id)
+        if participant is None:
+            return None
+        return bisect_left(self._order, self._key(participant)) + 1
+
+    # Tüm dünyaların güncel beğeni sayıları
+    def like_counts(self) -> Dict[int, int]:
+        return {participant_id: p.like_count for participant_id, p in self._participants.items()}
+
+    def get(self, participant_id: int) -> Optional[schemas.Participant]:
+        return self._participants.get(participant_id)
+
+    def _remove_key(self, key: Tuple[int, int]):
+        index = bisect_left(self._order, key)
+        if index < len(self._order) and self._order[index] == key:
+            del self._order[index]
+
+
+leaderboard = Leaderboard()
+
+
+# Skor tablosunu participants tablosundan (yeniden) yükler. Ortak sayaç tablosu
+# açıksa sayılar oradan alınır (diğer worker'ların oyları dahil).
+async def refresh_leaderboard() -> int:
+    # Döngüsel import olmaması için burada import edilir
+    from app import crud
+    from app.core.shared_tally import sync_leaderboard
+    from app.db.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        rows = await crud.crud_participant_async.get_all_participants(db)
+    corrections = leaderboard.load(rows)
+    sync_leaderboard(force=True)
+    return corrections
+
+
+# Periyodik olarak DB ile uzlaştırma (reconciliation) yapan arka plan görevi
+async def run_leaderboard_reconciliation(interval_seconds: float):
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            before = leaderboard.like_counts()
+            corrections = await refresh_leaderboard()
+            if corrections:
+                logger.info("Skor tablosu DB ile uzlaştırıldı, %d katılımcı düzeltildi", corrections)
+                # Diğer worker'larda verilen oyları canlı yayın abonelerine de ilet
+                from app.core.broadcaster import broadcaster
+                for participant_id, like_count in leaderboard.like_counts().items():
+                    if before.get(participant_id) != like_count:
+                        broadcaster.publish_like_count(participant_id, like_count)
+        except Exception:
+            logger.exception("Skor tablosu uzlaştırması başarısız oldu")
+
+
+# like_count sayaçlarını votes ile artımsal uzlaştıran arka plan görevi
+# (LIKE_COUNT_RECONCILE_SECONDS > 0 ise). Senkron Session kullandığı için thread'de çalışır.
+async def run_like_count_reconciliation(interval_seconds: float, batch_size: int):
+    from app import crud
+    from app.core.catalog_version import catalog_version
+    from app.db.database import SessionLocal
+
+    def reconcile():
+        with SessionLocal() as db:
+            return crud.crud_reconcile.reconcile_like_counts(db, batch_size=batch_size)
+
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            report = await asyncio.to_thread(reconcile)
+            if report.busy:
+                logger.info("like_count uzlaştırması %d dünyayı düzeltemedi (sayaç değişiyordu): %s",
+                            len(report.busy), ", ".join(map(str, report.busy[:20])))
+            if report.corrections:
+                logger.warning(
+                    "like_count uzlaştırması %d dünyayı düzeltti: %s", len(report.corrections),
+                    ", ".join(f"{c.participant_id}: {c.old_count}->{c.new_count}" for c in report.corrections[:20]),
+                )
+                await refresh_leaderboard()
+                catalog_version.mark_stale()
+                catalog_version.announce()
+        except Exception:
+            logger.exception("like_count uzlaştırması başarısız oldu")
+
+
+# Parçalı beğeni sayaçlarını participants.like_count'a toplar (bkz. crud/crud_like_shards.py).
+# Skor tablosu bekleyen sayaçları zaten saydığı için burada güncellenmez;
+# toplama participants'ı değiştirdiği için katalog sürümü (ETag) kendiliğinden
+# artar, yeni sürüm diğer worker'lara duyurulur.
+async def roll_up_like_shards(batch_size: int) -> int:
+    from app import crud
+    from app.core.catalog_version import catalog_version
+    from app.db.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        updated = len(await crud.crud_like_shards.roll_up_like_shards(db, batch_size=batch_size))
+    if updated:
+        catalog_version.mark_stale()
+        catalog_version.announce()
+    return updated
+
+
+# LIKE_COUNTER_SHARDS > 0 iken periyodik toplama yapan arka plan görevi
+async def run_like_shard_rollup(interval_seconds: float, batch_size: int):
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await roll_up_like_shards(batch_size)
+        except Exception:
+            logger.exception("Beğeni sayaçları toplanamadı")
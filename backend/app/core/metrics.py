@@ -0,0 +1,212 @@
+# backend/app/core/metrics.py
+# Prometheus metin formatında (text exposition 0.0.4) metrikler.
+# Harici kütüphane yok: sayaç (Counter) ve histogram (Histogram) process içinde
+# tutulur, /metrics isteğinde metne çevrilir. Bileşenlerin zaten tuttuğu
+# sayaçlar (önbellek isabetleri, havuz doluluğu vb.) sıcak yola hiç dokunmadan,
+# sadece okuma anında collector fonksiyonlarıyla toplanır.
+#
+# Her uvicorn worker'ının kendi kayıt defteri vardır; birden fazla worker ile
+# /metrics hangi worker'a düşerse onun değerlerini döndürür.
+#
+# app içinden sadece db/query_counter'ı import eder (db/database.py da bu modülü kullanır).
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from app.db.query_counter import track_queries
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Saniye cinsinden varsayılan kovalar (1 ms .. 10 sn)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+Labels = Tuple[str, ...]
+# collector çıktısı: (ad, tip, açıklama, [(etiketler, değer), ...])
+Sample = Tuple[Dict[str, str], float]
+MetricFamily = Tuple[str, str, str, List[Sample]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # etiketler -> [kova sayıları (kümülatif değil; son eleman +Inf), toplam]
+        self._series: Dict[Labels, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    # Blok süresini gözlemler
+    def time(self, *labels: str):
+        return _Timer(self, labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((labels, list(counts), total) for labels, (counts, total) in self._series.items())
+        for labels, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class _Timer:
+    def __init__(self, histogram: Histogram, labels: Labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.started, *self.labels)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: list = []
+        self._collectors: List[Callable[[], Iterable[MetricFamily]]] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    # Okuma anında çağrılan fonksiyon ekler (bileşenlerin kendi sayaçları için)
+    def register_collector(self, collector: Callable[[], Iterable[MetricFamily]]):
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for name, metric_type, documentation, samples in collector():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(list(labels), list(labels.values()))} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total", "HTTP istekleri (route şablonu ve durum koduna göre)", ("method", "route", "status"),
+)
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds", "HTTP istek süresi", ("method", "route"),
+)
+DB_REQUEST_QUERIES = registry.histogram(
+    "db_request_queries", "İstek başına DB sorgu sayısı", ("method", "route"), buckets=QUERY_COUNT_BUCKETS,
+)
+DB_REQUEST_SECONDS = registry.histogram(
+    "db_request_duration_seconds", "İstek başına DB'de geçen toplam süre", ("method", "route"),
+)
+DB_POOL_CHECKOUT_SECONDS = registry.histogram(
+    "db_pool_checkout_duration_seconds", "Havuzdan bağlantı alma (bekleme dahil) süresi", ("engine",),
+)
+PASSWORD_HASH_SECONDS = registry.histogram(
+    "password_hash_duration_seconds", "bcrypt doğrulama süresi", buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0),
+)
+PASSWORD_HASH_QUEUE_SECONDS = registry.histogram(
+    "password_hash_queue_seconds", "bcrypt havuzunda sıra bekleme süresi",
+)
+
+
+# Saf ASGI middleware: her HTTP isteğinin süresini, durum kodunu, DB sorgu
+# sayısını ve DB süresini route şablonuyla (/api/v1/worlds/{participant_id})
+# etiketler; ham yol kullanılmaz ki etiket sayısı sınırlı kalsın. Eşleşmeyen
+# yollar (404) "unmatched" olarak toplanır.
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        with track_queries() as counter:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = getattr(scope.get("route"), "path", "unmatched")
+                method = scope["method"]
+                HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, method, route)
+                HTTP_REQUESTS.inc(method, route, str(status))
+                DB_REQUEST_QUERIES.observe(counter.count, method, route)
+                DB_REQUEST_SECONDS.observe(counter.seconds, method, route)
@@ -0,0 +1,44 @@
+# backend/app/core/pagination.py
+
+import base64
+import json
+from typing import Optional, Tuple
+
+# Keyset (cursor) sayfalama yardımcıları.
+# Cursor istemci için opak bir string'dir: sıralama türü ve son satırın
+# anahtar değerlerini taşır (base64url JSON). İstemci bir sonraki sayfayı
+# istemek için cevaptaki X-Next-Cursor değerini aynen geri gönderir.
+
+ORDER_BY_ID = "id"
+ORDER_BY_LIKES = "like_count"
+ORDER_BY_CHOICES = (ORDER_BY_ID, ORDER_BY_LIKES)
+
+
+def encode_cursor(order_by: str, key: Tuple) -> str:
+    raw = json.dumps({"o": order_by, "k": list(key)}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+# Geçersiz veya farklı sıralamaya ait cursor için ValueError fırlatır
+def decode_cursor(cursor: Optional[str], order_by: str) -> Optional[Tuple]:
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key = tuple(int(value) for value in data["k"])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+    if data.get("o") != order_by:
+        raise ValueError("Cursor does not match order_by")
+    expected_length = 1 if order_by == ORDER_BY_ID else 2
+    if len(key) != expected_length:
+        raise ValueError("Invalid cursor")
+    return key
+
+
+# Satırın sıralama anahtarı (cursor'a yazılacak değerler)
+def cursor_key(order_by: str, row) -> Tuple:
+    if order_by == ORDER_BY_ID:
+        return (row["id"],)
+    return (row["like_count"], row["id"])
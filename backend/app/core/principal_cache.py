@@ -0,0 +1,93 @@
+# backend/app/core/principal_cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app import schemas
+from app.core.config import settings
+
+# Doğrulanmış token -> öğrenci (principal) önbelleği.
+# get_current_student her istekte JWT çözüp DB'den öğrenci okumasın diye
+# kullanılır. Boyut sınırlı (LRU) ve her kayıt TTL ile sona erer; TTL hiçbir
+# zaman token'ın kendi exp süresini geçmez. Kayıtlar elle geçersiz kılınmaz:
+# öğrenci DB'de silinir veya değişirse worker'lar en fazla TTL boyunca eski
+# principal'ı kullanır (bkz. config.py PRINCIPAL_CACHE_TTL_SECONDS).
+class PrincipalCache:
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, schemas.Student]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    # Önbellekte geçerli bir kayıt varsa principal'ı döndür, yoksa None
+    def get(self, token: str) -> Optional[schemas.Student]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, principal = entry
+            if expires_at <= time.monotonic():
+                del self._entries[token]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return principal
+
+    # get gibi, ama LRU sırasını ve isabet sayaçlarını değiştirmez (yönlendirme kararları için)
+    def peek(self, token: str) -> Optional[schemas.Student]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(token)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    # token_exp: JWT'deki exp (unix zamanı); kayıt bundan daha uzun yaşamaz
+    def put(self, token: str, principal: schemas.Student, token_exp: Optional[float] = None):
+        if not self.enabled:
+            return
+        ttl = self.ttl_seconds
+        if token_exp is not None:
+            ttl = min(ttl, token_exp - time.time())
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[token] = (time.monotonic() + ttl, principal)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_SIZE,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,103 @@
+# backend/app/core/rate_limit.py
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Tuple
+
+from app.core.config import settings
+
+# Limit aşıldığında fırlatılır; endpoint 429 (Retry-After: retry_after) döndürmelidir
+class RateLimited(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__(retry_after)
+        self.retry_after = retry_after
+
+    # Retry-After başlığı için tam saniye (en az 1)
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+# Eşzamanlılık sınırı doluyken fırlatılır; endpoint 503 döndürmelidir
+class ConcurrencyLimitReached(Exception):
+    pass
+
+
+# Anahtar (öğrenci id) başına token bucket. Her anahtarın kovası `burst` token
+# ile başlar ve saniyede `rate` token dolar; her istek bir token harcar.
+# Kovalar boyutu sınırlı bir LRU'da tutulur: max_entries aşılınca en uzun
+# süredir görülmeyen anahtar atılır (o anahtar büyük olasılıkla zaten dolmuştur;
+# atılan anahtar tekrar gelirse dolu kova ile başlar).
+class TokenBucketLimiter:
+    def __init__(self, rate_per_second: float, burst: int, max_entries: int):
+        self.rate = rate_per_second
+        self.burst = max(1, burst)
+        self.max_entries = max(1, max_entries)
+        # anahtar -> (token sayısı, son güncelleme zamanı)
+        self._buckets: "OrderedDict[int, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.rejected = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    # Bir token harcar; kova boşsa RateLimited (bir sonraki token'a kalan süre ile)
+    def acquire(self, key: int):
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_entries:
+                self._buckets.popitem(last=False)
+                self.evictions += 1
+            if allowed:
+                self.allowed += 1
+                return
+            self.rejected += 1
+        raise RateLimited((1 - tokens) / self.rate)
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+# Aynı anda işlenen istek sayısı sınırı (load shedding). Sınır doluyken yeni
+# istek kuyruğa alınmaz, ConcurrencyLimitReached ile hemen reddedilir; böylece
+# DB havuzu önünde biriken istekler gecikmeyi büyütmez. max_concurrent <= 0: kapalı.
+class ConcurrencyLimiter:
+    def __init__(self, max_concurrent: int):
+        self.max_concurrent = max_concurrent
+        self.in_flight = 0 # Sadece event loop thread'inden değiştirilir
+        self.shed = 0
+
+    def acquire(self):
+        if 0 < self.max_concurrent <= self.in_flight:
+            self.shed += 1
+            raise ConcurrencyLimitReached()
+        self.in_flight += 1
+
+    def release(self):
+        self.in_flight -= 1
+
+
+# /votes için (bkz. api/deps.py vote_admission)
+vote_rate_limiter = TokenBucketLimiter(
+    rate_per_second=settings.VOTE_RATE_LIMIT_PER_SECOND,
+    burst=settings.VOTE_RATE_LIMIT_BURST,
+    max_entries=settings.VOTE_RATE_LIMIT_MAX_STUDENTS,
+)
+vote_concurrency_limiter = ConcurrencyLimiter(max_concurrent=settings.VOTE_MAX_CONCURRENCY)
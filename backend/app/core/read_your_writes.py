@@ -0,0 +1,35 @@
+# backend/app/core/read_your_writes.py
+
+import threading
+import time
+from collections import OrderedDict
+
+from app.core.config import settings
+
+# Kendi yazdığını okuma (read-your-writes) penceresi.
+# Okuma replikası birincilin birkaç milisaniye/saniye gerisinde olabilir; oy
+# veren öğrencinin hemen ardından gelen okumaları (my-votes, /worlds) bu pencere
+# boyunca birincile yönlendirilir (bkz. api/deps.py get_read_db).
+# Worker içinde tutulur; boyut sınırlıdır (en eski kayıt atılır).
+class RecentWriters:
+    def __init__(self, window_seconds: float, max_entries: int = 100_000):
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._deadlines: "OrderedDict[int, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, student_id: int):
+        if self.window_seconds <= 0:
+            return
+        with self._lock:
+            self._deadlines[student_id] = time.monotonic() + self.window_seconds
+            self._deadlines.move_to_end(student_id)
+            while len(self._deadlines) > self.max_entries:
+                self._deadlines.popitem(last=False)
+
+    def is_recent(self, student_id: int) -> bool:
+        deadline = self._deadlines.get(student_id)
+        return deadline is not None and deadline > time.monotonic()
+
+
+recent_writers = RecentWriters(window_seconds=settings.READ_YOUR_WRITES_SECONDS)
@@ -0,0 +1,95 @@
+# backend/app/core/response_cache.py
+
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+from fastapi import Response
+
+from app.core.config import settings
+
+
+# Hazır (önceden JSON'a çevrilmiş) cevap gövdeleri önbelleği.
+# Sıcak okuma endpoint'leri aynı katalog sürümü ve aynı sorgu için gövdeyi bir
+# kez üretir; sonraki istekler Pydantic doğrulaması ve serialize yapılmadan bu
+# byte'ları döndürür. Sürüm değişince (bkz. core/catalog_version.py) tüm
+# girdiler geçersiz olur. Sürüm bilinmiyorsa (None) önbellek kullanılmaz.
+class VersionedResponseCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._version: Optional[int] = None
+        # anahtar -> (gövde, ek başlıklar, ör. X-Next-Cursor)
+        self._entries: "OrderedDict[Hashable, Tuple[bytes, Dict[str, str]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, version: Optional[int], key: Hashable) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        if version is None or version != self._version:
+            self.misses += 1
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, version: Optional[int], key: Hashable, body: bytes, headers: Dict[str, str]):
+        if version is None or self.max_entries <= 0:
+            return
+        if self._version is None or version > self._version:
+            self._version = version
+            self._entries.clear()
+        elif version < self._version:
+            # Eski sürümle üretilmiş gövde yeni sürümün girdisi olarak saklanmaz
+            return
+        self._entries[key] = (body, headers)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._version = None
+        self._entries.clear()
+
+
+# Süreli (TTL) hazır JSON gövdesi önbelleği: katalog sürümüne bağlı olmayan,
+# periyodik olarak güncellenen veriler için (ör. /stats, bkz. core/vote_stats.py).
+# Girdi ttl_seconds boyunca aynen döner; en fazla max_entries girdi (LRU) tutulur.
+class TTLResponseCache:
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # anahtar -> (son geçerlilik, gövde, ek başlıklar)
+        self._entries: "OrderedDict[Hashable, Tuple[float, bytes, Dict[str, str]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1], entry[2]
+
+    def put(self, key: Hashable, body: bytes, headers: Dict[str, str]):
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, body, headers)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+
+# Hazır JSON gövdesini cevap olarak döndürür (response_model doğrulaması atlanır)
+def json_bytes_response(body: bytes, headers: Dict[str, str]) -> Response:
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+catalog_response_cache = VersionedResponseCache(max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES)
@@ -1,11 +1,15 @@
 # backend/app/core/security.py
 
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings 
+from app.core.metrics import PASSWORD_HASH_QUEUE_SECONDS, PASSWORD_HASH_SECONDS
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -20,6 +24,68 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+
+# Havuz thread'inde çalışır: sırada bekleme ve bcrypt sürelerini metriklere yazar
+def _verify_password_timed(plain_password: str, hashed_password: str, submitted_at: float) -> bool:
+    started = time.perf_counter()
+    PASSWORD_HASH_QUEUE_SECONDS.observe(started - submitted_at)
+    try:
+        return verify_password(plain_password, hashed_password)
+    finally:
+        PASSWORD_HASH_SECONDS.observe(time.perf_counter() - started)
+
+
+# Havuz ve kuyruk doluyken fırlatılır; endpoint 503 döndürmelidir
+class PasswordHasherBusy(Exception):
+    pass
+
+
+# Bcrypt doğrulamasını (100-300 ms CPU) event loop'u bloklamadan, boyutu sınırlı
+# bir thread havuzunda çalıştırır. bcrypt C kodu GIL'i bıraktığı için thread'ler
+# gerçekten paralel çalışır. Çalışan + bekleyen iş sayısı sınırı aşarsa istek
+# kuyruğa alınmaz, PasswordHasherBusy ile hemen reddedilir (admission control).
+class PasswordVerifier:
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = max(1, workers)
+        self.max_pending = self.workers + max(0, max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        self.pending = 0 # Sadece event loop thread'inden değiştirilir
+        self.shed = 0
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        if self.pending >= self.max_pending:
+            self.shed += 1
+            raise PasswordHasherBusy()
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, _verify_password_timed, plain_password, hashed_password, time.perf_counter()
+            )
+        finally:
+            self.pending -= 1
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_verifier = PasswordVerifier(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
+
+# passlib bcrypt backend'ini ilk kullanımda yükler; başlangıçta (core/warmup.py)
+# ucuz bir hash üretip doğrulayarak bu maliyeti ve havuz thread'inin açılmasını
+# ilk login isteğinden alır
+async def warm_up_password_verifier():
+    hashed = await asyncio.to_thread(pwd_context.handler("bcrypt").using(rounds=4).hash, "warm-up")
+    await password_verifier.verify("warm-up", hashed)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_verifier.verify(plain_password, hashed_password)
+
 # Erişim token'ı oluşturma fonksiyonu
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -0,0 +1,369 @@
+# backend/app/core/shared_tally.py
+# Worker'lar arası ortak beğeni sayacı tablosu (SHARED_TALLY_ENABLED).
+# uvicorn --workers N ile her worker'ın process içi durumu (skor tablosu, oy
+# yolu) ayrı kalır; başka worker'da verilen oy ancak bir sonraki uzlaştırmada
+# görünür. Bu modül beğeni sayılarını aynı makinedeki tüm worker'ların mmap ile
+# paylaştığı sabit düzenli bir dosyada tutar (varsayılan /dev/shm, yani RAM):
+#
+#   başlık (64 byte): magic, kapasite, nesil (yeniden kurulum sayısı),
+#                     değişiklik sayacı, en büyük kullanılan id + 1, kurulum zamanı
+#   slotlar:          participant id başına bir int64 (-1: bilinmiyor)
+#
+# Her okuma/yazma dosya üzerinde flock (process'ler arası) ve threading.Lock
+# (process içi thread'ler arası) altında yapılır; kritik bölgeler birkaç
+# mikrosaniyedir. Oy yolu commit sonrası delta ekler (değişmeli işlem).
+# Değişiklik sayacı ETag'lere ve hazır JSON önbellek anahtarlarına katılır.
+#
+# Başlangıçta tablo DB'den yeniden kurulur (rebuild_shared_tally). Kurulum ve
+# oylar arasındaki küçük yarış (snapshot okunurken commit edilen oy) periyodik
+# tutarlılık kontrolüyle düzeltilir (check_shared_tally): kontrol sadece iki
+# okuma arasında değişmeyen farkları compare-and-set ile düzeltir, yani o an
+# yolda olan oyları ezmez. Redis vb. dış servis gerekmez; fcntl olmayan
+# platformlarda (Windows) özellik kapalı kalır.
+
+import asyncio
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"MCTALLY1"
+# magic, kapasite, nesil, değişiklik sayacı, en büyük id + 1, kurulum zamanı (unix)
+_HEADER = struct.Struct("<8sqqqqd")
+_HEADER_SIZE = 64
+_SLOT = struct.Struct("<q")
+_UNKNOWN = -1
+# Başlıktaki alanların byte konumları
+_GENERATION_OFFSET = 16
+_UPDATES_OFFSET = 24
+_HIGH_WATER_OFFSET = 32
+_BUILT_AT_OFFSET = 40
+# Tutarlılık kontrolünde iki okuma arasındaki bekleme: yoldaki oylar
+# (commit edilmiş ama tabloya henüz eklenmemiş) bu sürede tamamlanır
+_CHECK_GRACE_SECONDS = 1.0
+
+
+# SHARED_TALLY_PATH verilmemişse: /dev/shm (tmpfs) veya geçici dizin; aynı
+# veritabanına bağlanan worker'lar aynı dosyayı kullanır
+def default_tally_path() -> str:
+    digest = hashlib.blake2b(settings.DATABASE_URL.encode(), digest_size=6).hexdigest()
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, f"mcworlds-tally-{digest}")
+
+
+class SharedTally:
+    def __init__(self, path: str, capacity: int):
+        self.path = path
+        self.capacity = max(1, capacity)
+        self._fd: Optional[int] = None
+        self._mm: Optional[mmap.mmap] = None
+        self._thread_lock = threading.Lock()
+        self.corrections = 0 # Bu worker'ın tutarlılık kontrolünde düzelttiği slotlar
+
+    @property
+    def size(self) -> int:
+        return _HEADER_SIZE + self.capacity * _SLOT.size
+
+    # Dosyayı açar (yoksa oluşturur) ve belleğe eşler. Başlık bu kapasiteyle
+    # uyuşmuyorsa (eski sürüm/ayar) dosya sıfırlanır.
+    def open(self):
+        if self._mm is not None:
+            return
+        import fcntl
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                header = os.pread(fd, _HEADER.size, 0)
+                valid = (
+                    os.fstat(fd).st_size == self.size and len(header) == _HEADER.size
+                    and _HEADER.unpack(header)[:2] == (_MAGIC, self.capacity)
+                )
+                if not valid:
+                    os.ftruncate(fd, 0)
+                    os.ftruncate(fd, self.size)
+                    os.pwrite(fd, _HEADER.pack(_MAGIC, self.capacity, 0, 0, 0, 0.0), 0)
+                    os.pwrite(fd, b"\xff" * (self.capacity * _SLOT.size), _HEADER_SIZE)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            self._mm = mmap.mmap(fd, self.size)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            os.close(self._fd)
+            self._mm, self._fd = None, None
+
+    @contextmanager
+    def _locked(self):
+        import fcntl
+
+        with self._thread_lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield self._mm
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _read(self, mm, offset: int) -> int:
+        return _SLOT.unpack_from(mm, offset)[0]
+
+    def _write(self, mm, offset: int, value: int):
+        _SLOT.pack_into(mm, offset, value)
+
+    def _slot(self, participant_id: int) -> Optional[int]:
+        if 0 <= participant_id < self.capacity:
+            return _HEADER_SIZE + participant_id * _SLOT.size
+        return None
+
+    # Bir değer değiştiğinde: değişiklik sayacı ve (gerekirse) en büyük id
+    def _touch(self, mm, participant_id: int):
+        self._write(mm, _UPDATES_OFFSET, self._read(mm, _UPDATES_OFFSET) + 1)
+        if participant_id + 1 > self._read(mm, _HIGH_WATER_OFFSET):
+            self._write(mm, _HIGH_WATER_OFFSET, participant_id + 1)
+
+    @property
+    def ready(self) -> bool:
+        return self._mm is not None and self._read(self._mm, _GENERATION_OFFSET) > 0
+
+    # (nesil, değişiklik sayacı): tablo her değiştiğinde farklıdır; hazır değilse None
+    def stamp(self) -> Optional[Tuple[int, int]]:
+        if self._mm is None:
+            return None
+        with self._locked() as mm:
+            generation = self._read(mm, _GENERATION_OFFSET)
+            return (generation, self._read(mm, _UPDATES_OFFSET)) if generation > 0 else None
+
+    # Tüm slotları verilen sayılarla değiştirir (kapasite dışındaki id'ler atlanır)
+    def rebuild(self, counts: Dict[int, int]) -> int:
+        skipped = 0
+        with self._locked() as mm:
+            mm[_HEADER_SIZE:self.size] = b"\xff" * (self.capacity * _SLOT.size)
+            high_water = 0
+            for participant_id, like_count in counts.items():
+                offset = self._slot(participant_id)
+                if offset is None:
+                    skipped += 1
+                    continue
+                self._write(mm, offset, like_count)
+                high_water = max(high_water, participant_id + 1)
+            self._write(mm, _GENERATION_OFFSET, self._read(mm, _GENERATION_OFFSET) + 1)
+            self._write(mm, _UPDATES_OFFSET, self._read(mm, _UPDATES_OFFSET) + 1)
+            self._write(mm, _HIGH_WATER_OFFSET, high_water)
+            struct.pack_into("<d", mm, _BUILT_AT_OFFSET, time.time())
+        return skipped
+
+    # Oy yolunun değişimi: slot biliniyorsa delta eklenir, bilinmiyorsa (kurulumdan
+    # sonra eklenen dünya) oy motorunun döndürdüğü güncel sayı yazılır. Yeni değer döner.
+    def apply_vote(self, participant_id: int, delta: int, like_count: int) -> Optional[int]:
+        offset = self._slot(participant_id)
+        if offset is None or not self.ready:
+            return None
+        with self._locked() as mm:
+            current = self._read(mm, offset)
+            value = like_count if current == _UNKNOWN else max(0, current + delta)
+            self._write(mm, offset, value)
+            self._touch(mm, participant_id)
+        return value
+
+    # Slot hâlâ `expected` ise `value` yazar (tutarlılık düzeltmesi için)
+    def compare_and_set(self, participant_id: int, expected: int, value: int) -> bool:
+        offset = self._slot(participant_id)
+        if offset is None:
+            return False
+        with self._locked() as mm:
+            if self._read(mm, offset) != expected:
+                return False
+            self._write(mm, offset, value)
+            self._touch(mm, participant_id)
+        return True
+
+    def get_many(self, participant_ids: Iterable[int]) -> Dict[int, int]:
+        result = {}
+        with self._locked() as mm:
+            for participant_id in participant_ids:
+                offset = self._slot(participant_id)
+                if offset is not None:
+                    value = self._read(mm, offset)
+                    if value != _UNKNOWN:
+                        result[participant_id] = value
+        return result
+
+    # Bilinen tüm sayılar {id: like_count}; sadece kullanılan aralık kopyalanır
+    def snapshot(self) -> Dict[int, int]:
+        with self._locked() as mm:
+            high_water = self._read(mm, _HIGH_WATER_OFFSET)
+            values = array("q", mm[_HEADER_SIZE:_HEADER_SIZE + high_water * _SLOT.size])
+        return {participant_id: value for participant_id, value in enumerate(values) if value != _UNKNOWN}
+
+
+shared_tally = SharedTally(
+    path=settings.SHARED_TALLY_PATH or default_tally_path(),
+    capacity=settings.SHARED_TALLY_CAPACITY,
+)
+
+
+# Endpoint'ler için: tablo açık ve kuruluysa shared_tally, değilse None
+def active_tally() -> Optional[SharedTally]:
+    if settings.SHARED_TALLY_ENABLED and shared_tally.ready:
+        return shared_tally
+    return None
+
+
+# Hazır JSON önbellek anahtarına / ETag'e eklenecek damga; tablo kapalıysa None
+def tally_stamp() -> Optional[Tuple[int, int]]:
+    tally = active_tally()
+    return tally.stamp() if tally is not None else None
+
+
+# Doğrulanmış modellerin (id ve like_count alanı olan) like_count'larını
+# tablodaki değerle değiştirir; tablo kapalıysa hiçbir şey yapmaz
+def overlay_like_counts(items: List) -> List:
+    tally = active_tally()
+    if tally is None or not items:
+        return items
+    counts = tally.get_many(item.id for item in items if item.id is not None)
+    for item in items:
+        like_count = counts.get(item.id)
+        # fields= ile like_count istenmediyse alan set edilmez
+        if like_count is not None and item.like_count is not None and like_count != item.like_count:
+            item.like_count = like_count
+    return items
+
+
+# Process içi skor tablosunu ortak tabloya eşitler. Damga değişmediyse (veya
+# skor tablosu yeniden yüklenmediyse) hiçbir şey yapmaz; değiştiyse sadece
+# farklı sayılar güncellenir.
+_synced_stamp: Optional[Tuple[int, int]] = None
+
+
+def sync_leaderboard(force: bool = False):
+    global _synced_stamp
+    from app.core.leaderboard import leaderboard
+
+    tally = active_tally()
+    if tally is None or not leaderboard.loaded:
+        return
+    stamp = tally.stamp()
+    if stamp == _synced_stamp and not force:
+        return
+    for participant_id, like_count in tally.snapshot().items():
+        leaderboard.set_like_count(participant_id, like_count)
+    _synced_stamp = stamp
+
+
+# DB'deki beğeni sayıları (participants.like_count + bekleyen parçalı sayaçlar)
+async def _db_like_counts() -> Dict[int, int]:
+    # Döngüsel import olmaması için burada import edilir
+    from app import crud
+    from app.db.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        rows = await crud.crud_participant_async.get_all_participants(db)
+    return {row.id: row.like_count for row in rows}
+
+
+# Tabloyu DB'den yeniden kurar (her worker başlangıçta çağırır)
+async def rebuild_shared_tally():
+    shared_tally.open()
+    counts = await _db_like_counts()
+    skipped = shared_tally.rebuild(counts)
+    if skipped:
+        logger.warning(
+            "%d dünyanın id'si SHARED_TALLY_CAPACITY (%d) dışında; bu dünyalar DB değeriyle sunulur",
+            skipped, shared_tally.capacity,
+        )
+    sync_leaderboard(force=True)
+
+
+@dataclass
+class TallyMismatch:
+    participant_id: int
+    tally_count: Optional[int] # None: tabloda yok
+    db_count: Optional[int] # None: DB'de yok (silinmiş dünya)
+    corrected: bool = False
+
+
+@dataclass
+class TallyCheckReport:
+    checked: int = 0
+    mismatches: List[TallyMismatch] = field(default_factory=list)
+
+    @property
+    def corrections(self) -> int:
+        return sum(1 for mismatch in self.mismatches if mismatch.corrected)
+
+
+def _differences(tally: Dict[int, int], db: Dict[int, int], capacity: int) -> Dict[int, Tuple[Optional[int], Optional[int]]]:
+    return {
+        participant_id: (tally.get(participant_id), db.get(participant_id))
+        for participant_id in tally.keys() | db.keys()
+        if participant_id < capacity and tally.get(participant_id) != db.get(participant_id)
+    }
+
+
+# Tabloyu participants.like_count ile karşılaştırır. Fark bulunursa
+# _CHECK_GRACE_SECONDS sonra tekrar okunur; sadece iki okumada da aynı kalan
+# farklar gerçek kabul edilir ve fix=True ise compare-and-set ile düzeltilir.
+async def check_shared_tally(fix: bool = True) -> TallyCheckReport:
+    shared_tally.open()
+    db_counts = await _db_like_counts()
+    first = _differences(shared_tally.snapshot(), db_counts, shared_tally.capacity)
+    report = TallyCheckReport(checked=len(db_counts))
+    if not first:
+        return report
+    await asyncio.sleep(_CHECK_GRACE_SECONDS)
+    second = _differences(shared_tally.snapshot(), await _db_like_counts(), shared_tally.capacity)
+    for participant_id, (tally_count, db_count) in sorted(second.items()):
+        if first.get(participant_id) != (tally_count, db_count):
+            continue # Arada oy geldi; bir sonraki kontrolde tekrar bakılır
+        mismatch = TallyMismatch(participant_id, tally_count, db_count)
+        if fix:
+            mismatch.corrected = shared_tally.compare_and_set(
+                participant_id,
+                _UNKNOWN if tally_count is None else tally_count,
+                _UNKNOWN if db_count is None else db_count,
+            )
+        report.mismatches.append(mismatch)
+    shared_tally.corrections += report.corrections
+    if report.corrections:
+        sync_leaderboard(force=True)
+    return report
+
+
+# Periyodik tutarlılık kontrolü yapan arka plan görevi; tablo başlangıçta
+# kurulamadıysa (ör. DB erişilemiyordu) önce kurulur
+async def run_shared_tally_check(interval_seconds: float):
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            if not shared_tally.ready:
+                await rebuild_shared_tally()
+                continue
+            report = await check_shared_tally()
+            if report.corrections:
+                logger.warning(
+                    "Ortak sayaç tablosunda %d dünya düzeltildi: %s", report.corrections,
+                    ", ".join(
+                        f"{m.participant_id}: {m.tally_count}->{m.db_count}" for m in report.mismatches if m.corrected
+                    )[:2000],
+                )
+        except Exception:
+            logger.exception("Ortak sayaç tablosu kontrolü başarısız oldu")
@@ -0,0 +1,295 @@
+# backend/app/core/vote_buffer.py
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud, models, schemas
+from app.core.catalog_version import catalog_version
+from app.core.config import settings
+from app.core.leaderboard import leaderboard
+from app.crud.crud_vote_async import (
+    VOTE_LIKED, VOTE_LIMIT_EXCEEDED, VOTE_PARTICIPANT_NOT_FOUND, VOTE_UNLIKED, VoteToggleResult, _violated_constraint,
+)
+from app.db.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+# Tampon dolu ve boşaltılamıyorsa (ör. DB erişilemez) fırlatılır; endpoint 503 döndürmelidir
+class VoteBufferFull(Exception):
+    pass
+
+
+# Grubun içinde arada silinmiş bir öğrenci veya dünya olduğunu gösteren ihlaller
+_MISSING_ROW_CONSTRAINTS = frozenset({"votes_student_id_fkey", "votes_participant_id_fkey"})
+
+
+# Bir grup oyu tek transaction'da yazar: çok satırlı INSERT + DELETE ve
+# katılımcı başına toplanmış like_count değişimi. Sayaç sadece gerçekten
+# eklenen/silinen satırlar kadar değişir (ON CONFLICT ile atlananlar sayılmaz).
+_FLUSH_SQL = text("""
+WITH added AS (
+    INSERT INTO votes (student_id, participant_id)
+    SELECT t.s, t.p
+    FROM unnest(CAST(:add_students AS integer[]), CAST(:add_participants AS integer[])) AS t(s, p)
+    ON CONFLICT ON CONSTRAINT unique_student_vote DO NOTHING
+    RETURNING participant_id
+),
+removed AS (
+    DELETE FROM votes v
+    USING unnest(CAST(:remove_students AS integer[]), CAST(:remove_participants AS integer[])) AS t(s, p)
+    WHERE v.student_id = t.s AND v.participant_id = t.p
+    RETURNING v.participant_id
+),
+deltas AS (
+    SELECT participant_id, sum(d) AS d
+    FROM (
+        SELECT participant_id, 1 AS d FROM added
+        UNION ALL
+        SELECT participant_id, -1 AS d FROM removed
+    ) changes
+    GROUP BY participant_id
+)
+UPDATE participants p
+SET like_count = p.like_count + deltas.d, updated_at = now()
+FROM deltas
+WHERE p.id = deltas.participant_id AND deltas.d <> 0
+RETURNING p.id, p.like_count
+""")
+
+
+# Write-behind oy tamponu (isteğe bağlı, VOTE_WRITE_BEHIND=true).
+# Oylar bellekteki oy pusulası (ballot) üzerinde doğrulanır ve hemen onaylanır;
+# DB'ye VOTE_BUFFER_FLUSH_MS'de bir ya da VOTE_BUFFER_MAX_BATCH oy birikince
+# toplu olarak yazılır (group commit, oy başına fsync yerine grup başına bir).
+#
+# Dayanıklılık sözleşmesi:
+#   * Onaylanmış ama henüz yazılmamış oylar process çökerse kaybolur. Kayıp
+#     penceresi en fazla bir flush aralığı + bir flush süresidir.
+#   * Yazılamayan oylar tamponda kalır ve tekrar denenir; bekleyen oy sayısı
+#     VOTE_BUFFER_MAX_PENDING'e ulaşırsa yeni oylar 503 ile reddedilir, böylece
+#     kayıp penceresi sınırsız büyümez.
+#   * Kapanışta (lifespan) tampon tamamen boşaltılır.
+#   * Oy limiti worker'ın belleğinde kontrol edilir; bu mod tek worker (veya
+#     öğrenciye göre yapışkan yönlendirme) ile kullanılmalıdır.
+class VoteBuffer:
+    def __init__(self, flush_interval_ms: int, max_batch: int, max_pending: int, max_votes: int):
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.max_votes = max_votes
+        self._ballots: Dict[int, Set[int]] = {}
+        self._ballot_loads: Dict[int, asyncio.Future] = {}
+        # (student_id, participant_id) -> net değişim (+1 ekle, -1 sil)
+        self._pending: Dict[Tuple[int, int], int] = {}
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self.flushed_votes = 0
+        self.flush_count = 0
+        self.flush_failures = 0
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    async def _load_ballot(self, db: AsyncSession, student_id: int) -> Set[int]:
+        ballot = self._ballots.get(student_id)
+        if ballot is not None:
+            return ballot
+        # Aynı öğrencinin eşzamanlı ilk tıklamaları tek sorgu paylaşır
+        loading = self._ballot_loads.get(student_id)
+        if loading is None:
+            loading = asyncio.get_running_loop().create_future()
+            self._ballot_loads[student_id] = loading
+            try:
+                ballot = set(await crud.crud_vote_async.get_voted_participant_ids(db, student_id=student_id))
+                self._ballots[student_id] = ballot
+                loading.set_result(ballot)
+            except Exception as exc:
+                loading.set_exception(exc)
+                raise
+            finally:
+                del self._ballot_loads[student_id]
+            return ballot
+        return await loading
+
+    # Öğrencinin güncel oyları (henüz DB'ye yazılmamış olanlar dahil); pusula
+    # bellekte değilse None
+    def ballot(self, student_id: int) -> Optional[Set[int]]:
+        ballot = self._ballots.get(student_id)
+        return set(ballot) if ballot is not None else None
+
+    async def _participant_row(self, db: AsyncSession, participant_id: int):
+        participant = leaderboard.get(participant_id)
+        if participant is None and not leaderboard.loaded:
+            participant = await crud.crud_participant_async.get_participant(db, participant_id=participant_id)
+        return participant
+
+    async def toggle(self, db: AsyncSession, student_id: int, participant_id: int) -> VoteToggleResult:
+        if len(self._pending) >= self.max_pending:
+            self._wakeup.set()
+            raise VoteBufferFull()
+
+        participant = await self._participant_row(db, participant_id)
+        if participant is None:
+            return VoteToggleResult(action=VOTE_PARTICIPANT_NOT_FOUND)
+        ballot = await self._load_ballot(db, student_id)
+
+        # Buradan sonrası await içermez; event loop'ta atomik çalışır
+        if participant_id in ballot:
+            ballot.discard(participant_id)
+            action, delta = VOTE_UNLIKED, -1
+        elif len(ballot) >= self.max_votes:
+            return VoteToggleResult(action=VOTE_LIMIT_EXCEEDED, participant=participant)
+        else:
+            ballot.add(participant_id)
+            action, delta = VOTE_LIKED, 1
+
+        key = (student_id, participant_id)
+        net = self._pending.get(key, 0) + delta
+        if net:
+            self._pending[key] = net
+        else:
+            # Aynı pencerede ver + geri al birbirini götürür
+            self._pending.pop(key, None)
+        if len(self._pending) >= self.max_batch:
+            self._wakeup.set()
+
+        predicted = schemas.Participant(
+            id=participant.id,
+            serial_number=participant.serial_number,
+            video_url=participant.video_url,
+            like_count=max(0, participant.like_count + delta),
+            created_at=participant.created_at,
+            updated_at=datetime.now(timezone.utc),
+        )
+        return VoteToggleResult(action=action, participant=predicted, delta=delta)
+
+    # Bekleyen oyları tek transaction'da yazar; yazılan oy sayısını döndürür
+    async def flush(self) -> int:
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            adds = [key for key, net in batch.items() if net > 0]
+            removes = [key for key, net in batch.items() if net < 0]
+            params = {
+                "add_students": [s for s, _ in adds],
+                "add_participants": [p for _, p in adds],
+                "remove_students": [s for s, _ in removes],
+                "remove_participants": [p for _, p in removes],
+            }
+            try:
+                async with AsyncSessionLocal() as db:
+                    await db.execute(_FLUSH_SQL, params)
+                    await db.commit()
+            except IntegrityError as error:
+                self.flush_failures += 1
+                await self._recover_batch(batch, _violated_constraint(error))
+                return 0
+            except Exception:
+                self.flush_failures += 1
+                self._requeue(batch)
+                logger.exception("Oy grubu yazılamadı, tekrar denenecek (%d oy bekliyor)", len(self._pending))
+                return 0
+            catalog_version.mark_stale()
+            catalog_version.announce()
+            self.flush_count += 1
+            self.flushed_votes += len(batch)
+            return len(batch)
+
+    # Başarısız grubu, o arada gelen yeni oylarla birleştirerek geri koyar.
+    # Net değişimler toplanabilir: (+1 yazılamadı, sonra -1 geldi) -> 0, yani hiçbir şey.
+    def _requeue(self, batch: Dict[Tuple[int, int], int]):
+        for key, net in batch.items():
+            merged = self._pending.get(key, 0) + net
+            if merged:
+                self._pending[key] = merged
+            else:
+                self._pending.pop(key, None)
+
+    # Bütünlük hatası veren grubu ayıklar: arada silinmiş öğrenci veya dünyalara
+    # ait oylar atılır, kalanı tekrar denenir. Atılacak oy bulunamazsa grup
+    # sonsuza kadar tekrar denenmez (tampon dolar ve tüm oylar 503 alır); tamamı
+    # atılır ve hata loglanır.
+    async def _recover_batch(self, batch: Dict[Tuple[int, int], int], constraint: Optional[str]):
+        dropped = 0
+        if constraint in _MISSING_ROW_CONSTRAINTS:
+            try:
+                dropped = await self._drop_missing_rows(batch)
+            except Exception:
+                self._requeue(batch)
+                logger.exception("Oy grubu ayıklanamadı, tekrar denenecek (%d oy bekliyor)", len(self._pending))
+                return
+        if dropped:
+            self._requeue(batch)
+            logger.warning(
+                "Oy grubu yazılamadı (%s): silinmiş öğrenci/dünyalara ait %d oy atıldı, %d oy tekrar denenecek",
+                constraint, dropped, len(batch),
+            )
+            return
+        self._discard(batch)
+        logger.error("Oy grubu yazılamadı (%s) ve hatalı oy ayıklanamadı: %d oy atıldı", constraint, len(batch))
+
+    # Öğrencisi veya dünyası artık olmayan oyları gruptan siler; silinen oy sayısını döndürür
+    async def _drop_missing_rows(self, batch: Dict[Tuple[int, int], int]) -> int:
+        async with AsyncSessionLocal() as db:
+            students = set((await db.execute(
+                select(models.Student.id).where(models.Student.id.in_({s for s, _ in batch}))
+            )).scalars())
+            participants = set((await db.execute(
+                select(models.Participant.id).where(models.Participant.id.in_({p for _, p in batch}))
+            )).scalars())
+        missing = {key: net for key, net in batch.items() if key[0] not in students or key[1] not in participants}
+        for key in missing:
+            del batch[key]
+        for student_id in {s for s, _ in missing if s not in students}:
+            self._ballots.pop(student_id, None)
+        for (student_id, participant_id) in missing:
+            ballot = self._ballots.get(student_id)
+            if ballot is not None:
+                ballot.discard(participant_id)
+        return len(missing)
+
+    # Yazılmadan atılan oyların pusuladaki etkisini geri alır: pusula = DB + bekleyen oylar
+    def _discard(self, batch: Dict[Tuple[int, int], int]):
+        for (student_id, participant_id), net in batch.items():
+            ballot = self._ballots.get(student_id)
+            if ballot is None:
+                continue
+            if net > 0:
+                ballot.discard(participant_id)
+            else:
+                ballot.add(participant_id)
+
+    # Arka plan görevi: her aralıkta veya grup dolunca boşaltır
+    async def run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    # Kapanışta bekleyen tüm oyları yazar
+    async def close(self, attempts: int = 3):
+        for _ in range(attempts):
+            await self.flush()
+            if not self._pending:
+                return
+        logger.error("Kapanışta %d oy DB'ye yazılamadı", len(self._pending))
+
+
+vote_buffer = VoteBuffer(
+    flush_interval_ms=settings.VOTE_BUFFER_FLUSH_MS,
+    max_batch=settings.VOTE_BUFFER_MAX_BATCH,
+    max_pending=settings.VOTE_BUFFER_MAX_PENDING,
+    max_votes=settings.MAX_VOTES_PER_STUDENT,
+)
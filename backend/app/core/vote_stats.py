@@ -0,0 +1,170 @@
+# backend/app/core/vote_stats.py
+# Oylama analitiği (/stats endpoint'leri). Veriler önceden toplanmış dakikalık ve
+# saatlik kovalardan okunur (bkz. crud/crud_vote_stats.py); votes tablosu hiç
+# taranmaz. Seyrek kovalar NumPy ile eşit aralıklı seriye açılır (boş kovalar 0),
+# istenen aralığa yeniden örneklenir (ör. 1 dk -> 15 dk) ve kümülatif toplam alınır.
+# Cevaplar VOTE_STATS_CACHE_SECONDS boyunca önbellekte tutulur.
+
+import asyncio
+import logging
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Sequence
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import schemas
+from app.core.config import settings
+from app.core.response_cache import TTLResponseCache
+
+logger = logging.getLogger(__name__)
+
+# Seri aralıkları (saniye). Saatten kısa olanlar dakika, diğerleri saat kovalarından üretilir.
+STATS_INTERVALS = {"1m": 60, "5m": 300, "15m": 900, "1h": 3600, "1d": 86400}
+STATS_INTERVAL_AUTO = "auto"
+# interval=auto: en fazla bu kadar noktalı seriyi veren en kısa aralık
+_AUTO_MAX_POINTS = 360
+# Tek seride izin verilen en fazla nokta (ör. 1 haftalık dakika serisi)
+STATS_MAX_POINTS = 7 * 24 * 60
+# /stats/overview'da listelenen dünya sayısı
+_OVERVIEW_TOP_N = 5
+
+stats_response_cache = TTLResponseCache(
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES, ttl_seconds=settings.VOTE_STATS_CACHE_SECONDS
+)
+
+
+def resolve_interval(interval: str, hours: int) -> int:
+    if interval != STATS_INTERVAL_AUTO:
+        return STATS_INTERVALS[interval]
+    for seconds in STATS_INTERVALS.values():
+        if hours * 3600 // seconds <= _AUTO_MAX_POINTS:
+            return seconds
+    return STATS_INTERVALS["1d"]
+
+
+# Zamanı aralığın katına yukarı yuvarlar (UTC epoch'a göre hizalı)
+def _ceil_time(moment: datetime, seconds: int) -> datetime:
+    return datetime.fromtimestamp(math.ceil(moment.timestamp() / seconds) * seconds, tz=timezone.utc)
+
+
+# [start, end) aralığının serisi. rows: (bucket, added, removed) kovaları,
+# base_seconds çözünürlüğünde (60 veya 3600); interval_seconds bunun katı
+# olmalı. before_net: start'tan önceki net oy (kümülatifin başlangıcı).
+def build_series(
+    rows: Sequence, start: datetime, end: datetime, interval_seconds: int, base_seconds: int, before_net: int = 0
+) -> schemas.VoteSeries:
+    size = int((end - start).total_seconds()) // base_seconds
+    added = np.zeros(size, dtype=np.int64)
+    removed = np.zeros(size, dtype=np.int64)
+    if rows:
+        offsets = np.fromiter((row.bucket.timestamp() for row in rows), dtype=np.float64, count=len(rows))
+        index = ((offsets - start.timestamp()) // base_seconds).astype(np.int64)
+        np.add.at(added, index, np.fromiter((row.added for row in rows), dtype=np.int64, count=len(rows)))
+        np.add.at(removed, index, np.fromiter((row.removed for row in rows), dtype=np.int64, count=len(rows)))
+    # Yeniden örnekleme: ardışık factor kova tek kovada toplanır
+    factor = interval_seconds // base_seconds
+    added = added.reshape(-1, factor).sum(axis=1)
+    removed = removed.reshape(-1, factor).sum(axis=1)
+    net = added - removed
+    step = timedelta(seconds=interval_seconds)
+    return schemas.VoteSeries(
+        interval_seconds=interval_seconds,
+        buckets=[start + step * i for i in range(len(net))],
+        added=added.tolist(),
+        removed=removed.tolist(),
+        net=net.tolist(),
+        cumulative=(before_net + np.cumsum(net)).tolist(),
+    )
+
+
+# Okumalar tek snapshot'ta yapılır: watermark, kovalar ve öncesinin toplamı
+# birbiriyle tutarlı olur (arada toplama işi commit etse bile). Session'ın ilk
+# işlemi olmalıdır.
+async def _begin_snapshot(db: AsyncSession):
+    await db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+
+
+# Bir dünyanın son `hours` saatlik oy serisi. Dünya yoksa None.
+async def participant_timeline(
+    db: AsyncSession, participant_id: int, interval_seconds: int, hours: int
+) -> Optional[schemas.VoteTimeline]:
+    # Döngüsel import olmaması için burada import edilir
+    from app import crud
+
+    await _begin_snapshot(db)
+    if await crud.crud_participant_async.get_participant(db, participant_id=participant_id) is None:
+        return None
+    as_of = await crud.crud_vote_stats.get_watermark(db)
+    base_seconds = 60 if interval_seconds < 3600 else 3600
+    end = _ceil_time(as_of or datetime.now(timezone.utc), interval_seconds)
+    start = end - timedelta(seconds=interval_seconds * math.ceil(hours * 3600 / interval_seconds))
+    rows = await crud.crud_vote_stats.get_participant_buckets(db, participant_id, base_seconds, start, end)
+    before = await crud.crud_vote_stats.get_totals_before(db, start, participant_id=participant_id)
+    series = build_series(rows, start, end, interval_seconds, base_seconds, before.added - before.removed)
+    return schemas.VoteTimeline(**series.model_dump(), participant_id=participant_id, as_of=as_of)
+
+
+# Tüm dünyalar: toplamlar, son saatin dakikalık ve son günün saatlik serisi,
+# son saatte en çok oy alanlar
+async def overview(db: AsyncSession) -> schemas.StatsOverview:
+    # Döngüsel import olmaması için burada import edilir
+    from app import crud
+
+    await _begin_snapshot(db)
+    as_of = await crud.crud_vote_stats.get_watermark(db)
+    reference = as_of or datetime.now(timezone.utc)
+    day_end = _ceil_time(reference, 3600)
+    day_start = day_end - timedelta(days=1)
+    hour_end = _ceil_time(reference, 60)
+    hour_start = hour_end - timedelta(hours=1)
+
+    before = await crud.crud_vote_stats.get_totals_before(db, day_start)
+    last_day = build_series(
+        await crud.crud_vote_stats.get_total_buckets(db, 3600, day_start, day_end),
+        day_start, day_end, 3600, 3600, before.added - before.removed,
+    )
+    total_added = before.added + sum(last_day.added)
+    total_removed = before.removed + sum(last_day.removed)
+    minute_rows = await crud.crud_vote_stats.get_total_buckets(db, 60, hour_start, hour_end)
+    hour_net = sum(row.added - row.removed for row in minute_rows)
+    last_hour = build_series(minute_rows, hour_start, hour_end, 60, 60, total_added - total_removed - hour_net)
+    top = await crud.crud_vote_stats.get_top_participants(db, hour_start, hour_end, _OVERVIEW_TOP_N)
+    return schemas.StatsOverview(
+        as_of=as_of,
+        total_added=total_added,
+        total_removed=total_removed,
+        total_votes=total_added - total_removed,
+        votes_per_minute=round(sum(last_hour.added) / 60, 2),
+        last_hour=last_hour,
+        last_day=last_day,
+        top_last_hour=[
+            schemas.WorldVoteActivity(participant_id=row.participant_id, added=row.added, removed=row.removed)
+            for row in top
+        ],
+    )
+
+
+# Yeni oy değişikliklerini kovalara toplar (bkz. crud/crud_vote_stats.py)
+async def roll_up_vote_stats():
+    from app import crud
+    from app.db.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        report = await crud.crud_vote_stats.roll_up_vote_stats(db)
+    if report.buckets:
+        # Bu worker'ın önbelleği hemen tazelenir; diğerleri TTL dolunca
+        stats_response_cache.clear()
+    return report
+
+
+# VOTE_STATS_ROLLUP_SECONDS > 0 iken periyodik toplama yapan arka plan görevi.
+# Her worker çalıştırır; aynı anda sadece biri toplar (advisory lock).
+async def run_vote_stats_rollup(interval_seconds: float):
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await roll_up_vote_stats()
+        except Exception:
+            logger.exception("Oy istatistikleri toplanamadı")
@@ -0,0 +1,168 @@
+# backend/app/core/warmup.py
+# Başlangıç ısınması (warm-up) ve hazır olma durumu.
+# Deploy sonrası ilk istekler havuz bağlantılarının açılması, her CRUD
+# sorgusunun ilk derlenmesi/prepare edilmesi, boş önbellekler ve passlib'in
+# bcrypt backend'ini ilk kullanımda yüklemesi için ödeme yapmasın diye bunlar
+# lifespan içinde, trafik gelmeden yapılır. /health/ready (api/endpoints/health.py)
+# ancak ısınma bittiğinde 200 döner; başarısız adım varsa ısınma arka planda
+# tekrar denenir.
+#
+# Her adımın süresi startup_report'a yazılır ve başlangıçta tek satır loglanır;
+# import sürelerinin paket bazında dökümü için: python scripts/startup_report.py
+
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+# Rapor uvicorn'un varsayılan çıktısında ("Application startup complete" yanında) görünsün
+report_logger = logging.getLogger("uvicorn.error")
+
+
+class StartupReport:
+    def __init__(self):
+        self.steps: Dict[str, float] = {} # adım -> saniye (eklenme sırasıyla)
+        self.failed: List[str] = []
+        self.ready = False
+
+    def record(self, name: str, seconds: float):
+        self.steps[name] = self.steps.get(name, 0.0) + seconds
+
+    # Blok süresini adım olarak kaydeder (hata olsa da)
+    @contextmanager
+    def step(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.steps.values())
+
+    def as_dict(self) -> dict:
+        return {
+            "ready": self.ready,
+            "total_seconds": round(self.total_seconds, 4),
+            "steps_seconds": {name: round(seconds, 4) for name, seconds in self.steps.items()},
+            "failed": list(self.failed),
+        }
+
+    def summary(self) -> str:
+        steps = ", ".join(f"{name} {seconds:.3f} sn" for name, seconds in self.steps.items())
+        failed = f" (başarısız: {', '.join(self.failed)})" if self.failed else ""
+        return f"Başlangıç {self.total_seconds:.3f} sn: {steps}{failed}"
+
+
+startup_report = StartupReport()
+
+
+# Havuzda `count` bağlantıyı aynı anda açar ve her birinde sıcak okuma
+# sorgularını bir kez çalıştırır: SQLAlchemy derlenmiş sorgu önbelleği dolar,
+# asyncpg her bağlantıda statement'ları prepare eder. Yazan sorgular (oy
+# toggle'ı) çalıştırılmaz; statement seviyesindeki trigger'lar boş bir
+# DELETE'te bile katalog sürümünü artırırdı.
+async def _warm_connections(engine, count: int):
+    from app import crud
+
+    with startup_report.step("db_pool"):
+        results = await asyncio.gather(*(engine.connect() for _ in range(count)), return_exceptions=True)
+    connections = [result for result in results if not isinstance(result, BaseException)]
+    try:
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        with startup_report.step("statements"):
+            for connection in connections:
+                db = AsyncSession(bind=connection)
+                try:
+                    await crud.crud_participant_async.get_participants_keyset(db, limit=1, order_by="id")
+                    await crud.crud_participant_async.get_participants_keyset(db, limit=1, order_by="like_count")
+                    await crud.crud_participant_async.get_participant(db, participant_id=0)
+                    await crud.crud_participant_async.get_participants_by_ids(db, [0])
+                    await crud.crud_student_async.get_student(db, student_id=0)
+                    await crud.crud_student_async.get_student_by_email(db, email="warm-up@invalid")
+                    await crud.crud_vote_async.get_voted_participant_ids(db, student_id=0)
+                finally:
+                    await db.close()
+    finally:
+        for connection in connections:
+            await connection.close()
+
+
+async def _warm_db():
+    from app.db.database import async_engine, async_read_engine, has_read_replica
+
+    # Havuz boyutundan fazlası açılırsa fazlalık geri verilirken kapatılır
+    count = min(settings.WARMUP_DB_CONNECTIONS or settings.DB_POOL_SIZE, settings.DB_POOL_SIZE)
+    await _warm_connections(async_engine, count)
+    if has_read_replica:
+        await _warm_connections(async_read_engine, count)
+
+
+# Katalog sürümü ve açılışta istenen gövdeler (/worlds ilk sayfası, /bootstrap
+# kataloğu) önbelleğe alınır; endpoint fonksiyonları doğrudan çağrılır, böylece
+# serializer'lar da ilk kez burada kurulur.
+async def _warm_caches():
+    # Döngüsel import olmaması için burada import edilir
+    from starlette.requests import Request
+
+    from app.api.endpoints import bootstrap, participants
+    from app.core.catalog_version import catalog_version
+    from app.core.pagination import ORDER_BY_ID
+    from app.db.database import AsyncReadSessionLocal, AsyncSessionLocal
+
+    with startup_report.step("caches"):
+        async with AsyncSessionLocal() as db:
+            catalog_version.mark_stale()
+            await catalog_version.current(db)
+            await bootstrap._catalog_page(db, limit=100)
+        async with AsyncReadSessionLocal() as db:
+            request = Request({"type": "http", "method": "GET", "path": "/worlds", "query_string": b"", "headers": []})
+            await participants.read_participants(
+                request, db=db, limit=100, cursor=None, order_by=ORDER_BY_ID, fields=None, skip=0,
+            )
+
+
+# passlib bcrypt backend'ini yükler ve doğrulama havuzunun thread'ini başlatır
+async def _warm_password_hashing():
+    from app.core.security import warm_up_password_verifier
+
+    with startup_report.step("password_hash"):
+        await warm_up_password_verifier()
+
+
+# (ad, fonksiyon); her fonksiyon kendi süresini startup_report'a yazar
+_STEPS = (
+    ("db_pool", _warm_db),
+    ("caches", _warm_caches),
+    ("password_hash", _warm_password_hashing),
+)
+
+
+# Tüm ısınma adımlarını çalıştırır; hepsi başarılıysa uygulama hazırdır
+async def warm_up() -> bool:
+    startup_report.failed = []
+    for name, warm in _STEPS:
+        try:
+            await warm()
+        except Exception:
+            startup_report.failed.append(name)
+            logger.exception("Başlangıç ısınması başarısız: %s", name)
+    startup_report.ready = not startup_report.failed
+    return startup_report.ready
+
+
+# Isınma başarısız olduysa (ör. DB henüz erişilemez) hazır olana kadar tekrar dener
+async def run_warm_up_until_ready(interval_seconds: float):
+    while not startup_report.ready:
+        await asyncio.sleep(interval_seconds)
+        if await warm_up():
+            report_logger.info("%s", startup_report.summary())
@@ -2,4 +2,13 @@
 
 from . import crud_participant
 from . import crud_student
-from . import crud_vote
\ No newline at end of file
+from . import crud_vote
+from . import crud_reconcile # like_count uzlaştırması (senkron; script ve arka plan görevi)
+from . import crud_like_shards # parçalı beğeni sayaçlarının toplanması (async)
+from . import crud_vote_stats # oylama analitiği: dakikalık/saatlik oy kovaları (async)
+from . import crud_export # turnuva sonu dışa aktarım sorguları (async + senkron, server-side cursor)
+
+# API endpoint'lerinin kullandığı async karşılıklar
+from . import crud_participant_async
+from . import crud_student_async
+from . import crud_vote_async
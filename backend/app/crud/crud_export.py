@@ -0,0 +1,95 @@
+# backend/app/crud/crud_export.py
+# Turnuva sonu dışa aktarım sorguları (bkz. core/export.py, api/endpoints/admin.py,
+# scripts/export_results.py). Satırlar server-side cursor ile parça parça okunur:
+# async tarafta AsyncSession.stream (asyncpg cursor), senkron tarafta
+# stream_results (psycopg2 named cursor). Bellekte en fazla bir parça tutulur;
+# milyonlarca oyda da bellek kullanımı sabit kalır.
+
+from typing import AsyncIterator, Dict, Iterator, List, Sequence, Tuple
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app import models
+
+EXPORT_RANKING = "ranking"
+EXPORT_BALLOTS = "ballots"
+
+# Kolon tipleri (core/export.py Parquet şeması için): int, str, timestamp
+ExportColumns = Sequence[Tuple[str, str]]
+
+
+# Nihai sıralama: like_count (bekleyen parçalı sayaçlar dahil) azalan, eşitlikte
+# id artan; sıra numarası skor tablosuyla aynıdır (/worlds/{id}/rank)
+def _ranking_query() -> Select:
+    Participant, Shard = models.Participant, models.ParticipantLikeShard
+    pending = (
+        select(Shard.participant_id, func.sum(Shard.delta).label("delta"))
+        .group_by(Shard.participant_id)
+        .subquery()
+    )
+    like_count = (Participant.like_count + func.coalesce(pending.c.delta, 0)).label("like_count")
+    return (
+        select(
+            func.row_number().over(order_by=(like_count.desc(), Participant.id)).label("rank"),
+            Participant.id.label("participant_id"),
+            Participant.serial_number,
+            Participant.video_url,
+            like_count,
+            Participant.created_at,
+        )
+        .outerjoin(pending, pending.c.participant_id == Participant.id)
+        .order_by(like_count.desc(), Participant.id)
+    )
+
+
+# Öğrenci pusulaları: her oy, öğrencisi ve dünyasıyla. votes.id sırasıyla
+# (birincil anahtar indeksi) okunur; sıralama için sort gerekmez.
+def _ballots_query() -> Select:
+    Vote, Student, Participant = models.Vote, models.Student, models.Participant
+    return (
+        select(
+            Vote.id.label("vote_id"),
+            Vote.created_at.label("voted_at"),
+            Student.id.label("student_id"),
+            Student.email.label("student_email"),
+            Student.full_name.label("student_full_name"),
+            Participant.id.label("participant_id"),
+            Participant.serial_number,
+        )
+        .join(Student, Student.id == Vote.student_id)
+        .join(Participant, Participant.id == Vote.participant_id)
+        .order_by(Vote.id)
+    )
+
+
+EXPORT_DATASETS: Dict[str, Tuple] = {
+    EXPORT_RANKING: (_ranking_query, (
+        ("rank", "int"), ("participant_id", "int"), ("serial_number", "str"), ("video_url", "str"),
+        ("like_count", "int"), ("created_at", "timestamp"),
+    )),
+    EXPORT_BALLOTS: (_ballots_query, (
+        ("vote_id", "int"), ("voted_at", "timestamp"), ("student_id", "int"), ("student_email", "str"),
+        ("student_full_name", "str"), ("participant_id", "int"), ("serial_number", "str"),
+    )),
+}
+
+
+def export_columns(dataset: str) -> ExportColumns:
+    return EXPORT_DATASETS[dataset][1]
+
+
+# Veri setinin satırlarını chunk_size'lık listeler halinde verir (API, async)
+async def stream_export_rows_async(db: AsyncSession, dataset: str, chunk_size: int) -> AsyncIterator[List[tuple]]:
+    query = EXPORT_DATASETS[dataset][0]().execution_options(yield_per=chunk_size)
+    result = await db.stream(query)
+    async for partition in result.partitions(chunk_size):
+        yield [tuple(row) for row in partition]
+
+
+# Senkron karşılığı (scripts/export_results.py)
+def stream_export_rows(db: Session, dataset: str, chunk_size: int) -> Iterator[List[tuple]]:
+    query = EXPORT_DATASETS[dataset][0]().execution_options(stream_results=True, yield_per=chunk_size)
+    for partition in db.execute(query).partitions(chunk_size):
+        yield [tuple(row) for row in partition]
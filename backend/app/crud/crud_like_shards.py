@@ -0,0 +1,57 @@
+# backend/app/crud/crud_like_shards.py
+# Parçalı beğeni sayaçlarının participants.like_count'a toplanması (rollup).
+# LIKE_COUNTER_SHARDS > 0 iken oy yolu (crud_vote_async.toggle_vote) değişimi
+# participant_like_shards satırlarına yazar; bu modül onları periyodik olarak
+# tek transaction'da siler ve dünyanın like_count'una ekler (bkz. migrations/0005).
+
+from typing import Dict
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# pg_try_advisory_xact_lock anahtarı: aynı anda tek worker toplama yapar
+_ROLLUP_LOCK_KEY = 724_310_019
+
+_TRY_LOCK_SQL = text("SELECT pg_try_advisory_xact_lock(:key)")
+
+# Satırlar id sırasıyla kilitlenir (çok satır kilitleyen diğer yazımlarla
+# deadlock ihtimali azalsın). FOR NO KEY UPDATE, oy eklerken FK'nin aldığı
+# KEY SHARE kilidiyle çakışmaz: toplama sırasında oylar beklemez.
+_LOCK_PARTICIPANTS_SQL = text("""
+SELECT id FROM participants
+WHERE id IN (SELECT participant_id FROM participant_like_shards)
+ORDER BY id
+LIMIT :batch_size
+FOR NO KEY UPDATE
+""")
+
+_ROLLUP_SQL = text("""
+WITH drained AS (
+    DELETE FROM participant_like_shards
+    WHERE participant_id = ANY(:ids)
+    RETURNING participant_id, delta
+),
+sums AS (
+    SELECT participant_id, sum(delta) AS d FROM drained GROUP BY participant_id
+)
+UPDATE participants p
+SET like_count = p.like_count + sums.d, updated_at = now()
+FROM sums
+WHERE p.id = sums.participant_id AND sums.d <> 0
+RETURNING p.id, p.like_count
+""")
+
+
+# Bekleyen sayaç satırlarını like_count'a toplar; güncellenen {id: like_count}
+# döndürür. Başka bir worker o an topluyorsa hiçbir şey yapmaz.
+async def roll_up_like_shards(db: AsyncSession, batch_size: int = 1000) -> Dict[int, int]:
+    if not (await db.execute(_TRY_LOCK_SQL, {"key": _ROLLUP_LOCK_KEY})).scalar_one():
+        await db.rollback()
+        return {}
+    ids = list((await db.execute(_LOCK_PARTICIPANTS_SQL, {"batch_size": batch_size})).scalars())
+    if not ids:
+        await db.rollback()
+        return {}
+    rows = (await db.execute(_ROLLUP_SQL, {"ids": ids})).all()
+    await db.commit()
+    return {row.id: row.like_count for row in rows}
@@ -19,7 +19,8 @@ def get_participants(db: Session, skip: int = 0, limit: int = 100):
 
 # En çok beğeni alan ilk 5 participant'ı getir (Scoreboard için)
 def get_participants_top5(db: Session):
-    return db.query(models.Participant).order_by(desc(models.Participant.like_count)).limit(5).all()
+    # Eşitlikte id artan sıralanır (skor tablosu ile aynı deterministik sıra)
+    return db.query(models.Participant).order_by(desc(models.Participant.like_count), models.Participant.id).limit(5).all()
 
 # Yeni bir participant oluştur (Admin paneli vb. için gerekebilir)
 def create_participant(db: Session, participant: schemas.ParticipantCreate):
@@ -0,0 +1,133 @@
+# backend/app/crud/crud_participant_async.py
+# crud_participant'ın AsyncSession kullanan karşılığı (API endpoint'leri için)
+
+from typing import Optional, Sequence, Tuple
+
+from sqlalchemy import and_, desc, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models, schemas
+
+# Belirli bir ID'ye sahip participant'ı getir
+async def get_participant(db: AsyncSession, participant_id: int):
+    result = await db.execute(
+        select(models.Participant).where(models.Participant.id == participant_id)
+    )
+    return result.scalars().first()
+
+# Verilen id'lere sahip participant'ları tek IN sorgusuyla getir (id sırasıyla;
+# bulunamayan id'ler atlanır)
+async def get_participants_by_ids(db: AsyncSession, participant_ids: Sequence[int]):
+    result = await db.execute(
+        select(models.Participant)
+        .where(models.Participant.id.in_(participant_ids))
+        .order_by(models.Participant.id)
+    )
+    return result.scalars().all()
+
+# Belirli bir seri numarasına sahip participant'ı getir
+async def get_participant_by_serial_number(db: AsyncSession, serial_number: str):
+    result = await db.execute(
+        select(models.Participant).where(models.Participant.serial_number == serial_number)
+    )
+    return result.scalars().first()
+
+# Tüm participant'ları getir (sayfalama ile)
+async def get_participants(db: AsyncSession, skip: int = 0, limit: int = 100):
+    result = await db.execute(select(models.Participant).order_by(models.Participant.id).offset(skip).limit(limit))
+    return result.scalars().all()
+
+# Keyset (cursor) sayfalama ile participant'ları getir.
+# order_by="id": id artan; order_by="like_count": like_count azalan, eşitlikte id artan.
+# after: önceki sayfanın son satırının anahtarı ((id,) veya (like_count, id)).
+# columns verilirse sadece bu kolonlar SELECT edilir ve satırlar dict olarak döner;
+# verilmezse tam ORM nesneleri döner. offset: eski skip= istemcileri için (OFFSET).
+async def get_participants_keyset(
+    db: AsyncSession,
+    limit: int = 100,
+    order_by: str = "id",
+    after: Optional[Tuple] = None,
+    columns: Optional[Sequence[str]] = None,
+    offset: int = 0,
+):
+    Participant = models.Participant
+    if columns:
+        stmt = select(*(getattr(Participant, column) for column in columns))
+    else:
+        stmt = select(Participant)
+
+    if order_by == "like_count":
+        if after is not None:
+            last_like_count, last_id = after
+            stmt = stmt.where(or_(
+                Participant.like_count < last_like_count,
+                and_(Participant.like_count == last_like_count, Participant.id > last_id),
+            ))
+        stmt = stmt.order_by(desc(Participant.like_count), Participant.id)
+    else:
+        if after is not None:
+            stmt = stmt.where(Participant.id > after[0])
+        stmt = stmt.order_by(Participant.id)
+
+    if offset:
+        stmt = stmt.offset(offset)
+    result = await db.execute(stmt.limit(limit))
+    if columns:
+        return [dict(row) for row in result.mappings()]
+    return result.scalars().all()
+
+# Tüm participant'ları getir (process içi skor tablosunu yüklemek için).
+# like_count, henüz toplanmamış parçalı sayaçları da içerir (bkz. crud_like_shards).
+async def get_all_participants(db: AsyncSession):
+    Participant, Shard = models.Participant, models.ParticipantLikeShard
+    pending = (
+        select(Shard.participant_id, func.sum(Shard.delta).label("delta"))
+        .group_by(Shard.participant_id)
+        .subquery()
+    )
+    result = await db.execute(
+        select(
+            Participant.id, Participant.serial_number, Participant.video_url,
+            (Participant.like_count + func.coalesce(pending.c.delta, 0)).label("like_count"),
+            Participant.created_at, Participant.updated_at,
+        ).outerjoin(pending, pending.c.participant_id == Participant.id)
+    )
+    return result.all()
+
+# En çok beğeni alan ilk n participant'ı getir
+# Eşitlikte id artan sıralanır (skor tablosu ile aynı deterministik sıra)
+async def get_participants_top(db: AsyncSession, n: int):
+    result = await db.execute(
+        select(models.Participant)
+        .order_by(desc(models.Participant.like_count), models.Participant.id)
+        .limit(n)
+    )
+    return result.scalars().all()
+
+# En çok beğeni alan ilk 5 participant'ı getir (Scoreboard için)
+async def get_participants_top5(db: AsyncSession):
+    return await get_participants_top(db, 5)
+
+# Yeni bir participant oluştur
+async def create_participant(db: AsyncSession, participant: schemas.ParticipantCreate):
+    db_participant = models.Participant(
+        serial_number=participant.serial_number,
+        video_url=participant.video_url,
+        like_count=0 # Başlangıçta 0 like
+    )
+    db.add(db_participant)
+    await db.commit()
+    await db.refresh(db_participant)
+    return db_participant
+
+# Participant'ın beğeni sayısını güncelle (artırma/azaltma)
+async def update_participant_like_count(db: AsyncSession, participant_id: int, increment: int = 1):
+    db_participant = await get_participant(db, participant_id=participant_id)
+    if db_participant:
+        # Negatif olmasını engelle
+        if db_participant.like_count + increment >= 0:
+            db_participant.like_count += increment
+            await db.commit()
+            await db.refresh(db_participant)
+            return db_participant
+    return None # Katılımcı bulunamazsa veya güncelleme olmazsa None dön
@@ -0,0 +1,170 @@
+# backend/app/crud/crud_reconcile.py
+# participants.like_count sayaçlarının votes tablosuyla artımsal uzlaştırılması.
+# Senkron Session kullanır: hem scripts/reconcile_like_counts.py hem de
+# uygulamadaki arka plan görevi (thread içinde) çağırır.
+#
+# Sadece son çalışmadan (watermark) bu yana oyu eklenen veya silinen dünyalar
+# sayılır. Sayım kilitsiz yapılır; sapan her dünya kendi kısa transaction'ında
+# fark (delta) eklenerek düzeltilir, sadece like_count okunduğundan beri
+# değişmediyse. Oy yolu hiçbir zaman bir grup kilidini beklemez.
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+LIKE_COUNT_RECONCILE_JOB = "like_count_reconcile"
+# vote_deletions'ı okuyan diğer iş: oylama analitiği (crud/crud_vote_stats.py)
+VOTE_STATS_ROLLUP_JOB = "vote_stats_rollup"
+
+# Güvenli üst sınır: hâlâ açık olan en eski transaction'ın başlangıcı.
+# votes.created_at ve vote_deletions.deleted_at transaction başlangıç zamanıdır
+# (now()); bu sınırdan eski her değişiklik commit edilmiş (ya da geri alınmış)
+# demektir, yani watermark'ı buraya ilerletince hiçbir değişiklik atlanmaz.
+_SAFE_UPPER_BOUND_SQL = text("""
+SELECT least(now(), min(xact_start))
+FROM pg_stat_activity
+WHERE datname = current_database() AND pid <> pg_backend_pid() AND xact_start IS NOT NULL
+""")
+
+_CHANGED_PARTICIPANTS_SQL = text("""
+SELECT participant_id FROM votes
+WHERE created_at >= :since AND created_at < :until
+UNION
+SELECT participant_id FROM vote_deletions
+WHERE deleted_at >= :since AND deleted_at < :until
+ORDER BY participant_id
+""")
+
+# Sapan dünyalar, kilitsiz tek okuma ile. like_count ve votes sayımı aynı
+# snapshot'tan gelir: oy yolu ikisini aynı transaction'da değiştirdiği için
+# bekleyen oylar ikisinde de görünmez, sapma sadece gerçek tutarsızlıktır.
+# Parçalı sayaç modunda (crud_like_shards) gerçek sayı like_count + bekleyen
+# sayaçlardır; sayaç satırlarına dokunulmaz.
+_DRIFTED_SQL = text("""
+SELECT id, stored_count, pending, new_count FROM (
+    SELECT p.id, p.like_count AS stored_count,
+           coalesce((SELECT sum(s.delta) FROM participant_like_shards s WHERE s.participant_id = p.id), 0)
+               AS pending,
+           (SELECT count(*) FROM votes v WHERE v.participant_id = p.id) AS new_count
+    FROM participants p
+    WHERE p.id = ANY(:ids)
+) counts
+WHERE stored_count + pending <> new_count
+ORDER BY id
+""")
+
+# Düzeltme fark olarak eklenir ve sadece like_count okunduğundan beri
+# değişmediyse uygulanır (arada oy veya toplama commit edildiyse satır
+# atlanır, yeniden sayılır). Tek satır, kendi transaction'ında.
+_APPLY_CORRECTION_SQL = text("""
+UPDATE participants
+SET like_count = like_count + :delta, updated_at = now()
+WHERE id = :id AND like_count = :observed
+RETURNING id
+""")
+
+# Düzeltilirken like_count'u değişen dünya en fazla bu kadar yeniden sayılır
+_CORRECTION_ATTEMPTS = 3
+
+
+# İşlenmiş silme kayıtları silinir; analitik işinin henüz işlemediği kayıtlar
+# (watermark'ından sonrakiler) kalır. Analitik işi bir gündür çalışmadıysa
+# (kapatılmış) beklenmez, yoksa tablo sınırsız büyürdü.
+_PRUNE_VOTE_DELETIONS_SQL = text("""
+DELETE FROM vote_deletions
+WHERE deleted_at < least(:until, coalesce((
+    SELECT watermark FROM job_watermarks
+    WHERE job_name = :stats_job AND updated_at > now() - interval '1 day'
+), :until))
+""")
+
+
+@dataclass
+class LikeCountCorrection:
+    participant_id: int
+    old_count: int
+    new_count: int
+
+
+@dataclass
+class ReconcileReport:
+    since: Optional[datetime]
+    until: Optional[datetime]
+    checked: int = 0
+    batches: int = 0
+    corrections: List[LikeCountCorrection] = field(default_factory=list)
+    # Her denemede like_count'u değişmiş olduğu için düzeltilemeyen dünyalar
+    # (sonraki çalışmada veya --full ile tekrar denenir)
+    busy: List[int] = field(default_factory=list)
+
+
+def get_watermark(db: Session, job_name: str = LIKE_COUNT_RECONCILE_JOB) -> Optional[datetime]:
+    return db.execute(
+        text("SELECT watermark FROM job_watermarks WHERE job_name = :job_name"), {"job_name": job_name}
+    ).scalar()
+
+
+def set_watermark(db: Session, watermark: datetime, job_name: str = LIKE_COUNT_RECONCILE_JOB):
+    db.execute(
+        text("""
+            INSERT INTO job_watermarks (job_name, watermark) VALUES (:job_name, :watermark)
+            ON CONFLICT (job_name) DO UPDATE SET watermark = EXCLUDED.watermark, updated_at = now()
+        """),
+        {"job_name": job_name, "watermark": watermark},
+    )
+
+
+# Verilen dünyaların sayaçlarını düzeltir; (düzeltilenler, düzeltilemeyenler) döndürür
+def reconcile_participants(
+    db: Session, participant_ids: Sequence[int]
+) -> Tuple[List[LikeCountCorrection], List[int]]:
+    corrections: List[LikeCountCorrection] = []
+    ids = list(participant_ids)
+    for _ in range(_CORRECTION_ATTEMPTS):
+        drifted = db.execute(_DRIFTED_SQL, {"ids": ids}).all()
+        db.commit()
+        ids = []
+        for row in drifted:
+            applied = db.execute(_APPLY_CORRECTION_SQL, {
+                "id": row.id, "observed": row.stored_count, "delta": row.new_count - row.pending - row.stored_count,
+            }).first()
+            db.commit()
+            if applied is None:
+                ids.append(row.id)
+            else:
+                corrections.append(LikeCountCorrection(row.id, row.stored_count + row.pending, row.new_count))
+        if not ids:
+            break
+    return corrections, ids
+
+
+# Artımsal uzlaştırma: watermark'tan güvenli üst sınıra kadar oyu değişen dünyaları
+# batch_size'lık gruplar halinde sayar ve düzeltir, sonra watermark'ı ilerletir.
+# full=True: watermark yok sayılır, tüm dünyalar kontrol edilir (ör. like_count
+# elle değiştirildiyse); watermark yine ilerletilir.
+def reconcile_like_counts(db: Session, batch_size: int = 500, full: bool = False) -> ReconcileReport:
+    until = db.execute(_SAFE_UPPER_BOUND_SQL).scalar_one()
+    if full:
+        since = None
+        participant_ids = list(db.execute(text("SELECT id FROM participants ORDER BY id")).scalars())
+    else:
+        since = get_watermark(db)
+        participant_ids = list(db.execute(
+            _CHANGED_PARTICIPANTS_SQL, {"since": since or datetime.min.replace(tzinfo=timezone.utc), "until": until}
+        ).scalars())
+    db.commit()
+
+    report = ReconcileReport(since=since, until=until, checked=len(participant_ids))
+    for start in range(0, len(participant_ids), batch_size):
+        corrections, busy = reconcile_participants(db, participant_ids[start:start + batch_size])
+        report.corrections.extend(corrections)
+        report.busy.extend(busy)
+        report.batches += 1
+
+    set_watermark(db, until)
+    db.execute(_PRUNE_VOTE_DELETIONS_SQL, {"until": until, "stats_job": VOTE_STATS_ROLLUP_JOB})
+    db.commit()
+    return report
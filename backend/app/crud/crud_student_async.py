@@ -0,0 +1,36 @@
+# backend/app/crud/crud_student_async.py
+# crud_student'ın AsyncSession kullanan karşılığı (API endpoint'leri için)
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models, schemas
+from app.core.security import get_password_hash
+
+# Belirli bir ID'ye sahip öğrenciyi getir
+async def get_student(db: AsyncSession, student_id: int):
+    result = await db.execute(select(models.Student).where(models.Student.id == student_id))
+    return result.scalars().first()
+
+# Belirli bir email'e sahip öğrenciyi getir (Login için önemli)
+async def get_student_by_email(db: AsyncSession, email: str):
+    result = await db.execute(select(models.Student).where(models.Student.email == email))
+    return result.scalars().first()
+
+# Tüm öğrencileri getir (sayfalama ile - admin için vb.)
+async def get_students(db: AsyncSession, skip: int = 0, limit: int = 100):
+    result = await db.execute(select(models.Student).offset(skip).limit(limit))
+    return result.scalars().all()
+
+# Yeni bir öğrenci oluştur
+async def create_student(db: AsyncSession, student: schemas.StudentCreate):
+    hashed_password = get_password_hash(student.password) # Şifreyi hash'le
+    db_student = models.Student(
+        email=student.email,
+        hashed_password=hashed_password,
+        full_name=student.full_name
+    )
+    db.add(db_student)
+    await db.commit()
+    await db.refresh(db_student)
+    return db_student
@@ -0,0 +1,199 @@
+# backend/app/crud/crud_vote_async.py
+# crud_vote'un AsyncSession kullanan karşılığı (API endpoint'leri için)
+
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import Row, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models, schemas
+
+# Belirli bir öğrencinin tüm oylarını getir
+async def get_votes_by_student(db: AsyncSession, student_id: int):
+    result = await db.execute(select(models.Vote).where(models.Vote.student_id == student_id))
+    return result.scalars().all()
+
+# Öğrencinin oy verdiği katılımcı id'leri. Sadece participant_id seçildiği için
+# unique_student_vote (student_id, participant_id) indeksinden okunur (index-only scan)
+async def get_voted_participant_ids(db: AsyncSession, student_id: int):
+    result = await db.execute(
+        select(models.Vote.participant_id)
+        .where(models.Vote.student_id == student_id)
+        .order_by(models.Vote.participant_id)
+    )
+    return result.scalars().all()
+
+# Belirli bir öğrencinin belirli bir katılımcıya oy verip vermediğini kontrol et/getir
+async def get_vote_by_student_and_participant(db: AsyncSession, student_id: int, participant_id: int):
+    result = await db.execute(
+        select(models.Vote).where(
+            models.Vote.student_id == student_id,
+            models.Vote.participant_id == participant_id
+        )
+    )
+    return result.scalars().first()
+
+# Yeni bir oy oluştur
+async def create_vote(db: AsyncSession, vote: schemas.VoteCreate, student_id: int):
+    db_vote = models.Vote(
+        student_id=student_id,
+        participant_id=vote.participant_id
+    )
+    db.add(db_vote)
+    await db.commit()
+    await db.refresh(db_vote)
+    return db_vote
+
+# Belirli bir öğrencinin belirli bir katılımcıya verdiği oyu sil (Unlike için önemli)
+async def delete_vote_by_student_and_participant(db: AsyncSession, student_id: int, participant_id: int):
+    db_vote = await get_vote_by_student_and_participant(db, student_id=student_id, participant_id=participant_id)
+    if db_vote:
+        await db.delete(db_vote)
+        await db.commit()
+        return True # Silme başarılı
+    return False # Silinecek oy bulunamadı
+
+
+# --- Oy ver/geri al motoru ---
+# Oy toggle'ı, oy limiti kontrolü ve like_count güncellemesi tek transaction'da,
+# iki statement ile yapılır:
+#   1. Öğrenci satırı kilitlenir (aynı öğrencinin eşzamanlı tıklamaları sıraya girer,
+#      böylece limit kontrolü yarışa açık kalmaz).
+#   2. Tek bir CTE: varsa oyu siler, yoksa limit izin veriyorsa ekler ve sayacı
+#      atomik olarak artırıp/azaltıp RETURNING ile güncel satırı döndürür.
+# Unique ihlali önceden sorgulanmaz; ON CONFLICT ile statement içinde ele alınır.
+
+VOTE_LIKED = "liked"
+VOTE_UNLIKED = "unliked"
+VOTE_LIMIT_EXCEEDED = "limit_exceeded"
+VOTE_UNCHANGED = "unchanged" # Eşzamanlı aynı oy eklendi (ON CONFLICT), değişiklik yok
+VOTE_PARTICIPANT_NOT_FOUND = "participant_not_found"
+
+_LOCK_STUDENT_SQL = text("SELECT id FROM students WHERE id = :student_id FOR UPDATE")
+
+_TOGGLE_VOTE_SQL = text("""
+WITH removed AS (
+    DELETE FROM votes
+    WHERE student_id = :student_id AND participant_id = :participant_id
+    RETURNING participant_id
+),
+added AS (
+    INSERT INTO votes (student_id, participant_id)
+    SELECT :student_id, :participant_id
+    WHERE NOT EXISTS (SELECT 1 FROM removed)
+      AND EXISTS (SELECT 1 FROM participants WHERE id = :participant_id)
+      AND (SELECT count(*) FROM votes WHERE student_id = :student_id) < :max_votes
+    ON CONFLICT ON CONSTRAINT unique_student_vote DO NOTHING
+    RETURNING participant_id
+),
+delta AS (
+    SELECT (SELECT count(*) FROM added) - (SELECT count(*) FROM removed) AS value
+),
+updated AS (
+    UPDATE participants
+    SET like_count = like_count + (SELECT value FROM delta), updated_at = now()
+    WHERE id = :participant_id AND (SELECT value FROM delta) <> 0
+    RETURNING id, serial_number, video_url, like_count, created_at, updated_at
+)
+SELECT u.id, u.serial_number, u.video_url, u.like_count, u.created_at, u.updated_at,
+       (SELECT value FROM delta) AS delta,
+       (SELECT count(*) FROM votes WHERE student_id = :student_id) AS student_vote_count
+FROM updated u
+UNION ALL
+SELECT p.id, p.serial_number, p.video_url, p.like_count, p.created_at, p.updated_at,
+       0 AS delta,
+       (SELECT count(*) FROM votes WHERE student_id = :student_id) AS student_vote_count
+FROM participants p
+WHERE p.id = :participant_id AND NOT EXISTS (SELECT 1 FROM updated)
+""")
+
+
+# Parçalı sayaç modu (LIKE_COUNTER_SHARDS > 0, bkz. crud/crud_like_shards.py):
+# participants satırı güncellenmez, değişim dünyanın :shard numaralı sayaç
+# satırına eklenir. Popüler bir dünyaya gelen oylar K ayrı satıra dağılır.
+# Dönen like_count = like_count + bekleyen sayaçlar + bu oyun değişimi
+# (aynı snapshot'tan okunur; toplama ile tutarlıdır).
+_TOGGLE_VOTE_SHARDED_SQL = text("""
+WITH removed AS (
+    DELETE FROM votes
+    WHERE student_id = :student_id AND participant_id = :participant_id
+    RETURNING participant_id
+),
+added AS (
+    INSERT INTO votes (student_id, participant_id)
+    SELECT :student_id, :participant_id
+    WHERE NOT EXISTS (SELECT 1 FROM removed)
+      AND EXISTS (SELECT 1 FROM participants WHERE id = :participant_id)
+      AND (SELECT count(*) FROM votes WHERE student_id = :student_id) < :max_votes
+    ON CONFLICT ON CONSTRAINT unique_student_vote DO NOTHING
+    RETURNING participant_id
+),
+delta AS (
+    SELECT (SELECT count(*) FROM added) - (SELECT count(*) FROM removed) AS value
+),
+counted AS (
+    INSERT INTO participant_like_shards (participant_id, shard, delta)
+    SELECT :participant_id, :shard, value FROM delta WHERE value <> 0
+    ON CONFLICT (participant_id, shard) DO UPDATE
+    SET delta = participant_like_shards.delta + EXCLUDED.delta
+)
+SELECT p.id, p.serial_number, p.video_url,
+       p.like_count + (SELECT value FROM delta)
+           + coalesce((SELECT sum(s.delta) FROM participant_like_shards s WHERE s.participant_id = p.id), 0)
+           AS like_count,
+       p.created_at,
+       CASE WHEN (SELECT value FROM delta) <> 0 THEN now() ELSE p.updated_at END AS updated_at,
+       (SELECT value FROM delta) AS delta,
+       (SELECT count(*) FROM votes WHERE student_id = :student_id) AS student_vote_count
+FROM participants p
+WHERE p.id = :participant_id
+""")
+
+
+# Katılımcıya işaret eden FK'ler (votes ve parçalı sayaç satırları)
+_PARTICIPANT_FK_CONSTRAINTS = frozenset({"votes_participant_id_fkey", "participant_like_shards_participant_id_fkey"})
+
+
+# asyncpg hatasındaki ihlal edilen constraint'in adı (bilinmiyorsa None)
+def _violated_constraint(error: IntegrityError) -> Optional[str]:
+    return getattr(getattr(error.orig, "__cause__", None), "constraint_name", None)
+
+
+@dataclass
+class VoteToggleResult:
+    action: str
+    participant: Optional[Row] = None # schemas.Participant ile uyumlu satır (id, like_count, ...)
+    delta: int = 0
+
+
+# Öğrencinin katılımcıya oyunu ekler ya da geri alır (toggle).
+# shards > 0 ise sayaç, öğrenci id'sine göre seçilen sayaç satırına yazılır.
+async def toggle_vote(db: AsyncSession, student_id: int, participant_id: int, max_votes: int, shards: int = 0):
+    params = {"student_id": student_id, "participant_id": participant_id, "max_votes": max_votes}
+    statement = _TOGGLE_VOTE_SQL
+    if shards > 0:
+        statement = _TOGGLE_VOTE_SHARDED_SQL
+        params["shard"] = student_id % shards
+    try:
+        await db.execute(_LOCK_STUDENT_SQL, params)
+        row = (await db.execute(statement, params)).first()
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        # Katılımcı statement sırasında silindiyse (katılımcı FK ihlali) oy eklenemez;
+        # diğer bütünlük hataları (ör. öğrenci silinmiş) olduğu gibi yükseltilir
+        if _violated_constraint(e) in _PARTICIPANT_FK_CONSTRAINTS:
+            return VoteToggleResult(action=VOTE_PARTICIPANT_NOT_FOUND)
+        raise
+
+    if row is None:
+        return VoteToggleResult(action=VOTE_PARTICIPANT_NOT_FOUND)
+    if row.delta > 0:
+        return VoteToggleResult(action=VOTE_LIKED, participant=row, delta=row.delta)
+    if row.delta < 0:
+        return VoteToggleResult(action=VOTE_UNLIKED, participant=row, delta=row.delta)
+    if row.student_vote_count >= max_votes:
+        return VoteToggleResult(action=VOTE_LIMIT_EXCEEDED, participant=row)
+    return VoteToggleResult(action=VOTE_UNCHANGED, participant=row)
@@ -0,0 +1,172 @@
+# backend/app/crud/crud_vote_stats.py
+# Oylama analitiği: dakikalık/saatlik oy kovalarının (migrations/0006) artımsal
+# güncellenmesi ve /stats endpoint'lerinin okumaları (async).
+#
+# Toplama işi like_count uzlaştırmasıyla aynı watermark düzenini kullanır (bkz.
+# crud/crud_reconcile.py): watermark'tan güvenli üst sınıra kadar
+#   - eklenen oylar: votes.created_at,
+#   - bu arada eklenip silinmiş oylar: vote_deletions.vote_created_at,
+#   - silinen oylar: vote_deletions.deleted_at
+# zamanına göre kovalara eklenir. Kovalar ve watermark tek transaction'da
+# yazılır; aynı anda tek worker toplar (advisory lock), hiçbir değişiklik iki
+# kez sayılmaz. Uzlaştırma işi vote_deletions kayıtlarını bu işin watermark'ından
+# önce silmez.
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.crud_reconcile import _SAFE_UPPER_BOUND_SQL, VOTE_STATS_ROLLUP_JOB
+
+# pg_try_advisory_xact_lock anahtarı: aynı anda tek worker toplama yapar
+_ROLLUP_LOCK_KEY = 724_310_020
+
+_TRY_LOCK_SQL = text("SELECT pg_try_advisory_xact_lock(:key)")
+
+_WATERMARK_SQL = text("SELECT watermark FROM job_watermarks WHERE job_name = :job_name")
+
+# vote_created_at >= since olan silme kaydının deleted_at'i de >= since'tir;
+# deleted_at koşulu taramayı ix_vote_deletions_deleted_at ile sınırlar.
+_ROLLUP_SQL = text("""
+WITH changes AS (
+    SELECT participant_id, created_at AS at, 1 AS added, 0 AS removed FROM votes
+    WHERE created_at >= :since AND created_at < :until
+    UNION ALL
+    SELECT participant_id, vote_created_at, 1, 0 FROM vote_deletions
+    WHERE deleted_at >= :since AND vote_created_at >= :since AND vote_created_at < :until
+    UNION ALL
+    SELECT participant_id, deleted_at, 0, 1 FROM vote_deletions
+    WHERE deleted_at >= :since AND deleted_at < :until
+),
+minutes AS (
+    SELECT participant_id, date_trunc('minute', at, 'UTC') AS bucket,
+           sum(added)::int AS added, sum(removed)::int AS removed
+    FROM changes
+    GROUP BY 1, 2
+),
+hours AS (
+    INSERT INTO vote_stats_hour AS s (participant_id, bucket, added, removed)
+    SELECT participant_id, date_trunc('hour', bucket, 'UTC'), sum(added), sum(removed)
+    FROM minutes
+    GROUP BY 1, 2
+    ON CONFLICT (participant_id, bucket)
+    DO UPDATE SET added = s.added + EXCLUDED.added, removed = s.removed + EXCLUDED.removed
+),
+upserted AS (
+    INSERT INTO vote_stats_minute AS s (participant_id, bucket, added, removed)
+    SELECT participant_id, bucket, added, removed FROM minutes
+    ON CONFLICT (participant_id, bucket)
+    DO UPDATE SET added = s.added + EXCLUDED.added, removed = s.removed + EXCLUDED.removed
+)
+SELECT count(*) AS buckets, coalesce(sum(added), 0) AS added, coalesce(sum(removed), 0) AS removed
+FROM minutes
+""")
+
+_SET_WATERMARK_SQL = text("""
+INSERT INTO job_watermarks (job_name, watermark) VALUES (:job_name, :watermark)
+ON CONFLICT (job_name) DO UPDATE SET watermark = EXCLUDED.watermark, updated_at = now()
+""")
+
+# Kova tabloları sabit isimlerdir (kullanıcı girdisi değil)
+_TABLES = {60: "vote_stats_minute", 3600: "vote_stats_hour"}
+
+
+@dataclass
+class VoteStatsRollupReport:
+    since: Optional[datetime]
+    until: Optional[datetime]
+    buckets: int = 0 # Güncellenen dakika kovası
+    added: int = 0
+    removed: int = 0
+    skipped: bool = False # Başka bir worker o an topluyordu
+
+
+async def get_watermark(db: AsyncSession) -> Optional[datetime]:
+    return (await db.execute(_WATERMARK_SQL, {"job_name": VOTE_STATS_ROLLUP_JOB})).scalar()
+
+
+# Watermark'tan güvenli üst sınıra kadarki oy değişikliklerini kovalara ekler ve
+# watermark'ı ilerletir (tek transaction). Başka bir worker o an topluyorsa
+# hiçbir şey yapmaz. İlk çalışma (watermark yok) tüm geçmişi toplar.
+async def roll_up_vote_stats(db: AsyncSession) -> VoteStatsRollupReport:
+    if not (await db.execute(_TRY_LOCK_SQL, {"key": _ROLLUP_LOCK_KEY})).scalar_one():
+        await db.rollback()
+        return VoteStatsRollupReport(since=None, until=None, skipped=True)
+    since = await get_watermark(db)
+    until = (await db.execute(_SAFE_UPPER_BOUND_SQL)).scalar_one()
+    row = (await db.execute(
+        _ROLLUP_SQL, {"since": since or datetime.min.replace(tzinfo=timezone.utc), "until": until}
+    )).one()
+    await db.execute(_SET_WATERMARK_SQL, {"job_name": VOTE_STATS_ROLLUP_JOB, "watermark": until})
+    await db.commit()
+    return VoteStatsRollupReport(since=since, until=until, buckets=row.buckets, added=row.added, removed=row.removed)
+
+
+# Bir dünyanın [start, end) aralığındaki dolu kovaları (bucket, added, removed).
+# bucket_seconds: 60 (dakika tablosu) veya 3600 (saat tablosu)
+async def get_participant_buckets(
+    db: AsyncSession, participant_id: int, bucket_seconds: int, start: datetime, end: datetime
+) -> List:
+    result = await db.execute(
+        text(f"""
+            SELECT bucket, added, removed FROM {_TABLES[bucket_seconds]}
+            WHERE participant_id = :participant_id AND bucket >= :start AND bucket < :end
+            ORDER BY bucket
+        """),
+        {"participant_id": participant_id, "start": start, "end": end},
+    )
+    return result.all()
+
+
+# Tüm dünyaların [start, end) aralığındaki kova toplamları
+async def get_total_buckets(db: AsyncSession, bucket_seconds: int, start: datetime, end: datetime) -> List:
+    result = await db.execute(
+        text(f"""
+            SELECT bucket, sum(added)::int AS added, sum(removed)::int AS removed FROM {_TABLES[bucket_seconds]}
+            WHERE bucket >= :start AND bucket < :end
+            GROUP BY bucket
+            ORDER BY bucket
+        """),
+        {"start": start, "end": end},
+    )
+    return result.all()
+
+
+# start'tan önceki toplam (added, removed): saat başına kadar saat tablosundan,
+# kalanı dakika tablosundan. participant_id None ise tüm dünyalar.
+async def get_totals_before(db: AsyncSession, start: datetime, participant_id: Optional[int] = None):
+    participant_filter = "" if participant_id is None else "participant_id = :participant_id AND"
+    hour_start = start.replace(minute=0, second=0, microsecond=0)
+    result = await db.execute(
+        text(f"""
+            SELECT coalesce(sum(added), 0) AS added, coalesce(sum(removed), 0) AS removed
+            FROM (
+                SELECT added, removed FROM vote_stats_hour
+                WHERE {participant_filter} bucket < :hour_start
+                UNION ALL
+                SELECT added, removed FROM vote_stats_minute
+                WHERE {participant_filter} bucket >= :hour_start AND bucket < :start
+            ) t
+        """),
+        {"participant_id": participant_id, "hour_start": hour_start, "start": start},
+    )
+    return result.one()
+
+
+# [start, end) aralığında en çok oy alan dünyalar (participant_id, added, removed)
+async def get_top_participants(db: AsyncSession, start: datetime, end: datetime, limit: int) -> List:
+    result = await db.execute(
+        text("""
+            SELECT participant_id, sum(added)::int AS added, sum(removed)::int AS removed
+            FROM vote_stats_minute
+            WHERE bucket >= :start AND bucket < :end
+            GROUP BY participant_id
+            ORDER BY sum(added) DESC, participant_id
+            LIMIT :limit
+        """),
+        {"start": start, "end": end, "limit": limit},
+    )
+    return result.all()
@@ -1,36 +1,120 @@
 # backend/app/db/database.py
 
-import os
+import time
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from dotenv import load_dotenv
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
-load_dotenv()
+from app.core.config import settings
+from app.core.metrics import DB_POOL_CHECKOUT_SECONDS
 
-SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
+# Ayarlar tek yerden (core/config.py, ortam değişkenleri + backend/.env) okunur;
+# DATABASE_URL eksikse Settings zaten hata verir
+SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-if not SQLALCHEMY_DATABASE_URL:
-    raise ValueError("DATABASE_URL ortam değişkeni bulunamadı!")
+# Senkron URL'i asyncpg sürücüsünü kullanan async URL'e çevirir
+# (Render gibi servisler "postgres://" şeması da verebiliyor)
+def to_async_database_url(url: str) -> str:
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+# Havuzdan bağlantı alma süresini (havuz doluysa bekleme dahil) ölçen havuzlar
+class _CheckoutTimingMixin:
+    metrics_label = "sync"
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - started, self.metrics_label)
+
+
+# Etiket sınıf özelliğidir: engine.dispose() havuzu aynı sınıftan yeniden oluşturur
+def _timed_pool_class(base, label: str):
+    return type(f"Timed{base.__name__}", (_CheckoutTimingMixin, base), {"metrics_label": label})
+
+
+# Havuz ayarları (bkz. core/config.py DB_POOL_*); tüm engine'ler için ortak
+def _pool_options() -> dict:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+    }
+
+
+# API engine'leri için asyncpg bağlantı ayarları (statement_timeout)
+def _async_connect_args() -> dict:
+    if settings.DB_STATEMENT_TIMEOUT_MS <= 0:
+        return {}
+    return {"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}}
+
+
+def _create_async_engine(url: str, label: str):
+    return create_async_engine(
+        to_async_database_url(url),
+        poolclass=_timed_pool_class(AsyncAdaptedQueuePool, label),
+        connect_args=_async_connect_args(),
+        **_pool_options(),
+    )
 
 # SQLAlchemy motorunu oluştur
 # connect_args sadece SQLite içindir, PostgreSQL için genellikle gerekmez
 # engine = create_engine(
 #     SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False} # Sadece SQLite için
 # )
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# statement_timeout uygulanmaz: migration'lar, import ve uzlaştırma script'leri uzun sürebilir
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, poolclass=_timed_pool_class(QueuePool, "sync"), **_pool_options()
+)
 
 # Veritabanı oturumları (session) oluşturmak için bir fabrika
+# Senkron session'lar scripts/ altındaki import araçları tarafından kullanılır
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# API endpoint'leri için async motor ve session fabrikası
+# Event loop'u bloklamadan sorgu çalıştırmak için asyncpg kullanılır
+async_engine = _create_async_engine(SQLALCHEMY_DATABASE_URL, "async")
+
+# expire_on_commit=False: commit sonrası nesneler response'a serialize edilirken
+# tekrar (lazy) sorgu atılmasın
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+# Okuma replikası (READ_DATABASE_URL). Tanımlı değilse okuma engine'i birincil
+# engine'in kendisidir ve okuma session'ları birincile gider.
+# Hangi isteğin replikaya gideceğine api/deps.py get_read_db karar verir.
+if settings.READ_DATABASE_URL:
+    async_read_engine = _create_async_engine(settings.READ_DATABASE_URL, "async_read")
+else:
+    async_read_engine = async_engine
+has_read_replica = async_read_engine is not async_engine
+
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=async_read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 # Modellerimizin miras alacağı temel sınıf
 Base = declarative_base()
 
-# Dependency Injection için veritabanı session'ı sağlayan fonksiyon
-# FastAPI endpointlerinde bu fonksiyonu kullanarak session alacağız
+# Dependency Injection için veritabanı session'ı sağlayan fonksiyon (senkron)
+# Script'ler ve senkron araçlar için bırakıldı
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# FastAPI endpointlerinde kullanılan async session dependency'si
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
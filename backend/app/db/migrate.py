@@ -0,0 +1,137 @@
+# backend/app/db/migrate.py
+# Sürümlü SQL migration'ları (app/db/migrations/NNNN_ad.sql) sırayla uygular.
+# Uygulanan sürümler schema_migrations tablosunda tutulur; her migration kendi
+# transaction'ında çalışır. Birden fazla worker aynı anda başlarsa advisory lock
+# ile sırayla beklerler (biri uygular, diğerleri uygulanmış bulur).
+#
+#   python -m app.db.migrate            # bekleyen migration'ları uygula
+#   python -m app.db.migrate --status   # durum
+
+import argparse
+import hashlib
+import logging
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+from app.db.database import engine
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+_MIGRATION_FILE_RE = re.compile(r"^(\d+)_(\w+)\.sql$")
+# pg_advisory_lock anahtarı (uygulamaya özgü sabit bir sayı)
+_MIGRATION_LOCK_KEY = 724_310_013
+
+_CREATE_SCHEMA_MIGRATIONS_SQL = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    name VARCHAR(200) NOT NULL,
+    checksum VARCHAR(64) NOT NULL,
+    applied_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+)
+"""
+
+
+@dataclass
+class Migration:
+    version: int
+    name: str
+    sql: str
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256(self.sql.encode()).hexdigest()
+
+
+def load_migrations() -> List[Migration]:
+    migrations = []
+    for path in sorted(MIGRATIONS_DIR.glob("*.sql")):
+        match = _MIGRATION_FILE_RE.match(path.name)
+        if match is None:
+            raise ValueError(f"Geçersiz migration dosya adı: {path.name} (beklenen: NNNN_ad.sql)")
+        migrations.append(Migration(int(match.group(1)), match.group(2), path.read_text(encoding="utf-8")))
+    versions = [m.version for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError(f"Aynı numaralı birden fazla migration var: {versions}")
+    return sorted(migrations, key=lambda m: m.version)
+
+
+def _applied_checksums(cursor) -> Dict[int, str]:
+    cursor.execute("SELECT version, checksum FROM schema_migrations")
+    return dict(cursor.fetchall())
+
+
+# Bekleyen migration'ları uygular; uygulananların listesini döndürür.
+# SQL dosyaları parametresiz çalıştırılır (psycopg2 çok statement'lı metni tek
+# seferde gönderir; $$ ile yazılmış fonksiyonlar desteklenir).
+def apply_migrations() -> List[Migration]:
+    migrations = load_migrations()
+    applied: List[Migration] = []
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute("SELECT pg_advisory_lock(%s)", (_MIGRATION_LOCK_KEY,))
+        try:
+            cursor.execute(_CREATE_SCHEMA_MIGRATIONS_SQL)
+            connection.commit()
+            done = _applied_checksums(cursor)
+            for migration in migrations:
+                if migration.version in done:
+                    if done[migration.version] != migration.checksum:
+                        logger.warning("Migration %04d_%s uygulandıktan sonra değiştirilmiş",
+                                       migration.version, migration.name)
+                    continue
+                try:
+                    cursor.execute(migration.sql)
+                    cursor.execute(
+                        "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+                        (migration.version, migration.name, migration.checksum),
+                    )
+                    connection.commit()
+                except Exception:
+                    connection.rollback()
+                    logger.error("Migration %04d_%s uygulanamadı", migration.version, migration.name)
+                    raise
+                logger.info("Migration uygulandı: %04d_%s", migration.version, migration.name)
+                applied.append(migration)
+        finally:
+            connection.rollback()
+            cursor.execute("SELECT pg_advisory_unlock(%s)", (_MIGRATION_LOCK_KEY,))
+            connection.commit()
+    finally:
+        connection.close()
+    return applied
+
+
+def print_status():
+    migrations = load_migrations()
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute("SELECT to_regclass('schema_migrations') IS NOT NULL")
+        done = _applied_checksums(cursor) if cursor.fetchone()[0] else {}
+    finally:
+        connection.close()
+    for migration in migrations:
+        if migration.version not in done:
+            state = "bekliyor"
+        elif done[migration.version] != migration.checksum:
+            state = "uygulandı (dosya sonradan değişmiş!)"
+        else:
+            state = "uygulandı"
+        print(f"{migration.version:04d}_{migration.name:<30} {state}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Veritabanı migration'larını uygular.")
+    parser.add_argument("--status", action="store_true", help="Sadece hangi migration'ların uygulandığını göster")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if args.status:
+        print_status()
+    else:
+        applied = apply_migrations()
+        print(f"{len(applied)} migration uygulandı." if applied else "Veritabanı güncel.")
@@ -0,0 +1,44 @@
+-- 0001: Başlangıç şeması (app/models ile birebir aynı)
+-- Tablolar zaten varsa (ör. daha önce Base.metadata.create_all ile oluşturulmuş
+-- bir veritabanı) dokunulmaz; böylece mevcut veritabanları da bu sürümü benimser.
+
+-- Eski elle yazılmış şema (students.student_number) otomatik taşınamaz
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+               WHERE table_schema = current_schema() AND table_name = 'students' AND column_name = 'student_number')
+       AND NOT EXISTS (SELECT 1 FROM information_schema.columns
+                       WHERE table_schema = current_schema() AND table_name = 'students' AND column_name = 'email') THEN
+        RAISE EXCEPTION 'students tablosu eski şemada (student_number). email/hashed_password/full_name kolonlarına elle taşıyın.';
+    END IF;
+END
+$$;
+
+CREATE TABLE IF NOT EXISTS participants (
+    id SERIAL PRIMARY KEY,
+    serial_number VARCHAR(50) NOT NULL,        -- 'MCWorldBK-01' gibi benzersiz seri no
+    video_url VARCHAR NOT NULL,                -- Bunny CDN video linki
+    like_count INTEGER NOT NULL DEFAULT 0,     -- Beğeni sayısı (oy yolu günceller)
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    updated_at TIMESTAMP WITH TIME ZONE
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_participants_serial_number ON participants (serial_number);
+
+CREATE TABLE IF NOT EXISTS students (
+    id SERIAL PRIMARY KEY,
+    email VARCHAR(255) NOT NULL,               -- Giriş için kullanılır
+    hashed_password VARCHAR(255) NOT NULL,
+    full_name VARCHAR(200),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    updated_at TIMESTAMP WITH TIME ZONE
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_students_email ON students (email);
+
+CREATE TABLE IF NOT EXISTS votes (
+    id SERIAL PRIMARY KEY,
+    student_id INTEGER NOT NULL REFERENCES students (id) ON DELETE CASCADE,
+    participant_id INTEGER NOT NULL REFERENCES participants (id) ON DELETE CASCADE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    -- Bir öğrencinin aynı dünyaya birden fazla oy vermesini engeller
+    CONSTRAINT unique_student_vote UNIQUE (student_id, participant_id)
+);
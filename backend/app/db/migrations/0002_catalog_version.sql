@@ -0,0 +1,21 @@
+-- 0002: Katalog sürüm sayacı (ETag / 304, bkz. app/core/catalog_version.py)
+-- participants veya votes tablosunu değiştiren her statement sayacı artırır ve
+-- yeni değeri 'catalog_version' kanalına NOTIFY eder. Statement seviyesinde
+-- trigger: toplu yazımlar (import, oy tamponu) tek artış yapar.
+
+CREATE SEQUENCE IF NOT EXISTS catalog_version_seq;
+
+CREATE OR REPLACE FUNCTION bump_catalog_version() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('catalog_version', nextval('catalog_version_seq')::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER participants_catalog_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON participants
+FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version();
+
+CREATE OR REPLACE TRIGGER votes_catalog_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON votes
+FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version();
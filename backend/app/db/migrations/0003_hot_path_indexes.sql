@@ -0,0 +1,19 @@
+-- 0003: Oy ve skor tablosu sıcak yolları için indeksler
+-- (scripts/check_query_plans.py bu sorguların sıralı taramaya düşmediğini doğrular)
+
+-- Skor tablosu: ORDER BY like_count DESC, id LIMIT n
+-- (get_participants_top5 / get_participants_top ve like_count'a göre keyset sayfalama)
+CREATE INDEX IF NOT EXISTS ix_participants_like_count_id ON participants (like_count DESC, id);
+
+-- Bir dünyanın oyları: dünya silinirken ON DELETE CASCADE ve dünya bazlı oy sayımı
+CREATE INDEX IF NOT EXISTS ix_votes_participant_id ON votes (participant_id);
+
+-- Öğrencinin oyları (get_votes_by_student, get_voted_participant_ids, toggle'daki
+-- limit sayımı ve silme) unique_student_vote (student_id, participant_id) indeksini
+-- kullanır; participant_id'ler indeksten okunur (index-only scan), ek indeks gerekmez.
+
+-- Birincil anahtarla aynı kolonu indeksleyen gereksiz indeksler (eski modellerdeki
+-- index=True); her oy INSERT'inde boşuna güncelleniyorlardı
+DROP INDEX IF EXISTS ix_votes_id;
+DROP INDEX IF EXISTS ix_participants_id;
+DROP INDEX IF EXISTS ix_students_id;
@@ -0,0 +1,38 @@
+-- 0004: like_count uzlaştırması için değişiklik izleme (bkz. app/crud/crud_reconcile.py)
+-- Uzlaştırma işi sadece son çalışmasından (watermark) bu yana oyu değişen
+-- dünyaları sayar: eklenen oylar votes.created_at ile, silinenler vote_deletions
+-- kaydıyla bulunur.
+
+-- Yeni oyları zamana göre bulmak için
+CREATE INDEX IF NOT EXISTS ix_votes_created_at ON votes (created_at);
+
+-- Silinen oyların kaydı (statement seviyesinde trigger doldurur)
+CREATE TABLE IF NOT EXISTS vote_deletions (
+    id BIGSERIAL PRIMARY KEY,
+    participant_id INTEGER NOT NULL,
+    student_id INTEGER NOT NULL,
+    vote_created_at TIMESTAMP WITH TIME ZONE,
+    -- now(): silen transaction'ın başlangıç zamanı (votes.created_at ile aynı anlam)
+    deleted_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS ix_vote_deletions_deleted_at ON vote_deletions (deleted_at);
+
+CREATE OR REPLACE FUNCTION log_vote_deletions() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO vote_deletions (participant_id, student_id, vote_created_at)
+    SELECT participant_id, student_id, created_at FROM removed_votes;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER votes_log_deletions
+AFTER DELETE ON votes
+REFERENCING OLD TABLE AS removed_votes
+FOR EACH STATEMENT EXECUTE FUNCTION log_vote_deletions();
+
+-- Periyodik işlerin kaldığı yer
+CREATE TABLE IF NOT EXISTS job_watermarks (
+    job_name VARCHAR(100) PRIMARY KEY,
+    watermark TIMESTAMP WITH TIME ZONE NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+);
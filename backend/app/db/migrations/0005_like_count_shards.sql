@@ -0,0 +1,13 @@
+-- 0005: Parçalı (sharded) beğeni sayaçları (bkz. app/crud/crud_like_shards.py)
+-- LIKE_COUNTER_SHARDS > 0 iken oy yolu participants satırını güncellemez;
+-- değişimi dünyanın K sayaç satırından birine (öğrenci id'sine göre) ekler.
+-- Popüler bir dünyanın oyları böylece tek bir satır kilidinde sıraya girmez.
+-- Gerçek sayı: participants.like_count + sum(delta). Periyodik toplama (rollup)
+-- bu satırları silip participants.like_count'a ekler.
+
+CREATE TABLE IF NOT EXISTS participant_like_shards (
+    participant_id INTEGER NOT NULL REFERENCES participants (id) ON DELETE CASCADE,
+    shard SMALLINT NOT NULL,
+    delta INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (participant_id, shard)
+);
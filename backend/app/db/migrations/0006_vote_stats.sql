@@ -0,0 +1,25 @@
+-- 0006: Oylama analitiği için önceden toplanmış zaman kovaları (bkz. app/crud/crud_vote_stats.py)
+-- Dünya başına dakikalık ve saatlik eklenen/silinen oy sayıları. Periyodik iş
+-- sadece son çalışmasından (job_watermarks: vote_stats_rollup) bu yana eklenen
+-- oyları (votes.created_at) ve silinenleri (vote_deletions) kovalara ekler;
+-- /stats endpoint'leri votes tablosunu hiç taramaz. Kovalar UTC'ye göre hizalıdır.
+-- Dünya silinse de geçmişi kalsın diye participants'a FK yoktur.
+
+CREATE TABLE IF NOT EXISTS vote_stats_minute (
+    participant_id INTEGER NOT NULL,
+    bucket TIMESTAMP WITH TIME ZONE NOT NULL,
+    added INTEGER NOT NULL DEFAULT 0,
+    removed INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (participant_id, bucket)
+);
+-- Tüm dünyaların toplamı (/stats/overview) zaman aralığıyla okunur
+CREATE INDEX IF NOT EXISTS ix_vote_stats_minute_bucket ON vote_stats_minute (bucket);
+
+CREATE TABLE IF NOT EXISTS vote_stats_hour (
+    participant_id INTEGER NOT NULL,
+    bucket TIMESTAMP WITH TIME ZONE NOT NULL,
+    added INTEGER NOT NULL DEFAULT 0,
+    removed INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (participant_id, bucket)
+);
+CREATE INDEX IF NOT EXISTS ix_vote_stats_hour_bucket ON vote_stats_hour (bucket);
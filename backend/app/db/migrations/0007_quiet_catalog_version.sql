@@ -0,0 +1,34 @@
+-- 0007: Oy yolunda NOTIFY yok (bkz. app/core/catalog_version.py)
+-- NOTIFY gönderen transaction commit'te PostgreSQL'in global bildirim kuyruğu
+-- kilidini alır; 0002'deki trigger'lar her oyda NOTIFY ettiği için tüm
+-- worker'ların oy commit'leri bu kilitte sıraya giriyordu. Artık:
+--   - votes değişiklikleri ve participants.like_count güncellemeleri sayacı
+--     sadece artırır (nextval). Oyu yazan worker yeni sürümü kendi LISTEN
+--     bağlantısından, oy transaction'ı dışında ve birleştirerek duyurur; diğer
+--     worker'lar ayrıca periyodik sorguyla yakalar.
+--   - Katalog değişiklikleri (dünya ekleme/silme, serial_number/video_url) eskisi
+--     gibi NOTIFY eder.
+-- CREATE OR REPLACE TRIGGER (0002, 0004) PostgreSQL 14 gerektirir; bu migration
+-- DROP/CREATE kullanır.
+
+CREATE OR REPLACE FUNCTION bump_catalog_version_quiet() RETURNS trigger AS $$
+BEGIN
+    PERFORM nextval('catalog_version_seq');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS votes_catalog_version ON votes;
+CREATE TRIGGER votes_catalog_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON votes
+FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version_quiet();
+
+DROP TRIGGER IF EXISTS participants_catalog_version ON participants;
+CREATE TRIGGER participants_catalog_version
+AFTER INSERT OR DELETE OR TRUNCATE OR UPDATE OF serial_number, video_url, created_at ON participants
+FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version();
+
+DROP TRIGGER IF EXISTS participants_like_count_version ON participants;
+CREATE TRIGGER participants_like_count_version
+AFTER UPDATE OF like_count ON participants
+FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version_quiet();
@@ -0,0 +1,204 @@
+# backend/app/db/profiler.py
+# İstek başına SQL profili ve N+1 dedektörü (isteğe bağlı; SQL_PROFILER_ENABLED).
+# Engine event'leri her statement'ı, süresini ve uygulamadaki çağrı yerini
+# (ör. crud/crud_vote_async.py:42 toggle_vote <- api/endpoints/votes.py:31 vote)
+# o anki profile yazar. SQLProfilerMiddleware istek sorgu sayısı veya DB süresi
+# eşikleri aştığında, ya da aynı statement eşikten fazla tekrarlandığında
+# (tipik N+1: döngü içinde tek satır okuma) bir özet loglar.
+#
+# Testlerde/script'lerde sorgu bütçesi doğrulamak için:
+#   with query_budget(2):
+#       await client.post("/api/v1/votes", ...)
+# Blok içindeki sorgu sayısı 2 değilse QueryBudgetExceeded (AssertionError) fırlatır.
+# Profil ContextVar'da tutulur; async engine'in greenlet'i ve asyncio.to_thread
+# ile çalışan kod da aynı profile yazar.
+
+import logging
+import os
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import greenlet
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Çağrı yeri ararken atlanan dosyalar (bu modül ve engine/session kurulumu)
+_SKIPPED_FILES = {
+    os.path.join(_APP_DIR, "db", name) for name in ("profiler.py", "query_counter.py", "database.py")
+}
+# Çağrı yerinde gösterilen en fazla uygulama çerçevesi
+_CALL_SITE_DEPTH = 2
+
+
+@dataclass
+class QueryRecord:
+    statement: str
+    seconds: float
+    call_site: str
+
+
+@dataclass
+class SQLProfile:
+    records: List[QueryRecord] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.records)
+
+    @property
+    def seconds(self) -> float:
+        return sum(record.seconds for record in self.records)
+
+    # Aynı SQL metni min_count veya daha fazla kez çalıştıysa: [(statement, adet, çağrı yerleri)]
+    def repeated(self, min_count: int = 2) -> List[Tuple[str, int, List[str]]]:
+        counts = Counter(record.statement for record in self.records)
+        result = []
+        for statement, count in counts.most_common():
+            if count < min_count:
+                break
+            sites = list(dict.fromkeys(r.call_site for r in self.records if r.statement == statement))
+            result.append((statement, count, sites))
+        return result
+
+    def summary(self, title: str = "SQL profili", repeat_threshold: int = 2, limit: int = 20) -> str:
+        lines = [f"{title}: {self.count} sorgu, {self.seconds * 1000:.1f} ms"]
+        for index, record in enumerate(self.records[:limit], start=1):
+            lines.append(f"  {index:>3}. {record.seconds * 1000:>7.2f} ms  {_shorten(record.statement)}  [{record.call_site}]")
+        if self.count > limit:
+            lines.append(f"  ... {self.count - limit} sorgu daha")
+        for statement, count, sites in self.repeated(repeat_threshold) if repeat_threshold else ():
+            lines.append(f"  Olası N+1: {count} kez aynı sorgu: {_shorten(statement)}  [{'; '.join(sites)}]")
+        return "\n".join(lines)
+
+
+# Sorgu bütçesi aşıldığında (query_budget)
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+_current: ContextVar[Optional[SQLProfile]] = ContextVar("sql_profile", default=None)
+
+
+def _shorten(statement: str, width: int = 120) -> str:
+    text = " ".join(statement.split())
+    return text if len(text) <= width else text[:width - 3] + "..."
+
+
+def _frames():
+    frame = sys._getframe(2)
+    while frame is not None:
+        yield frame
+        frame = frame.f_back
+    # Async engine: sorgu ayrı bir greenlet'te çalışır; asıl çağıran coroutine'ler
+    # bekleyen üst greenlet'in yığınındadır
+    parent = greenlet.getcurrent().parent
+    frame = parent.gr_frame if parent is not None else None
+    while frame is not None:
+        yield frame
+        frame = frame.f_back
+
+
+# Uygulama kodundaki en yakın çağrı yerleri ("dosya:satır fonksiyon <- ...")
+def _call_site() -> str:
+    sites = []
+    for frame in _frames():
+        filename = frame.f_code.co_filename
+        if filename.startswith(_APP_DIR) and filename not in _SKIPPED_FILES:
+            sites.append(f"{os.path.relpath(filename, _APP_DIR)}:{frame.f_lineno} {frame.f_code.co_name}")
+            if len(sites) == _CALL_SITE_DEPTH:
+                break
+    return " <- ".join(sites) or "?"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("profiler_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current.get()
+    started = conn.info.get("profiler_started_at")
+    if profile is None or not started:
+        return
+    profile.records.append(QueryRecord(statement, time.perf_counter() - started.pop(), _call_site()))
+
+
+# Profil event'lerini engine'e bağlar (async engine için .sync_engine verilir); tekrar çağrılabilir
+def install_profiler(engine: Engine):
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# Blok içindeki sorguları profiller. Dışarıda zaten bir profil varsa (ör.
+# query_budget içinde middleware'den geçen bir istek) kayıtlar ona da yazılır.
+@contextmanager
+def profile_queries():
+    outer = _current.get()
+    if outer is not None:
+        start = outer.count
+        profile = SQLProfile()
+        try:
+            yield profile
+        finally:
+            profile.records = outer.records[start:]
+        return
+    profile = SQLProfile()
+    token = _current.set(profile)
+    try:
+        yield profile
+    finally:
+        _current.reset(token)
+
+
+# Blok tam olarak `expected` sorgu çalıştırmalı (exact=False ise en fazla).
+# Profil event'leri kurulu değilse uygulamanın tüm engine'lerine bağlanır.
+@contextmanager
+def query_budget(expected: int, exact: bool = True):
+    from app.db.database import async_engine, async_read_engine, engine
+    install_profiler(async_engine.sync_engine)
+    install_profiler(async_read_engine.sync_engine)
+    install_profiler(engine)
+    with profile_queries() as profile:
+        yield profile
+    if profile.count > expected or (exact and profile.count != expected):
+        expectation = f"tam {expected}" if exact else f"en fazla {expected}"
+        raise QueryBudgetExceeded(f"Sorgu bütçesi: {expectation}, çalışan: {profile.count}\n" + profile.summary())
+
+
+# Saf ASGI middleware: her isteği profiller, eşik aşılırsa özeti loglar
+class SQLProfilerMiddleware:
+    def __init__(self, app, max_queries: int, max_db_ms: float, repeat_threshold: int):
+        self.app = app
+        self.max_queries = max_queries
+        self.max_db_ms = max_db_ms
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with profile_queries() as profile:
+            await self.app(scope, receive, send)
+        reasons = []
+        if self.max_queries and profile.count > self.max_queries:
+            reasons.append(f"{profile.count} sorgu > {self.max_queries}")
+        if self.max_db_ms and profile.seconds * 1000 > self.max_db_ms:
+            reasons.append(f"{profile.seconds * 1000:.1f} ms > {self.max_db_ms:g} ms")
+        if self.repeat_threshold and profile.repeated(self.repeat_threshold):
+            reasons.append("tekrarlanan sorgu (olası N+1)")
+        if reasons:
+            route = getattr(scope.get("route"), "path", scope["path"])
+            logger.warning("%s", profile.summary(
+                f"{scope['method']} {route} ({', '.join(reasons)})", repeat_threshold=self.repeat_threshold,
+            ))
+
@@ -0,0 +1,91 @@
+# backend/app/db/query_counter.py
+# İstek başına veritabanı sorgu sayısı ve süresi.
+# Engine event'leri her statement'ı o anki isteğin sayacına (ContextVar) yazar.
+# Sayaç değiştirilebilir bir nesne olduğu için, isteğin içinden açılan görevler ve
+# asyncio.to_thread ile çalışan senkron kod (context kopyalanır) da aynı sayaca yazar.
+# İstek dışında (arka plan görevleri) sayaç yoktur ve hiçbir şey kaydedilmez.
+#
+# DB_QUERY_COUNT_HEADER açıksa QueryCountMiddleware cevaplara
+# X-DB-Query-Count / X-DB-Time-Ms başlıklarını ekler (scripts/loadtest.py okur);
+# METRICS_ENABLED açıksa aynı sayaç core/metrics.py histogramlarını besler.
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+QUERY_COUNT_HEADER = b"x-db-query-count"
+QUERY_TIME_HEADER = b"x-db-time-ms"
+
+
+@dataclass
+class QueryCounter:
+    count: int = 0
+    seconds: float = 0.0
+
+
+_current: ContextVar[Optional[QueryCounter]] = ContextVar("db_query_counter", default=None)
+
+
+# Blok içinde çalışan sorguları sayar. Dışarıda zaten bir sayaç varsa (ör. hem
+# metrik hem başlık middleware'i açık) aynı sayaç kullanılır.
+@contextmanager
+def track_queries():
+    counter = _current.get()
+    if counter is not None:
+        yield counter
+        return
+    counter = QueryCounter()
+    token = _current.set(counter)
+    try:
+        yield counter
+    finally:
+        _current.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    counter = _current.get()
+    started = conn.info.get("query_started_at")
+    if counter is None or not started:
+        return
+    counter.count += 1
+    counter.seconds += time.perf_counter() - started.pop()
+
+
+# Sayaç event'lerini engine'e bağlar (async engine için .sync_engine verilir); tekrar çağrılabilir
+def install_query_counter(engine: Engine):
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# Saf ASGI middleware: her HTTP isteğini kendi sayacıyla çalıştırır ve başlıkları
+# cevap başlarken ekler (gövde akışına dokunmaz; SSE gibi uzun cevaplarda da çalışır)
+class QueryCountMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as counter:
+            async def send_with_counts(message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((QUERY_COUNT_HEADER, str(counter.count).encode()))
+                    headers.append((QUERY_TIME_HEADER, f"{counter.seconds * 1000:.2f}".encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_counts)
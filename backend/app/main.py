@@ -1,15 +1,111 @@
 # backend/app/main.py
 
+import time
+
+# Başlangıç raporunda import süresi (bkz. core/warmup.py)
+_IMPORT_STARTED = time.perf_counter()
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api.endpoints import login, participants, votes
+from app.api.endpoints import admin, bootstrap, health, login, metrics, participants, stats, stream, votes
+from app.core.broadcaster import broadcaster
+from app.core.catalog_version import catalog_version
 from app.core.config import settings 
+from app.core.leaderboard import (
+    refresh_leaderboard, roll_up_like_shards, run_leaderboard_reconciliation, run_like_count_reconciliation,
+    run_like_shard_rollup,
+)
+from app.core.metrics import MetricsMiddleware
+from app.core.security import password_verifier
+from app.core.shared_tally import rebuild_shared_tally, run_shared_tally_check, shared_tally
+from app.core.vote_buffer import vote_buffer
+from app.core.vote_stats import run_vote_stats_rollup
+from app.core.warmup import report_logger, run_warm_up_until_ready, startup_report, warm_up
+from app.db.database import async_engine, async_read_engine, engine, has_read_replica
+from app.db.migrate import apply_migrations
+from app.db.profiler import SQLProfilerMiddleware, install_profiler
+from app.db.query_counter import QueryCountMiddleware, install_query_counter
+
+logger = logging.getLogger(__name__)
+
+startup_report.record("imports", time.perf_counter() - _IMPORT_STARTED)
+
+# Uygulama başlangıcı/kapanışı: process içi önbellekleri yükle, arka plan görevlerini başlat
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.RUN_MIGRATIONS_ON_STARTUP:
+        # Bekleyen şema migration'ları (app/db/migrations); hata olursa uygulama açılmaz
+        with startup_report.step("migrations"):
+            await asyncio.to_thread(apply_migrations)
+    if settings.LIKE_COUNTER_SHARDS <= 0:
+        # Parçalı sayaç modu kapatıldıysa önceki çalışmadan kalan sayaçları bir kez topla
+        try:
+            await roll_up_like_shards(settings.LIKE_COUNTER_ROLLUP_BATCH_SIZE)
+        except Exception:
+            logger.exception("Kalan beğeni sayaçları toplanamadı")
+    try:
+        with startup_report.step("leaderboard"):
+            await refresh_leaderboard()
+    except Exception:
+        # DB'ye ulaşılamazsa uygulama yine açılır; skor tablosu uzlaştırmada yüklenir
+        logger.exception("Skor tablosu başlangıçta yüklenemedi")
+    if settings.SHARED_TALLY_ENABLED:
+        try:
+            with startup_report.step("shared_tally"):
+                await rebuild_shared_tally()
+        except Exception:
+            # Tablo kurulamazsa endpoint'ler DB değerlerini sunar; kontrol görevi tekrar dener
+            logger.exception("Ortak sayaç tablosu kurulamadı")
+    background_tasks = [
+        asyncio.create_task(catalog_version.run()),
+        asyncio.create_task(run_leaderboard_reconciliation(settings.LEADERBOARD_RECONCILE_SECONDS)),
+        asyncio.create_task(broadcaster.run()),
+    ]
+    if not settings.WARMUP_ENABLED:
+        startup_report.ready = True
+    elif not await warm_up():
+        # Örn. DB henüz erişilemiyor: uygulama açılır ama /health/ready 503 döner
+        background_tasks.append(asyncio.create_task(run_warm_up_until_ready(settings.WARMUP_RETRY_SECONDS)))
+    report_logger.info("%s", startup_report.summary())
+    if settings.VOTE_WRITE_BEHIND:
+        background_tasks.append(asyncio.create_task(vote_buffer.run()))
+    if settings.LIKE_COUNTER_SHARDS > 0:
+        background_tasks.append(asyncio.create_task(run_like_shard_rollup(
+            settings.LIKE_COUNTER_ROLLUP_MS / 1000, settings.LIKE_COUNTER_ROLLUP_BATCH_SIZE
+        )))
+    if settings.SHARED_TALLY_ENABLED and settings.SHARED_TALLY_CHECK_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(run_shared_tally_check(settings.SHARED_TALLY_CHECK_SECONDS)))
+    if settings.LIKE_COUNT_RECONCILE_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(run_like_count_reconciliation(
+            settings.LIKE_COUNT_RECONCILE_SECONDS, settings.LIKE_COUNT_RECONCILE_BATCH_SIZE
+        )))
+    if settings.VOTE_STATS_ROLLUP_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(run_vote_stats_rollup(settings.VOTE_STATS_ROLLUP_SECONDS)))
+
+    yield
+
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    if settings.VOTE_WRITE_BEHIND:
+        # Dayanıklılık sözleşmesi: kapanışta bekleyen oylar mutlaka yazılır
+        await vote_buffer.close()
+    password_verifier.shutdown()
+    shared_tally.close()
+    await async_engine.dispose()
+    if has_read_replica:
+        await async_read_engine.dispose()
 
 # FastAPI uygulamasını oluştur
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json" # Swagger dokümantasyon adresi
+    openapi_url=f"{settings.API_V1_STR}/openapi.json", # Swagger dokümantasyon adresi
+    lifespan=lifespan,
 )
 
 # CORS (Cross-Origin Resource Sharing) Ayarları
@@ -30,14 +126,46 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"], # İzin verilen HTTP metodları (GET, POST, vb.)
     allow_headers=["*"], # İzin verilen HTTP başlıkları
+    expose_headers=["X-Next-Cursor"], # /worlds sayfalama cursor'ı tarayıcıdan okunabilsin
 )
 
+# İstek başına DB sorgu sayısı/süresi: metrikler ve (yük testleri için) cevap başlıkları
+if settings.METRICS_ENABLED or settings.DB_QUERY_COUNT_HEADER:
+    install_query_counter(async_engine.sync_engine)
+    install_query_counter(async_read_engine.sync_engine)
+    install_query_counter(engine)
+if settings.DB_QUERY_COUNT_HEADER:
+    app.add_middleware(QueryCountMiddleware)
+# Eşik aşan / N+1 şüpheli istekleri sorgu listesiyle logla (geliştirme için, varsayılan kapalı)
+if settings.SQL_PROFILER_ENABLED:
+    install_profiler(async_engine.sync_engine)
+    install_profiler(async_read_engine.sync_engine)
+    install_profiler(engine)
+    app.add_middleware(
+        SQLProfilerMiddleware,
+        max_queries=settings.SQL_PROFILER_MAX_QUERIES,
+        max_db_ms=settings.SQL_PROFILER_MAX_DB_MS,
+        repeat_threshold=settings.SQL_PROFILER_REPEAT_THRESHOLD,
+    )
+# En dışta: tüm middleware'ler dahil istek süresini ölçer
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # API Router'larını uygulamaya dahil et
 # prefix: Bu router'daki tüm endpoint'lerin başına eklenecek yol
 # tags: Swagger dokümantasyonunda gruplama için kullanılır
 app.include_router(login.router, prefix=settings.API_V1_STR, tags=["Login"])
+# stream router'ı participants'tan önce eklenmeli; yoksa /worlds/stream yolu
+# /worlds/{participant_id} ile eşleşir
+app.include_router(stream.router, prefix=settings.API_V1_STR, tags=["Stream"])
 app.include_router(participants.router, prefix=settings.API_V1_STR, tags=["Participants"])
 app.include_router(votes.router, prefix=settings.API_V1_STR, tags=["Votes"])
+app.include_router(bootstrap.router, prefix=settings.API_V1_STR, tags=["Bootstrap"])
+app.include_router(stats.router, prefix=settings.API_V1_STR, tags=["Stats"])
+app.include_router(admin.router, prefix=settings.API_V1_STR, tags=["Admin"])
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router)
+app.include_router(health.router)
 
 
 # Kök dizin için basit bir endpoint (sunucunun çalıştığını test etmek için)
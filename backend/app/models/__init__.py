@@ -3,3 +3,7 @@
 from .participant import Participant
 from .student import Student
 from .vote import Vote
+from .vote_deletion import VoteDeletion
+from .job_watermark import JobWatermark
+from .participant_like_shard import ParticipantLikeShard
+from .vote_stat import VoteStatMinute, VoteStatHour
@@ -0,0 +1,13 @@
+# backend/app/models/job_watermark.py
+
+from sqlalchemy import Column, String, DateTime, func
+
+from app.db.database import Base
+
+# Periyodik işlerin (ör. like_count uzlaştırması) en son işledikleri zaman
+class JobWatermark(Base):
+    __tablename__ = "job_watermarks"
+
+    job_name = Column(String(100), primary_key=True)
+    watermark = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
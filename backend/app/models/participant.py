@@ -1,6 +1,6 @@
 # backend/app/models/participant.py
 
-from sqlalchemy import Column, Integer, String, DateTime, func
+from sqlalchemy import Column, Integer, String, DateTime, Index, func
 from sqlalchemy.orm import relationship
 
 from app.db.database import Base
@@ -8,11 +8,14 @@ from app.db.database import Base
 class Participant(Base):
     __tablename__ = "participants"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     serial_number = Column(String(50), unique=True, nullable=False, index=True)
     video_url = Column(String, nullable=False) 
-    like_count = Column(Integer, default=0, nullable=False)
+    like_count = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
 
-    votes = relationship("Vote", back_populates="participant", cascade="all, delete-orphan")
\ No newline at end of file
+    votes = relationship("Vote", back_populates="participant", cascade="all, delete-orphan")
+
+    # Skor tablosu sıralaması (like_count azalan, eşitlikte id); bkz. migrations/0003
+    __table_args__ = (Index("ix_participants_like_count_id", like_count.desc(), id),)
\ No newline at end of file
@@ -0,0 +1,14 @@
+# backend/app/models/participant_like_shard.py
+
+from sqlalchemy import Column, ForeignKey, Integer, SmallInteger
+
+from app.db.database import Base
+
+# Bir dünyanın henüz participants.like_count'a toplanmamış beğeni değişimleri
+# (LIKE_COUNTER_SHARDS açıkken; migrations/0005, crud/crud_like_shards.py)
+class ParticipantLikeShard(Base):
+    __tablename__ = "participant_like_shards"
+
+    participant_id = Column(Integer, ForeignKey("participants.id", ondelete="CASCADE"), primary_key=True)
+    shard = Column(SmallInteger, primary_key=True)
+    delta = Column(Integer, nullable=False, default=0, server_default="0")
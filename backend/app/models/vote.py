@@ -1,6 +1,6 @@
 # backend/app/models/vote.py
 
-from sqlalchemy import Column, Integer, DateTime, func, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, DateTime, func, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from app.db.database import Base
@@ -8,12 +8,17 @@ from app.db.database import Base
 class Vote(Base):
     __tablename__ = "votes"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), nullable=False)
     participant_id = Column(Integer, ForeignKey("participants.id", ondelete="CASCADE"), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
 
     student = relationship("Student", back_populates="votes")
     participant = relationship("Participant", back_populates="votes")
 
-    __table_args__ = (UniqueConstraint('student_id', 'participant_id', name='unique_student_vote'),)
\ No newline at end of file
+    # unique_student_vote öğrenci bazlı sorguları da karşılar (student_id ilk kolon);
+    # ix_votes_participant_id dünya bazlı sorgular ve CASCADE silme için
+    __table_args__ = (
+        UniqueConstraint('student_id', 'participant_id', name='unique_student_vote'),
+        Index('ix_votes_participant_id', 'participant_id'),
+    )
\ No newline at end of file
@@ -0,0 +1,16 @@
+# backend/app/models/vote_deletion.py
+
+from sqlalchemy import BigInteger, Column, Integer, DateTime, func
+
+from app.db.database import Base
+
+# Silinen oyların kaydı. votes üzerindeki AFTER DELETE trigger'ı doldurur
+# (migrations/0004); like_count uzlaştırması silinen oyların dünyalarını buradan bulur.
+class VoteDeletion(Base):
+    __tablename__ = "vote_deletions"
+
+    id = Column(BigInteger, primary_key=True)
+    participant_id = Column(Integer, nullable=False)
+    student_id = Column(Integer, nullable=False)
+    vote_created_at = Column(DateTime(timezone=True))
+    deleted_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True)
@@ -0,0 +1,24 @@
+# backend/app/models/vote_stat.py
+
+from sqlalchemy import Column, DateTime, Integer
+
+from app.db.database import Base
+
+# Dünya başına zaman kovasındaki eklenen/silinen oy sayıları (migrations/0006,
+# crud/crud_vote_stats.py). Kova başlangıcı UTC'ye göre dakika/saat başıdır.
+class VoteStatMinute(Base):
+    __tablename__ = "vote_stats_minute"
+
+    participant_id = Column(Integer, primary_key=True)
+    bucket = Column(DateTime(timezone=True), primary_key=True, index=True)
+    added = Column(Integer, nullable=False, default=0, server_default="0")
+    removed = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class VoteStatHour(Base):
+    __tablename__ = "vote_stats_hour"
+
+    participant_id = Column(Integer, primary_key=True)
+    bucket = Column(DateTime(timezone=True), primary_key=True, index=True)
+    added = Column(Integer, nullable=False, default=0, server_default="0")
+    removed = Column(Integer, nullable=False, default=0, server_default="0")
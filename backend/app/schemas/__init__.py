@@ -1,6 +1,8 @@
 # backend/app/schemas/__init__.py
 
-from .participant import ParticipantBase, ParticipantCreate, Participant
+from .participant import ParticipantBase, ParticipantCreate, Participant, ParticipantFields, ParticipantRank
 from .student import StudentBase, StudentCreate, Student
 from .vote import VoteBase, VoteCreate, Vote, VoteOutSimple
-from .token import Token, TokenData
\ No newline at end of file
+from .token import Token, TokenData
+from .bootstrap import Bootstrap
+from .stats import VoteSeries, VoteTimeline, WorldVoteActivity, StatsOverview
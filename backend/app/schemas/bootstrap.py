@@ -0,0 +1,17 @@
+# backend/app/schemas/bootstrap.py
+
+from pydantic import BaseModel
+from typing import List, Optional
+
+from .participant import Participant
+from .student import Student
+from .vote import VoteOutSimple
+
+
+# /bootstrap cevabı: frontend'in açılışta ihtiyaç duyduğu her şey tek istekte
+class Bootstrap(BaseModel):
+    student: Student
+    worlds: List[Participant] # Kataloğun ilk sayfası (id sırasıyla)
+    next_cursor: Optional[str] = None # Sonraki sayfa için /worlds?cursor=...
+    my_votes: List[VoteOutSimple]
+    top: List[Participant] # Skor tablosu
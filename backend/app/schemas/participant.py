@@ -19,4 +19,26 @@ class Participant(ParticipantBase):
     updated_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# /worlds?fields=... ile istenen alanların (projection) çıktısı.
+# Sadece istenen alanlar döner: api/endpoints/participants.py listeyi
+# dump_json(exclude_unset=True) ile kendisi serileştirir; OpenAPI'deki
+# response_model tam Participant şeması olarak kalır.
+class ParticipantFields(BaseModel):
+    id: Optional[int] = None
+    serial_number: Optional[str] = None
+    video_url: Optional[str] = None
+    like_count: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+# Bir dünyanın skor tablosundaki sırası (1'den başlar)
+class ParticipantRank(BaseModel):
+    participant_id: int
+    rank: int
+    like_count: int
+    total: int
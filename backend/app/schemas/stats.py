@@ -0,0 +1,41 @@
+# backend/app/schemas/stats.py
+
+from datetime import datetime
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+# Eşit aralıklı oy zaman serisi (boş kovalar 0). buckets[i] kovanın başlangıcıdır (UTC).
+class VoteSeries(BaseModel):
+    interval_seconds: int
+    buckets: List[datetime]
+    added: List[int] # Kovada verilen oylar
+    removed: List[int] # Kovada geri alınan oylar
+    net: List[int] # added - removed
+    cumulative: List[int] # Kova sonundaki toplam oy (serinin öncesi dahil)
+
+
+# /stats/worlds/{id}/timeline cevabı. as_of: kovaların güncel olduğu an (toplama
+# işinin watermark'ı); sonrasındaki oylar henüz seride yoktur.
+class VoteTimeline(VoteSeries):
+    participant_id: int
+    as_of: Optional[datetime] = None
+
+
+# Bir dünyanın bir aralıktaki oyları
+class WorldVoteActivity(BaseModel):
+    participant_id: int
+    added: int
+    removed: int
+
+
+# /stats/overview cevabı: tüm dünyaların toplamı
+class StatsOverview(BaseModel):
+    as_of: Optional[datetime] = None
+    total_added: int
+    total_removed: int
+    total_votes: int # total_added - total_removed
+    votes_per_minute: float # Son bir saatin ortalaması (verilen oylar)
+    last_hour: VoteSeries # Dakikalık
+    last_day: VoteSeries # Saatlik
+    top_last_hour: List[WorldVoteActivity] # Son bir saatte en çok oy alan dünyalar
@@ -0,0 +1,101 @@
+# backend/scripts/bench_async_db.py
+# Tek uvicorn worker'ı üzerinde eşzamanlı /worlds ve /votes trafiğinin throughput'unu ölçer.
+#
+# Önce/sonra karşılaştırması için eski commit'i ayrı bir dizine alıp --baseline-dir verin:
+#   git worktree add /tmp/mcworlds-baseline <eski-commit>
+#   python scripts/bench_async_db.py --baseline-dir /tmp/mcworlds-baseline/backend
+#
+# DATABASE_URL yerel (test) veritabanını göstermelidir; script bench öğrencileri oluşturur.
+
+import argparse
+import asyncio
+import itertools
+import os
+import sys
+import time
+
+import httpx
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+from benchlib import (  # noqa: E402
+    API_PREFIX, PROJECT_ROOT, EndpointStats, ServerProcess, login,
+    print_summary_table, seed_bench_participants, seed_bench_students,
+)
+
+
+async def _browse_worker(client: httpx.AsyncClient, stats: EndpointStats, stop_at: float):
+    while time.perf_counter() < stop_at:
+        started = time.perf_counter()
+        try:
+            response = await client.get(f"{API_PREFIX}/worlds")
+            stats.record(response.status_code, (time.perf_counter() - started) * 1000, response.status_code == 200)
+        except httpx.HTTPError:
+            stats.record(0, (time.perf_counter() - started) * 1000, ok=False)
+
+
+async def _vote_worker(client: httpx.AsyncClient, token: str, participant_ids, stats: EndpointStats, stop_at: float):
+    headers = {"Authorization": f"Bearer {token}"}
+    # Aynı dünyaya art arda tıklamak oy ver/geri al döngüsü üretir
+    for participant_id in itertools.cycle(participant_ids):
+        if time.perf_counter() >= stop_at:
+            break
+        started = time.perf_counter()
+        try:
+            response = await client.post(
+                f"{API_PREFIX}/votes", json={"participant_id": participant_id}, headers=headers
+            )
+            # 400 (oy limiti) beklenen bir iş kuralı cevabıdır, hata sayılmaz
+            ok = response.status_code in (200, 400)
+            stats.record(response.status_code, (time.perf_counter() - started) * 1000, ok)
+        except httpx.HTTPError:
+            stats.record(0, (time.perf_counter() - started) * 1000, ok=False)
+
+
+async def run_load(base_url: str, emails, browse_concurrency: int, duration: float) -> dict:
+    limits = httpx.Limits(max_connections=browse_concurrency + len(emails) + 10)
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0, limits=limits) as client:
+        tokens = [await login(client, email) for email in emails]
+        worlds = (await client.get(f"{API_PREFIX}/worlds")).json()
+        participant_ids = [w["id"] for w in worlds[:3]] or [1]
+
+        worlds_stats, votes_stats = EndpointStats(), EndpointStats()
+        started = time.perf_counter()
+        stop_at = started + duration
+        await asyncio.gather(
+            *(_browse_worker(client, worlds_stats, stop_at) for _ in range(browse_concurrency)),
+            *(_vote_worker(client, token, participant_ids, votes_stats, stop_at) for token in tokens),
+        )
+        elapsed = time.perf_counter() - started
+    return {
+        "GET /worlds": worlds_stats.summary(elapsed),
+        "POST /votes": votes_stats.summary(elapsed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tek worker üzerinde /worlds ve /votes eşzamanlı throughput ölçümü.")
+    parser.add_argument("--students", type=int, default=50, help="Eşzamanlı oy veren öğrenci sayısı (varsayılan: 50)")
+    parser.add_argument("--browsers", type=int, default=50, help="Eşzamanlı /worlds isteği atan istemci sayısı (varsayılan: 50)")
+    parser.add_argument("--duration", type=float, default=15.0, help="Her ölçümün süresi, saniye (varsayılan: 15)")
+    parser.add_argument("--participants", type=int, default=100, help="Tablo boşsa oluşturulacak dünya sayısı (varsayılan: 100)")
+    parser.add_argument("--baseline-dir", help="Karşılaştırma için eski commit'in backend dizini (git worktree)")
+    args = parser.parse_args()
+
+    seed_bench_participants(args.participants)
+    emails = seed_bench_students(args.students)
+
+    runs = []
+    if args.baseline_dir:
+        runs.append(("önce", args.baseline_dir))
+    runs.append(("sonra" if args.baseline_dir else "mevcut", PROJECT_ROOT))
+
+    for label, app_dir in runs:
+        with ServerProcess(app_dir=app_dir, workers=1) as server:
+            summaries = asyncio.run(run_load(server.base_url, emails, args.browsers, args.duration))
+        print_summary_table(f"{label} ({app_dir})", summaries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# backend/scripts/bench_export.py
+# Dışa aktarımın (scripts/export_results.py) bellek kullanımının satır sayısından
+# bağımsız kaldığını ölçer. Tek bir transaction içinde sentetik öğrenciler ve
+# oylar eklenir (generate_series), ballots veri seti her biçimde /dev/null'a
+# aktarılır ve transaction geri alınır; veritabanında iz kalmaz. Karşılaştırma
+# için tüm satırları tek seferde okuyan (.all()) yolun tepe belleği de yazılır.
+# Bellek tracemalloc ile ölçülür (Python nesneleri).
+#
+#   python scripts/bench_export.py --votes 1000000
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+from sqlalchemy import text
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from export_results import export  # noqa: E402
+from app.core.export import EXPORT_FORMATS  # noqa: E402
+from app.crud.crud_export import EXPORT_BALLOTS, EXPORT_DATASETS  # noqa: E402
+from app.db.database import SessionLocal  # noqa: E402
+
+# Her sentetik öğrenci iki dünyaya oy verir (oy limiti)
+_SEED_SQL = [
+    text("""
+    INSERT INTO students (email, hashed_password, full_name)
+    SELECT 'export-bench-' || i || '@bench.example.com', 'x', 'Export Bench ' || i
+    FROM generate_series(1, :students) AS i
+    """),
+    text("""
+    INSERT INTO votes (student_id, participant_id)
+    SELECT s.id, p.id
+    FROM students s
+    CROSS JOIN LATERAL (SELECT id FROM participants ORDER BY id LIMIT 2) p
+    WHERE s.email LIKE 'export-bench-%'
+    """),
+]
+
+
+def _measure(func):
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        result = func()
+    finally:
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return result, elapsed, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dışa aktarım bellek/throughput ölçümü")
+    parser.add_argument("--votes", type=int, default=200_000, help="Eklenecek sentetik oy sayısı (yaklaşık)")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        print(f"{args.votes} sentetik oy ekleniyor (transaction sonunda geri alınır)...")
+        for statement in _SEED_SQL:
+            db.execute(statement, {"students": args.votes // 2})
+        try:
+            print(f"\n{'yol':<24}{'satır':>10}{'süre (sn)':>12}{'satır/sn':>12}{'tepe bellek (MiB)':>20}")
+            with open(os.devnull, "wb") as devnull:
+                for export_format in EXPORT_FORMATS:
+                    (rows, _), elapsed, peak = _measure(
+                        lambda: export(db, EXPORT_BALLOTS, export_format, devnull, args.chunk_size)
+                    )
+                    print(f"{'stream ' + export_format:<24}{rows:>10}{elapsed:>12.2f}{rows / elapsed:>12.0f}{peak:>20.1f}")
+
+            all_rows, elapsed, peak = _measure(lambda: db.execute(EXPORT_DATASETS[EXPORT_BALLOTS][0]()).all())
+            print(f"{'.all() (karşılaştırma)':<24}{len(all_rows):>10}{elapsed:>12.2f}{len(all_rows) / elapsed:>12.0f}{peak:>20.1f}")
+        finally:
+            db.rollback()
+
+
+if __name__ == "__main__":
+    main()
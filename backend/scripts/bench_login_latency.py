@@ -0,0 +1,92 @@
+# backend/scripts/bench_login_latency.py
+# "Zil çaldı, bütün sınıf aynı anda giriş yapıyor" senaryosu: arka planda sürekli
+# /worlds trafiği varken dalgalar halinde eşzamanlı login gönderir ve hem login'in
+# hem de /worlds'ün p50/p99 gecikmesini raporlar.
+#
+# Önce/sonra karşılaştırması için:
+#   git worktree add /tmp/mcworlds-baseline <eski-commit>
+#   python scripts/bench_login_latency.py --baseline-dir /tmp/mcworlds-baseline/backend
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+from benchlib import (  # noqa: E402
+    API_PREFIX, BENCH_PASSWORD, PROJECT_ROOT, EndpointStats, ServerProcess,
+    print_summary_table, seed_bench_participants, seed_bench_students,
+)
+
+
+async def _browse_worker(client: httpx.AsyncClient, stats: EndpointStats, stop: asyncio.Event):
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            response = await client.get(f"{API_PREFIX}/worlds")
+            stats.record(response.status_code, (time.perf_counter() - started) * 1000, response.status_code == 200)
+        except httpx.HTTPError:
+            stats.record(0, (time.perf_counter() - started) * 1000, ok=False)
+
+
+async def _login_once(client: httpx.AsyncClient, email: str, stats: EndpointStats):
+    started = time.perf_counter()
+    try:
+        response = await client.post(
+            f"{API_PREFIX}/auth/login", data={"username": email, "password": BENCH_PASSWORD}
+        )
+        # 503 hızlı reddetmedir (admission control); hata olarak sayılır ama gecikmesi de kaydedilir
+        stats.record(response.status_code, (time.perf_counter() - started) * 1000, response.status_code == 200)
+    except httpx.HTTPError:
+        stats.record(0, (time.perf_counter() - started) * 1000, ok=False)
+
+
+async def run_load(base_url: str, emails, browsers: int, waves: int, wave_gap: float) -> dict:
+    limits = httpx.Limits(max_connections=browsers + len(emails) + 10)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0, limits=limits) as client:
+        worlds_stats, login_stats = EndpointStats(), EndpointStats()
+        stop = asyncio.Event()
+        browse_tasks = [asyncio.create_task(_browse_worker(client, worlds_stats, stop)) for _ in range(browsers)]
+        started = time.perf_counter()
+        for _ in range(waves):
+            await asyncio.gather(*(_login_once(client, email, login_stats) for email in emails))
+            await asyncio.sleep(wave_gap)
+        stop.set()
+        await asyncio.gather(*browse_tasks)
+        elapsed = time.perf_counter() - started
+    return {
+        "POST /auth/login": login_stats.summary(elapsed),
+        "GET /worlds (eşzamanlı)": worlds_stats.summary(elapsed),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Eşzamanlı /worlds trafiği altında login p99 gecikmesini ölçer.")
+    parser.add_argument("--class-size", type=int, default=30, help="Bir dalgada aynı anda giriş yapan öğrenci sayısı (varsayılan: 30)")
+    parser.add_argument("--waves", type=int, default=5, help="Login dalgası sayısı (varsayılan: 5)")
+    parser.add_argument("--wave-gap", type=float, default=1.0, help="Dalgalar arası bekleme, saniye (varsayılan: 1)")
+    parser.add_argument("--browsers", type=int, default=20, help="Sürekli /worlds isteyen istemci sayısı (varsayılan: 20)")
+    parser.add_argument("--baseline-dir", help="Karşılaştırma için eski commit'in backend dizini (git worktree)")
+    args = parser.parse_args()
+
+    seed_bench_participants(100)
+    emails = seed_bench_students(args.class_size)
+
+    runs = []
+    if args.baseline_dir:
+        runs.append(("önce", args.baseline_dir))
+    runs.append(("sonra" if args.baseline_dir else "mevcut", PROJECT_ROOT))
+
+    for label, app_dir in runs:
+        with ServerProcess(app_dir=app_dir, workers=1) as server:
+            summaries = asyncio.run(run_load(server.base_url, emails, args.browsers, args.waves, args.wave_gap))
+        print_summary_table(f"{label} ({app_dir})", summaries)
+
+
+if __name__ == "__main__":
+    main()
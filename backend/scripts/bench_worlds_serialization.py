@@ -0,0 +1,149 @@
+# backend/scripts/bench_worlds_serialization.py
+# GET /worlds cevabının üretim maliyetini ölçer.
+#
+# 1) Süreç içi mikro benchmark (DB gerekmez): N sahte satır için
+#    - response_model yolu (model_validate + FastAPI serialize_response + JSONResponse),
+#    - hızlı yol, önbellek ıskası (TypeAdapter doğrula + dump_json),
+#    - hızlı yol, önbellek isabeti (hazır byte'lar)
+#    saniyede kaç cevap üretilebildiğini yazar.
+# 2) --http verilirse tek worker'lı sunucuya karşı GET /worlds throughput'u;
+#    --baseline-dir ile eski commit (response_model yolu) ile karşılaştırılır:
+#      git worktree add /tmp/mcworlds-baseline <eski-commit>
+#      python scripts/bench_worlds_serialization.py --http --baseline-dir /tmp/mcworlds-baseline/backend
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import List
+
+import httpx
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+sys.path.insert(0, os.path.dirname(SCRIPT_DIR))
+
+from benchlib import (  # noqa: E402
+    API_PREFIX, PROJECT_ROOT, EndpointStats, ServerProcess, print_summary_table, seed_bench_participants,
+)
+
+
+def _fake_rows(count: int):
+    now = datetime.now(timezone.utc)
+    return [
+        SimpleNamespace(
+            id=i + 1,
+            serial_number=f"MCWorld-{i:05d}",
+            video_url=f"https://cdn.example/worlds/{i}.mp4",
+            like_count=(i * 7) % 113,
+            created_at=now - timedelta(days=1),
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def _ops_per_second(func, duration: float) -> float:
+    iterations = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < duration:
+        func()
+        iterations += 1
+    return iterations / (time.perf_counter() - started)
+
+
+def run_micro(rows_count: int, duration: float):
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from pydantic import TypeAdapter
+
+    from app import schemas
+    from app.core.response_cache import VersionedResponseCache
+
+    rows = _fake_rows(rows_count)
+    adapter = TypeAdapter(List[schemas.Participant])
+    # FastAPI'nin /worlds için kullandığı response alanı
+    from app.main import app
+    route = next(r for r in app.routes if getattr(r, "path", None) == f"{API_PREFIX}/worlds")
+    loop = asyncio.new_event_loop()
+
+    def response_model_path():
+        items = [schemas.Participant.model_validate(row) for row in rows]
+        content = loop.run_until_complete(serialize_response(
+            field=route.response_field, response_content=items, is_coroutine=True,
+        ))
+        return JSONResponse(content).body
+
+    def fast_path_miss():
+        return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+    cache = VersionedResponseCache(max_entries=16)
+    cache.put(1, ("worlds", ()), fast_path_miss(), {})
+
+    def fast_path_hit():
+        return cache.get(1, ("worlds", ()))[0]
+
+    assert response_model_path() == fast_path_miss(), "Hızlı yol farklı JSON üretiyor"
+
+    print(f"\n--- Süreç içi: {rows_count} satırlık /worlds cevabı ---")
+    baseline = None
+    for name, func in (
+        ("response_model yolu", response_model_path),
+        ("hızlı yol (ıska)", fast_path_miss),
+        ("hızlı yol (isabet)", fast_path_hit),
+    ):
+        ops = _ops_per_second(func, duration)
+        baseline = baseline or ops
+        print(f"{name:<24}{ops:>14.0f} cevap/sn{ops / baseline:>10.1f}x")
+    loop.close()
+
+
+async def _browse_worker(client: httpx.AsyncClient, path: str, stats: EndpointStats, stop_at: float):
+    while time.perf_counter() < stop_at:
+        started = time.perf_counter()
+        try:
+            response = await client.get(path)
+            stats.record(response.status_code, (time.perf_counter() - started) * 1000, response.status_code == 200)
+        except httpx.HTTPError:
+            stats.record(0, (time.perf_counter() - started) * 1000, ok=False)
+
+
+async def run_http_load(base_url: str, limit: int, concurrency: int, duration: float) -> dict:
+    path = f"{API_PREFIX}/worlds?limit={limit}"
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0,
+                                 limits=httpx.Limits(max_connections=concurrency + 5)) as client:
+        stats = EndpointStats()
+        started = time.perf_counter()
+        await asyncio.gather(*(_browse_worker(client, path, stats, started + duration) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return {f"GET /worlds?limit={limit}": stats.summary(elapsed)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/worlds cevap üretimi: response_model yolu ve hazır JSON yolu.")
+    parser.add_argument("--rows", type=int, default=300, help="Cevaptaki dünya sayısı (varsayılan: 300)")
+    parser.add_argument("--duration", type=float, default=3.0, help="Her ölçümün süresi, saniye (varsayılan: 3)")
+    parser.add_argument("--http", action="store_true", help="Sunucu üzerinden uçtan uca throughput da ölç")
+    parser.add_argument("--concurrency", type=int, default=20, help="HTTP ölçümünde eşzamanlı istemci (varsayılan: 20)")
+    parser.add_argument("--baseline-dir", help="HTTP karşılaştırması için eski commit'in backend dizini (git worktree)")
+    args = parser.parse_args()
+
+    run_micro(args.rows, args.duration)
+
+    if args.http:
+        seed_bench_participants(args.rows)
+        runs = []
+        if args.baseline_dir:
+            runs.append(("önce", args.baseline_dir))
+        runs.append(("sonra" if args.baseline_dir else "mevcut", PROJECT_ROOT))
+        for label, app_dir in runs:
+            with ServerProcess(app_dir=app_dir, workers=1) as server:
+                summaries = asyncio.run(run_http_load(server.base_url, args.rows, args.concurrency, args.duration))
+            print_summary_table(f"{label} ({app_dir})", summaries)
+
+
+if __name__ == "__main__":
+    main()
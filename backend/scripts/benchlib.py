@@ -0,0 +1,187 @@
+# backend/scripts/benchlib.py
+# Benchmark script'lerinin ortak yardımcıları (sunucu başlatma, öğrenci seed'leme,
+# gecikme istatistikleri). Doğrudan çalıştırılmaz; bench_*.py script'leri import eder.
+
+import os
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import httpx
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+API_PREFIX = "/api/v1"
+BENCH_EMAIL_TEMPLATE = "bench{index}@bench.example.com"
+BENCH_PASSWORD = "bench-password"
+
+
+# Sıralı listeden yüzdelik değer (nearest-rank)
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+@dataclass
+class EndpointStats:
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: int = 0
+    status_counts: Dict[int, int] = field(default_factory=dict)
+    # Sunucu DB_QUERY_COUNT_HEADER ile çalışıyorsa cevap başlıklarından okunur
+    db_queries: List[int] = field(default_factory=list)
+    db_time_ms: List[float] = field(default_factory=list)
+
+    def record(self, status_code: int, elapsed_ms: float, ok: bool = True):
+        self.latencies_ms.append(elapsed_ms)
+        self.status_counts[status_code] = self.status_counts.get(status_code, 0) + 1
+        if not ok:
+            self.errors += 1
+
+    # X-DB-Query-Count / X-DB-Time-Ms başlıklarını (varsa) kaydeder
+    def record_db(self, headers):
+        count = headers.get("x-db-query-count")
+        if count is not None:
+            self.db_queries.append(int(count))
+            self.db_time_ms.append(float(headers.get("x-db-time-ms", 0)))
+
+    def summary(self, duration_s: float) -> dict:
+        values = sorted(self.latencies_ms)
+        count = len(values)
+        summary = {
+            "requests": count,
+            "errors": self.errors,
+            "error_rate": (self.errors / count) if count else 0.0,
+            "throughput_rps": (count / duration_s) if duration_s > 0 else 0.0,
+            "p50_ms": percentile(values, 50),
+            "p95_ms": percentile(values, 95),
+            "p99_ms": percentile(values, 99),
+            "max_ms": values[-1] if values else 0.0,
+            "status_counts": {str(k): v for k, v in sorted(self.status_counts.items())},
+        }
+        if self.db_queries:
+            queries = sorted(self.db_queries)
+            summary["db_queries_avg"] = sum(queries) / len(queries)
+            summary["db_queries_max"] = queries[-1]
+            summary["db_time_ms_avg"] = sum(self.db_time_ms) / len(self.db_time_ms)
+        return summary
+
+
+# Sonuçları okunabilir tablo olarak yazdır
+def print_summary_table(title: str, summaries: Dict[str, dict]):
+    print(f"\n--- {title} ---")
+    print(f"{'endpoint':<28}{'req':>8}{'rps':>10}{'p50':>9}{'p95':>9}{'p99':>9}{'err%':>8}")
+    for name, s in summaries.items():
+        print(
+            f"{name:<28}{s['requests']:>8}{s['throughput_rps']:>10.1f}"
+            f"{s['p50_ms']:>9.1f}{s['p95_ms']:>9.1f}{s['p99_ms']:>9.1f}{s['error_rate'] * 100:>8.2f}"
+        )
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# app.main:app'i tek worker'lı bir uvicorn sürecinde başlatır.
+# app_dir farklı bir commit'in checkout'u (git worktree) olabilir; böylece
+# aynı script ile "önce/sonra" ölçümü yapılır.
+class ServerProcess:
+    def __init__(self, app_dir: str = PROJECT_ROOT, workers: int = 1,
+                 extra_env: Optional[Dict[str, str]] = None):
+        self.app_dir = app_dir
+        self.workers = workers
+        self.port = _free_port()
+        self.extra_env = extra_env or {}
+        self.process: Optional[subprocess.Popen] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        env = dict(os.environ)
+        env.update(self.extra_env)
+        cmd = [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(self.port),
+            "--workers", str(self.workers), "--log-level", "warning",
+        ]
+        self.process = subprocess.Popen(cmd, cwd=self.app_dir, env=env)
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Sunucu başlatılamadı (exit code {self.process.returncode})")
+            try:
+                if httpx.get(self.base_url + "/", timeout=1.0).status_code < 500:
+                    return self
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.2)
+        self.__exit__(None, None, None)
+        raise RuntimeError("Sunucu 60 saniye içinde hazır olmadı")
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+# Benchmark için bilinen şifreyle N öğrenci oluşturur (varsa dokunmaz).
+# Tek bir hash üretilip tüm öğrencilere yazılır; bcrypt maliyeti bir kez ödenir.
+def seed_bench_students(count: int, password: str = BENCH_PASSWORD) -> List[str]:
+    sys.path.insert(0, PROJECT_ROOT)
+    from sqlalchemy import select
+    from app.core.security import get_password_hash
+    from app.db.database import SessionLocal
+    from app.models.student import Student
+
+    emails = [BENCH_EMAIL_TEMPLATE.format(index=i) for i in range(count)]
+    hashed = get_password_hash(password)
+    db = SessionLocal()
+    try:
+        existing = set(db.execute(select(Student.email).where(Student.email.in_(emails))).scalars())
+        db.add_all(
+            Student(email=email, hashed_password=hashed, full_name=f"Bench {email}")
+            for email in emails if email not in existing
+        )
+        db.commit()
+    finally:
+        db.close()
+    return emails
+
+
+# Katılımcı tablosu boşsa benchmark için örnek dünyalar ekler
+def seed_bench_participants(count: int) -> None:
+    sys.path.insert(0, PROJECT_ROOT)
+    from sqlalchemy import func, select
+    from app.db.database import SessionLocal
+    from app.models.participant import Participant
+
+    db = SessionLocal()
+    try:
+        existing = db.execute(select(func.count()).select_from(Participant)).scalar_one()
+        db.add_all(
+            Participant(serial_number=f"BENCH-{i:05d}", video_url=f"https://cdn.example/bench/{i}.mp4")
+            for i in range(existing, count)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str = BENCH_PASSWORD) -> str:
+    response = await client.post(
+        f"{API_PREFIX}/auth/login", data={"username": email, "password": password}
+    )
+    response.raise_for_status()
+    return response.json()["access_token"]
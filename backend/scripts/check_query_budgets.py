@@ -0,0 +1,101 @@
+# backend/scripts/check_query_budgets.py
+# Endpoint başına sorgu bütçesini doğrular (bkz. app/db/profiler.py query_budget).
+# Uygulama process içinde (httpx ASGITransport, lifespan dahil) yerel (test)
+# veritabanına karşı çalıştırılır; her endpoint'in çalıştırdığı sorgu sayısı
+# aşağıdaki BUDGETS tablosuyla birebir karşılaştırılır. Ölçüm soğuk yol içindir:
+# her istekten önce hazır JSON önbelleği boşaltılır ve katalog sürümü yeniden
+# okunur. Bir endpoint'e sorgu eklendiyse/çıkarıldıysa script sorguları ve
+# çağrı yerlerini yazdırıp 1 ile çıkar; bilinçli değişiklikte tabloyu güncelleyin.
+#
+#   python scripts/check_query_budgets.py
+
+import asyncio
+import os
+import sys
+
+import httpx
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from benchlib import API_PREFIX, BENCH_PASSWORD, seed_bench_participants, seed_bench_students  # noqa: E402
+from app.core.catalog_version import catalog_version  # noqa: E402
+from app.core.principal_cache import principal_cache  # noqa: E402
+from app.core.response_cache import catalog_response_cache  # noqa: E402
+from app.core.vote_stats import stats_response_cache  # noqa: E402
+from app.db.profiler import QueryBudgetExceeded, query_budget  # noqa: E402
+from app.main import app  # noqa: E402
+
+# (ad, method, yol, beklenen sorgu sayısı); {id}, {id2}, {id3} ilk dünyaların id'leri ile doldurulur
+BUDGETS = [
+    ("login", "POST", "/auth/login", 1),
+    ("worlds", "GET", "/worlds?limit=20", 2),
+    ("worlds (like_count, fields)", "GET", "/worlds?limit=20&order_by=like_count&fields=id,like_count", 2),
+    ("worlds/top5", "GET", "/worlds/top5", 0),
+    ("worlds/{id}", "GET", "/worlds/{id}", 2),
+    ("worlds/{id}/rank", "GET", "/worlds/{id}/rank", 0),
+    ("worlds/batch", "GET", "/worlds/batch?ids={id},{id2},{id3}", 2),
+    ("votes (oy ver)", "POST", "/votes", 2),
+    ("votes (geri al)", "POST", "/votes", 2),
+    ("votes/my-votes", "GET", "/votes/my-votes", 1),
+    ("votes/my-votes (token önbellekte değil)", "GET", "/votes/my-votes", 2),
+    ("bootstrap", "GET", "/bootstrap", 3),
+    ("bootstrap (token önbellekte değil)", "GET", "/bootstrap", 4),
+    ("stats/worlds/{id}/timeline", "GET", "/stats/worlds/{id}/timeline", 4),
+    ("stats/worlds/{id}/timeline (1d)", "GET", "/stats/worlds/{id}/timeline?interval=1d&hours=168", 4),
+    ("stats/overview", "GET", "/stats/overview", 5),
+]
+
+
+async def _reset_votes(client: httpx.AsyncClient, headers: dict):
+    response = await client.get(f"{API_PREFIX}/votes/my-votes", headers=headers)
+    for vote in response.json():
+        await client.post(f"{API_PREFIX}/votes", json={"participant_id": vote["participant_id"]}, headers=headers)
+
+
+async def check_budgets(email: str) -> int:
+    failures = 0
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://check") as client:
+            login = await client.post(f"{API_PREFIX}/auth/login", data={"username": email, "password": BENCH_PASSWORD})
+            headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+            await _reset_votes(client, headers)
+            world_ids = [world["id"] for world in (await client.get(f"{API_PREFIX}/worlds?limit=3")).json()]
+            world_id = world_ids[0]
+
+            for name, method, path, expected in BUDGETS:
+                kwargs = {"headers": headers}
+                if path == "/auth/login":
+                    kwargs = {"data": {"username": email, "password": BENCH_PASSWORD}}
+                elif path == "/votes":
+                    kwargs["json"] = {"participant_id": world_id}
+                if "token önbellekte değil" in name:
+                    principal_cache.clear()
+                catalog_response_cache.clear()
+                stats_response_cache.clear()
+                catalog_version.mark_stale()
+                try:
+                    with query_budget(expected) as profile:
+                        response = await client.request(method, API_PREFIX + path.format(id=world_id, id2=world_ids[1], id3=world_ids[2]), **kwargs)
+                    print(f"OK   {name:<44} {profile.count} sorgu (HTTP {response.status_code})")
+                except QueryBudgetExceeded as e:
+                    failures += 1
+                    print(f"FAIL {name:<44} {e}")
+    return failures
+
+
+def main():
+    seed_bench_participants(20)
+    email = seed_bench_students(1)[0]
+    failures = asyncio.run(check_budgets(email))
+    if failures:
+        print(f"\n{failures} endpoint sorgu bütçesini tutmuyor.")
+        sys.exit(1)
+    print("\nTüm endpoint'ler sorgu bütçesi içinde.")
+
+
+if __name__ == "__main__":
+    main()
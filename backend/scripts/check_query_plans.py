@@ -0,0 +1,179 @@
+# backend/scripts/check_query_plans.py
+# Sıcak CRUD sorgularının indeks kullandığını doğrular. Yerel (test) veritabanında:
+#   1. bekleyen migration'ları uygular, örnek veri ekler ve ANALYZE çalıştırır,
+#   2. her sıcak CRUD fonksiyonunu gerçek parametrelerle çağırıp gönderdiği SQL'i yakalar
+#      (yazan sorgular dahil; her şey tek transaction'da yapılıp geri alınır),
+#   3. yakalanan her statement için EXPLAIN (FORMAT JSON) alır.
+# enable_seqscan=off ile çalışılır: küçük tablolarda planlayıcı sıralı taramayı
+# seçebileceği için, bu ayarla "Seq Scan" ancak kullanılabilir bir indeks yoksa
+# kalır. Herhangi bir planda Seq Scan varsa script 1 ile çıkar.
+#
+#   python scripts/check_query_plans.py
+
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from sqlalchemy import event, text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+
+from benchlib import seed_bench_participants, seed_bench_students  # noqa: E402
+from app import crud  # noqa: E402
+from app.core.vote_buffer import _FLUSH_SQL  # noqa: E402
+from app.db.database import SessionLocal, async_engine  # noqa: E402
+from app.db.migrate import apply_migrations  # noqa: E402
+
+
+def _plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def _describe(plan: dict) -> str:
+    parts = []
+    for node in _plan_nodes(plan):
+        if "Index Name" in node:
+            parts.append(f"{node['Node Type']}({node['Index Name']})")
+        elif node["Node Type"] == "Seq Scan":
+            parts.append(f"Seq Scan({node['Relation Name']})")
+    return ", ".join(dict.fromkeys(parts)) or plan["Node Type"]
+
+
+async def _hot_queries(db: AsyncSession, ids: dict):
+    student_id, participant_id = ids["student_id"], ids["participant_id"]
+    day_end = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    day_start = day_end - timedelta(days=1)
+    return [
+        ("crud_participant_async.get_participant",
+         crud.crud_participant_async.get_participant(db, participant_id=participant_id)),
+        ("crud_participant_async.get_participants_by_ids",
+         crud.crud_participant_async.get_participants_by_ids(db, [participant_id, ids["other_participant_id"]])),
+        ("crud_participant_async.get_participant_by_serial_number",
+         crud.crud_participant_async.get_participant_by_serial_number(db, serial_number=ids["serial_number"])),
+        ("crud_participant_async.get_participants_top5",
+         crud.crud_participant_async.get_participants_top5(db)),
+        ("crud_participant_async.get_participants_keyset (id)",
+         crud.crud_participant_async.get_participants_keyset(db, limit=20, order_by="id", after=(participant_id,))),
+        ("crud_participant_async.get_participants_keyset (like_count)",
+         crud.crud_participant_async.get_participants_keyset(
+             db, limit=20, order_by="like_count", after=(ids["like_count"], participant_id),
+             columns=["id", "serial_number", "video_url", "like_count"])),
+        ("crud_student_async.get_student",
+         crud.crud_student_async.get_student(db, student_id=student_id)),
+        ("crud_student_async.get_student_by_email",
+         crud.crud_student_async.get_student_by_email(db, email=ids["email"])),
+        ("crud_vote_async.get_votes_by_student",
+         crud.crud_vote_async.get_votes_by_student(db, student_id=student_id)),
+        ("crud_vote_async.get_voted_participant_ids",
+         crud.crud_vote_async.get_voted_participant_ids(db, student_id=student_id)),
+        ("crud_vote_async.get_vote_by_student_and_participant",
+         crud.crud_vote_async.get_vote_by_student_and_participant(
+             db, student_id=student_id, participant_id=participant_id)),
+        ("crud_vote_async.toggle_vote",
+         crud.crud_vote_async.toggle_vote(db, student_id=student_id, participant_id=participant_id, max_votes=2)),
+        ("crud_vote_async.toggle_vote (shards)",
+         crud.crud_vote_async.toggle_vote(
+             db, student_id=student_id, participant_id=participant_id, max_votes=2, shards=8)),
+        ("crud_like_shards.roll_up_like_shards",
+         crud.crud_like_shards.roll_up_like_shards(db)),
+        ("crud_participant_async.get_all_participants",
+         crud.crud_participant_async.get_all_participants(db)),
+        ("crud_vote_stats.roll_up_vote_stats",
+         crud.crud_vote_stats.roll_up_vote_stats(db)),
+        ("crud_vote_stats.get_participant_buckets",
+         crud.crud_vote_stats.get_participant_buckets(db, participant_id, 60, day_start, day_end)),
+        ("crud_vote_stats.get_totals_before (dünya)",
+         crud.crud_vote_stats.get_totals_before(db, day_end - timedelta(minutes=30), participant_id=participant_id)),
+        ("crud_vote_stats.get_totals_before",
+         crud.crud_vote_stats.get_totals_before(db, day_start)),
+        ("crud_vote_stats.get_total_buckets",
+         crud.crud_vote_stats.get_total_buckets(db, 3600, day_start, day_end)),
+        ("crud_vote_stats.get_top_participants",
+         crud.crud_vote_stats.get_top_participants(db, day_end - timedelta(hours=1), day_end, 5)),
+        ("vote_buffer flush",
+         db.execute(_FLUSH_SQL, {
+             "add_students": [student_id], "add_participants": [ids["other_participant_id"]],
+             "remove_students": [student_id], "remove_participants": [participant_id],
+         })),
+    ]
+
+
+async def check_plans(ids: dict) -> int:
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith(("EXPLAIN", "SET ", "SAVEPOINT", "RELEASE", "ROLLBACK")):
+            captured.append((statement, parameters))
+
+    failures = 0
+    async with async_engine.connect() as conn:
+        transaction = await conn.begin()
+        await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        # Session dış transaction'a katılır; crud içindeki commit'ler savepoint olur
+        db = AsyncSession(bind=conn, join_transaction_mode="create_savepoint")
+        event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+        try:
+            for name, call in await _hot_queries(db, ids):
+                captured.clear()
+                await call
+                statements = list(captured)
+                captured.clear()
+                for index, (statement, parameters) in enumerate(statements, start=1):
+                    result = await conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters)
+                    plan = result.scalar_one()[0]["Plan"]
+                    seq_scans = [n["Relation Name"] for n in _plan_nodes(plan) if n["Node Type"] == "Seq Scan"]
+                    label = name if len(statements) == 1 else f"{name} [{index}/{len(statements)}]"
+                    status = "OK  " if not seq_scans else "FAIL"
+                    failures += bool(seq_scans)
+                    print(f"{status} {label:<62} {_describe(plan)}")
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+            await db.close()
+            await transaction.rollback()
+    await async_engine.dispose()
+    return failures
+
+
+def prepare() -> dict:
+    apply_migrations()
+    seed_bench_participants(200)
+    emails = seed_bench_students(20)
+    with SessionLocal() as db:
+        for table in ("participants", "students", "votes", "vote_deletions", "vote_stats_minute", "vote_stats_hour"):
+            db.execute(text(f"ANALYZE {table}"))
+        participant = db.execute(
+            text("SELECT id, serial_number, like_count FROM participants ORDER BY like_count DESC, id LIMIT 1 OFFSET 3")
+        ).one()
+        other_participant_id = db.execute(
+            text("SELECT id FROM participants WHERE id <> :id ORDER BY id LIMIT 1"), {"id": participant.id}
+        ).scalar_one()
+        student_id = db.execute(text("SELECT id FROM students WHERE email = :email"), {"email": emails[0]}).scalar_one()
+        db.commit()
+    return {
+        "student_id": student_id,
+        "email": emails[0],
+        "participant_id": participant.id,
+        "serial_number": participant.serial_number,
+        "like_count": participant.like_count,
+        "other_participant_id": other_participant_id,
+    }
+
+
+def main():
+    ids = prepare()
+    failures = asyncio.run(check_plans(ids))
+    if failures:
+        print(f"\n{failures} statement sıralı taramaya (Seq Scan) düşüyor; eksik indeksleri kontrol edin.")
+        sys.exit(1)
+    print("\nTüm sıcak sorgular indeks kullanıyor.")
+
+
+if __name__ == "__main__":
+    main()
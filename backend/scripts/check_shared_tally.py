@@ -0,0 +1,153 @@
+# backend/scripts/check_shared_tally.py
+# Worker'lar arası ortak sayaç tablosunu (app/core/shared_tally.py) kontrol eder.
+#
+#   python scripts/check_shared_tally.py                 # DB ile tutarlılık raporu
+#   python scripts/check_shared_tally.py --fix           # kalıcı farkları düzelt
+#   python scripts/check_shared_tally.py --stress        # process'ler arası atomiklik
+#   python scripts/check_shared_tally.py --workers 2     # çok worker'lı uçtan uca test
+#
+# --stress: P process aynı slotu M kez artırır; sonuç tam P*M olmalıdır.
+# --workers N: SHARED_TALLY_ENABLED ile N worker'lı uvicorn başlatılır, öğrenciler
+# aynı dünyaya oy verir ve ardından /worlds/top5 ile /worlds/{id} tekrar tekrar
+# okunur; hangi worker cevap verirse versin like_count DB'dekiyle aynı olmalıdır.
+# Karşılaştırmak için --no-tally (her worker kendi skor tablosu) ile çalıştırın.
+# Herhangi bir uyumsuzlukta exit code 1 ile çıkar.
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import tempfile
+
+import httpx
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from benchlib import API_PREFIX, ServerProcess, login, seed_bench_participants, seed_bench_students  # noqa: E402
+from app.core.shared_tally import SharedTally, check_shared_tally, shared_tally  # noqa: E402
+
+
+def _increment(path: str, participant_id: int, count: int):
+    tally = SharedTally(path, capacity=16)
+    tally.open()
+    for _ in range(count):
+        tally.apply_vote(participant_id, 1, 0)
+    tally.close()
+
+
+def stress(processes: int, increments: int) -> int:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tally")
+        tally = SharedTally(path, capacity=16)
+        tally.open()
+        tally.rebuild({1: 0})
+        workers = [
+            multiprocessing.Process(target=_increment, args=(path, 1, increments)) for _ in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        value = tally.get_many([1])[1]
+        tally.close()
+    expected = processes * increments
+    print(f"{processes} process x {increments} artış: {value} (beklenen {expected})")
+    return 0 if value == expected else 1
+
+
+def consistency(fix: bool) -> int:
+    report = asyncio.run(check_shared_tally(fix=fix))
+    print(f"{report.checked} dünya kontrol edildi ({shared_tally.path}), {len(report.mismatches)} kalıcı fark")
+    for mismatch in report.mismatches:
+        state = "düzeltildi" if mismatch.corrected else "düzeltilmedi"
+        print(f"  dünya {mismatch.participant_id}: tablo {mismatch.tally_count}, DB {mismatch.db_count} ({state})")
+    return 0 if fix or not report.mismatches else 1
+
+
+async def _db_like_count(participant_id: int) -> int:
+    from app import crud
+    from app.db.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        return (await crud.crud_participant_async.get_participant(db, participant_id=participant_id)).like_count
+
+
+def _auth(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+# Önceki koşuların oylarını geri alır (oy limiti dolmasın); bu oylar da worker'lara dağılır
+async def _clear_votes(client: httpx.AsyncClient, token: str):
+    for vote in (await client.get(f"{API_PREFIX}/votes/my-votes", headers=_auth(token))).json():
+        await client.post(f"{API_PREFIX}/votes", json={"participant_id": vote["participant_id"]}, headers=_auth(token))
+
+
+async def end_to_end(base_url: str, students: int, reads: int) -> int:
+    emails = seed_bench_students(students)
+    seed_bench_participants(10)
+    # Keep-alive kapalı: her istek yeni bağlantıyla gider, worker'lara dağılır
+    limits = httpx.Limits(max_keepalive_connections=0)
+    async with httpx.AsyncClient(base_url=base_url, timeout=30, limits=limits) as client:
+        tokens = [await login(client, email) for email in emails]
+        target = (await client.get(f"{API_PREFIX}/worlds?limit=1")).json()[0]["id"]
+        await asyncio.gather(*(_clear_votes(client, token) for token in tokens))
+        # Tüm öğrenciler hedef dünyaya aynı anda oy verir; istekler worker'lara dağılır
+        responses = await asyncio.gather(*(
+            client.post(f"{API_PREFIX}/votes", json={"participant_id": target}, headers=_auth(token))
+            for token in tokens
+        ))
+        failed = [r.status_code for r in responses if r.status_code != 200]
+        if failed:
+            print(f"Oy istekleri başarısız: {failed}")
+            return 1
+        expected = await _db_like_count(target)
+
+        stale = {"worlds/top5": 0, "worlds/{id}": 0, "worlds/{id}/rank": 0}
+        for _ in range(reads):
+            top = (await client.get(f"{API_PREFIX}/worlds/top5")).json()
+            counts = {world["id"]: world["like_count"] for world in top}
+            if target in counts and counts[target] != expected:
+                stale["worlds/top5"] += 1
+            if (await client.get(f"{API_PREFIX}/worlds/{target}")).json()["like_count"] != expected:
+                stale["worlds/{id}"] += 1
+            if (await client.get(f"{API_PREFIX}/worlds/{target}/rank")).json()["like_count"] != expected:
+                stale["worlds/{id}/rank"] += 1
+
+    print(f"Dünya {target}: DB like_count {expected}, {students} oy, endpoint başına {reads} okuma")
+    for name, count in stale.items():
+        print(f"  {name:<20} bayat okuma: {count}")
+    return 1 if any(stale.values()) else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ortak sayaç tablosu kontrolleri")
+    parser.add_argument("--fix", action="store_true", help="Kalıcı farkları DB değeriyle düzelt")
+    parser.add_argument("--stress", action="store_true", help="Process'ler arası atomik artış testi")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--increments", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=0, help="Uçtan uca test için uvicorn worker sayısı")
+    parser.add_argument("--no-tally", action="store_true", help="Uçtan uca testi SHARED_TALLY_ENABLED=false ile çalıştır")
+    parser.add_argument("--students", type=int, default=20)
+    parser.add_argument("--reads", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.stress:
+        sys.exit(stress(args.processes, args.increments))
+    if args.workers:
+        with tempfile.TemporaryDirectory() as directory:
+            env = {
+                "SHARED_TALLY_ENABLED": "false" if args.no_tally else "true",
+                "SHARED_TALLY_PATH": os.path.join(directory, "tally"),
+                "VOTE_RATE_LIMIT_PER_SECOND": "0",
+            }
+            with ServerProcess(workers=args.workers, extra_env=env) as server:
+                sys.exit(asyncio.run(end_to_end(server.base_url, args.students, args.reads)))
+    sys.exit(consistency(args.fix))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# backend/scripts/check_vote_concurrency.py
+# Oy motorunun (crud_vote_async.toggle_vote) eşzamanlı tıklamalar altında doğru
+# çalıştığını kontrol eder. Yerel bir test veritabanında çalıştırın:
+#   python scripts/check_vote_concurrency.py --students 100 --toggles 5
+#
+# İki senaryo çalışır:
+#   1. Her öğrenci kendi 2 dünyasına paralel olarak tek sayıda toggle gönderir;
+#      sonuçta her (öğrenci, dünya) çiftinde tam olarak 1 oy ve like_count'ların
+#      birebir doğru olması beklenir (kayıp artış olmamalı).
+#   2. Her öğrenci 5 farklı dünyaya aynı anda oy verir; limit (2) aşılmamalıdır.
+#   3. Tüm öğrenciler aynı (popüler) dünyaya aynı anda oy verir; süre, satır
+#      kilidi yarışını gösterir. --shards K ile parçalı sayaç modu
+#      (LIKE_COUNTER_SHARDS) ölçülür; karşılaştırmak için --shards 0 ile de çalıştırın.
+# Parçalı modda sayaçlar kontrol edilmeden önce like_count'a toplanır (rollup).
+# Herhangi bir uyumsuzlukta exit code 1 ile çıkar.
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from sqlalchemy import delete, func, select, update  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.security import get_password_hash  # noqa: E402
+from app.crud import crud_like_shards, crud_vote_async  # noqa: E402
+from app.db.database import AsyncSessionLocal, SessionLocal, async_engine  # noqa: E402
+from app.models import Participant, ParticipantLikeShard, Student, Vote  # noqa: E402
+
+PARTICIPANT_PREFIX = "CONC-"
+STUDENT_TEMPLATE = "conc{index}@bench.example.com"
+
+
+# Test için ayrılmış öğrenci ve dünyaları oluşturur, önceki koşunun oylarını temizler
+def prepare_fixtures(student_count: int, participant_count: int):
+    db = SessionLocal()
+    try:
+        serials = [f"{PARTICIPANT_PREFIX}{i:04d}" for i in range(participant_count)]
+        existing = set(db.execute(
+            select(Participant.serial_number).where(Participant.serial_number.in_(serials))
+        ).scalars())
+        db.add_all(
+            Participant(serial_number=s, video_url=f"https://cdn.example/{s}.mp4")
+            for s in serials if s not in existing
+        )
+        emails = [STUDENT_TEMPLATE.format(index=i) for i in range(student_count)]
+        existing = set(db.execute(select(Student.email).where(Student.email.in_(emails))).scalars())
+        hashed = get_password_hash("unused")
+        db.add_all(Student(email=e, hashed_password=hashed) for e in emails if e not in existing)
+        db.commit()
+
+        participant_ids = list(db.execute(
+            select(Participant.id).where(Participant.serial_number.in_(serials)).order_by(Participant.id)
+        ).scalars())
+        student_ids = list(db.execute(
+            select(Student.id).where(Student.email.in_(emails)).order_by(Student.id)
+        ).scalars())
+
+        # Önceki koşudan kalan durumu sıfırla (sadece bu script'in kayıtları)
+        db.execute(delete(Vote).where(Vote.participant_id.in_(participant_ids)))
+        db.execute(delete(Vote).where(Vote.student_id.in_(student_ids)))
+        db.execute(delete(ParticipantLikeShard).where(ParticipantLikeShard.participant_id.in_(participant_ids)))
+        db.execute(update(Participant).where(Participant.id.in_(participant_ids)).values(like_count=0))
+        db.commit()
+        return student_ids, participant_ids
+    finally:
+        db.close()
+
+
+async def _toggle(student_id: int, participant_id: int, stats: dict, shards: int):
+    async with AsyncSessionLocal() as db:
+        result = await crud_vote_async.toggle_vote(
+            db, student_id=student_id, participant_id=participant_id,
+            max_votes=settings.MAX_VOTES_PER_STUDENT, shards=shards,
+        )
+    stats[result.action] = stats.get(result.action, 0) + 1
+
+
+# Bekleyen parçalı sayaçları like_count'a toplar (uygulamadaki rollup görevinin yaptığı)
+async def _roll_up():
+    async with AsyncSessionLocal() as db:
+        await crud_like_shards.roll_up_like_shards(db)
+
+
+def _check_counts(participant_ids, expected: dict) -> list:
+    problems = []
+    db = SessionLocal()
+    try:
+        like_counts = dict(db.execute(
+            select(Participant.id, Participant.like_count).where(Participant.id.in_(participant_ids))
+        ).all())
+        vote_counts = dict(db.execute(
+            select(Vote.participant_id, func.count()).where(Vote.participant_id.in_(participant_ids))
+            .group_by(Vote.participant_id)
+        ).all())
+        for pid in participant_ids:
+            actual_votes = vote_counts.get(pid, 0)
+            if like_counts[pid] != actual_votes:
+                problems.append(f"Dünya {pid}: like_count={like_counts[pid]} ama votes={actual_votes}")
+            if expected is not None and expected.get(pid, 0) != actual_votes:
+                problems.append(f"Dünya {pid}: beklenen {expected.get(pid, 0)} oy, bulunan {actual_votes}")
+        over_limit = db.execute(
+            select(Vote.student_id, func.count()).where(Vote.participant_id.in_(participant_ids))
+            .group_by(Vote.student_id).having(func.count() > settings.MAX_VOTES_PER_STUDENT)
+        ).all()
+        for student_id, count in over_limit:
+            problems.append(f"Öğrenci {student_id}: {count} oy (limit {settings.MAX_VOTES_PER_STUDENT})")
+    finally:
+        db.close()
+    return problems
+
+
+async def scenario_exact_counts(student_ids, participant_ids, toggles: int, shards: int):
+    # Tek sayıda toggle -> her çift sonunda "oy verilmiş" olmalı
+    toggles = toggles if toggles % 2 == 1 else toggles + 1
+    jobs, expected = [], {}
+    for student_id in student_ids:
+        for participant_id in random.sample(participant_ids, 2):
+            expected[participant_id] = expected.get(participant_id, 0) + 1
+            jobs.extend([(student_id, participant_id)] * toggles)
+    random.shuffle(jobs)
+    stats = {}
+    started = time.perf_counter()
+    await asyncio.gather(*(_toggle(s, p, stats, shards) for s, p in jobs))
+    elapsed = time.perf_counter() - started
+    print(f"Senaryo 1: {len(jobs)} paralel toggle, {elapsed:.2f} sn ({len(jobs) / elapsed:.0f} toggle/sn), sonuçlar: {stats}")
+    return expected
+
+
+async def scenario_limit(student_ids, participant_ids, shards: int):
+    jobs = [(s, p) for s in student_ids for p in random.sample(participant_ids, 5)]
+    random.shuffle(jobs)
+    stats = {}
+    await asyncio.gather(*(_toggle(s, p, stats, shards) for s, p in jobs))
+    print(f"Senaryo 2: {len(jobs)} paralel oy (öğrenci başına 5 farklı dünya), sonuçlar: {stats}")
+    expected_liked = len(student_ids) * settings.MAX_VOTES_PER_STUDENT
+    if stats.get(crud_vote_async.VOTE_LIKED, 0) != expected_liked:
+        return [f"Beklenen {expected_liked} başarılı oy, bulunan {stats.get(crud_vote_async.VOTE_LIKED, 0)}"]
+    return []
+
+
+async def scenario_hot_world(student_ids, participant_ids, shards: int):
+    hot = participant_ids[0]
+    stats = {}
+    started = time.perf_counter()
+    await asyncio.gather(*(_toggle(s, hot, stats, shards) for s in student_ids))
+    elapsed = time.perf_counter() - started
+    mode = f"{shards} parça" if shards else "parçasız"
+    print(f"Senaryo 3 ({mode}): {len(student_ids)} öğrenci aynı dünyaya, {elapsed:.2f} sn "
+          f"({len(student_ids) / elapsed:.0f} oy/sn), sonuçlar: {stats}")
+    return {hot: len(student_ids)}
+
+
+async def run(args) -> int:
+    student_ids, participant_ids = prepare_fixtures(args.students, args.participants)
+    expected = await scenario_exact_counts(student_ids, participant_ids, args.toggles, args.shards)
+    await _roll_up()
+    problems = _check_counts(participant_ids, expected)
+
+    prepare_fixtures(args.students, args.participants)
+    problems += await scenario_limit(student_ids, participant_ids, args.shards)
+    await _roll_up()
+    problems += _check_counts(participant_ids, None)
+
+    prepare_fixtures(args.students, args.participants)
+    expected = await scenario_hot_world(student_ids, participant_ids, args.shards)
+    await _roll_up()
+    problems += _check_counts(participant_ids, expected)
+    await async_engine.dispose()
+
+    if problems:
+        print("\nHATA: tutarsızlık bulundu:")
+        for problem in problems:
+            print(f"  - {problem}")
+        return 1
+    print("\nTüm sayaçlar birebir doğru, oy limiti korunuyor.")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Oy motorunun eşzamanlılık altında doğruluğunu kontrol eder.")
+    parser.add_argument("--students", type=int, default=100, help="Test öğrencisi sayısı (varsayılan: 100)")
+    parser.add_argument("--participants", type=int, default=10, help="Test dünyası sayısı (varsayılan: 10)")
+    parser.add_argument("--toggles", type=int, default=5, help="Her (öğrenci, dünya) çifti için toggle sayısı, tek sayı (varsayılan: 5)")
+    parser.add_argument("--shards", type=int, default=settings.LIKE_COUNTER_SHARDS,
+                        help="Parçalı sayaç sayısı, 0: kapalı (varsayılan: LIKE_COUNTER_SHARDS)")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
@@ -0,0 +1,203 @@
+# backend/scripts/check_vote_stats.py
+# Oylama analitiği kovalarını (bkz. app/crud/crud_vote_stats.py) günceller ve
+# votes tablosuyla karşılaştırır:
+#   1. dünya başına net oy (added - removed) = watermark'tan önce verilmiş oylar
+#      (watermark'tan sonra silinenler dahil, silmeleri henüz toplanmadı),
+#   2. her saat kovası = o saatin dakika kovalarının toplamı.
+# Uyuşmazlık varsa 1 ile çıkar.
+#
+# --bench N: tek transaction içinde son 24 saate yayılmış N sentetik oy eklenir,
+# kovalar baştan toplanır ve "votes üzerinde GROUP BY date_trunc" ile "kovalardan
+# oku" yolları karşılaştırılır (dünya serisi ve tüm dünyaların saatlik toplamı).
+# Transaction geri alınır; veritabanında iz kalmaz.
+#
+#   python scripts/check_vote_stats.py
+#   python scripts/check_vote_stats.py --bench 500000
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from app import crud  # noqa: E402
+from app.core.vote_stats import _ceil_time, build_series  # noqa: E402
+from app.crud.crud_vote_stats import _ROLLUP_SQL  # noqa: E402
+from app.db.database import AsyncSessionLocal, SessionLocal, async_engine  # noqa: E402
+from app.db.migrate import apply_migrations  # noqa: E402
+
+_NET_MISMATCH_SQL = text("""
+WITH rolled AS (
+    SELECT participant_id, sum(added - removed) AS net FROM vote_stats_hour GROUP BY participant_id
+),
+expected AS (
+    SELECT participant_id, count(*) AS net FROM (
+        SELECT participant_id FROM votes WHERE created_at < :watermark
+        UNION ALL
+        SELECT participant_id FROM vote_deletions WHERE vote_created_at < :watermark AND deleted_at >= :watermark
+    ) t
+    GROUP BY participant_id
+)
+SELECT participant_id, coalesce(rolled.net, 0) AS rolled, coalesce(expected.net, 0) AS expected
+FROM rolled FULL JOIN expected USING (participant_id)
+WHERE coalesce(rolled.net, 0) <> coalesce(expected.net, 0)
+ORDER BY participant_id
+""")
+
+_HOUR_MISMATCH_SQL = text("""
+SELECT coalesce(h.participant_id, m.participant_id) AS participant_id, coalesce(h.bucket, m.bucket) AS bucket
+FROM vote_stats_hour h
+FULL JOIN (
+    SELECT participant_id, date_trunc('hour', bucket, 'UTC') AS bucket, sum(added) AS added, sum(removed) AS removed
+    FROM vote_stats_minute
+    GROUP BY 1, 2
+) m ON m.participant_id = h.participant_id AND m.bucket = h.bucket
+WHERE h.added IS DISTINCT FROM m.added OR h.removed IS DISTINCT FROM m.removed
+""")
+
+# Her sentetik öğrenci iki dünyaya oy verir (oy limiti); oylar son 24 saate yayılır
+_SEED_SQL = [
+    text("""
+    INSERT INTO students (email, hashed_password, full_name)
+    SELECT 'stats-bench-' || i || '@bench.example.com', 'x', 'Stats Bench ' || i
+    FROM generate_series(1, :students) AS i
+    """),
+    text("""
+    INSERT INTO votes (student_id, participant_id, created_at)
+    SELECT s.id, p.id, now() - random() * interval '24 hours'
+    FROM students s
+    CROSS JOIN LATERAL (SELECT id FROM participants ORDER BY id LIMIT 2) p
+    WHERE s.email LIKE 'stats-bench-%'
+    """),
+]
+
+_RAW_PARTICIPANT_SQL = text("""
+SELECT date_trunc('minute', created_at, 'UTC') AS bucket, count(*)::int AS added, 0 AS removed
+FROM votes
+WHERE participant_id = :participant_id AND created_at >= :start AND created_at < :end
+GROUP BY 1
+ORDER BY 1
+""")
+
+_RAW_TOTAL_SQL = text("""
+SELECT date_trunc('hour', created_at, 'UTC') AS bucket, count(*)::int AS added, 0 AS removed
+FROM votes
+WHERE created_at >= :start AND created_at < :end
+GROUP BY 1
+ORDER BY 1
+""")
+
+
+def check() -> int:
+    failures = 0
+    with SessionLocal() as db:
+        db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        watermark = crud.crud_reconcile.get_watermark(db, crud.crud_reconcile.VOTE_STATS_ROLLUP_JOB)
+        rows = db.execute(_NET_MISMATCH_SQL, {"watermark": watermark}).all()
+        for row in rows[:20]:
+            print(f"FAIL dünya {row.participant_id}: kovalar {row.rolled}, votes {row.expected}")
+        failures += len(rows)
+        hours = db.execute(_HOUR_MISMATCH_SQL).all()
+        for row in hours[:20]:
+            print(f"FAIL saat kovası {row.participant_id} {row.bucket}: dakika kovalarının toplamına eşit değil")
+        failures += len(hours)
+        total = db.execute(text("SELECT coalesce(sum(added - removed), 0) FROM vote_stats_hour")).scalar_one()
+    print(f"Watermark: {watermark}, toplam net oy: {total}")
+    return failures
+
+
+async def _timed(repeats: int, func):
+    started = time.perf_counter()
+    for _ in range(repeats):
+        result = await func()
+    return result, (time.perf_counter() - started) / repeats * 1000
+
+
+async def bench(votes: int, repeats: int):
+    end = _ceil_time(datetime.now(timezone.utc), 3600)
+    start = end - timedelta(days=1)
+    async with AsyncSessionLocal() as db:
+        print(f"\n{votes} sentetik oy ekleniyor (transaction sonunda geri alınır)...")
+        for statement in _SEED_SQL:
+            await db.execute(statement, {"students": votes // 2})
+        participant_id = (await db.execute(text("SELECT id FROM participants ORDER BY id LIMIT 1"))).scalar_one()
+        await db.execute(text("DELETE FROM vote_stats_minute"))
+        await db.execute(text("DELETE FROM vote_stats_hour"))
+        started = time.perf_counter()
+        await db.execute(_ROLLUP_SQL, {"since": datetime.min.replace(tzinfo=timezone.utc), "until": end})
+        print(f"Kovaların baştan toplanması: {time.perf_counter() - started:.2f} sn")
+        await db.execute(text("ANALYZE votes"))
+        await db.execute(text("ANALYZE vote_stats_minute"))
+        await db.execute(text("ANALYZE vote_stats_hour"))
+        try:
+            async def raw_participant():
+                rows = (await db.execute(
+                    _RAW_PARTICIPANT_SQL, {"participant_id": participant_id, "start": start, "end": end}
+                )).all()
+                return build_series(rows, start, end, 300, 60)
+
+            async def rolled_participant():
+                rows = await crud.crud_vote_stats.get_participant_buckets(db, participant_id, 60, start, end)
+                return build_series(rows, start, end, 300, 60)
+
+            async def raw_total():
+                rows = (await db.execute(_RAW_TOTAL_SQL, {"start": start, "end": end})).all()
+                return build_series(rows, start, end, 3600, 3600)
+
+            async def rolled_total():
+                rows = await crud.crud_vote_stats.get_total_buckets(db, 3600, start, end)
+                return build_series(rows, start, end, 3600, 3600)
+
+            print(f"\n{'sorgu':<40}{'GROUP BY votes (ms)':>22}{'kovalar (ms)':>16}")
+            for label, raw, rolled in (
+                (f"dünya {participant_id}, 24 sa / 5 dk", raw_participant, rolled_participant),
+                ("tüm dünyalar, 24 sa / 1 sa", raw_total, rolled_total),
+            ):
+                raw_series, raw_ms = await _timed(repeats, raw)
+                rolled_series, rolled_ms = await _timed(repeats, rolled)
+                # Sentetik oylar silinmediği için verilen oy sayıları aynı olmalı
+                same = "" if sum(rolled_series.added) >= sum(raw_series.added) > 0 else "  (UYUŞMAZLIK)"
+                print(f"{label:<40}{raw_ms:>22.2f}{rolled_ms:>16.2f}{same}")
+        finally:
+            await db.rollback()
+    await async_engine.dispose()
+
+
+async def roll_up():
+    async with AsyncSessionLocal() as db:
+        report = await crud.crud_vote_stats.roll_up_vote_stats(db)
+    await async_engine.dispose()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Oylama analitiği kovalarını güncelle ve votes ile karşılaştır")
+    parser.add_argument("--bench", type=int, metavar="N", help="N sentetik oyla GROUP BY / kova karşılaştırması")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    apply_migrations()
+    report = asyncio.run(roll_up())
+    if report.skipped:
+        print("Başka bir worker o an topluyordu; kontrol son toplanmış duruma göre yapılıyor.")
+    else:
+        print(f"Toplandı: {report.since or 'başlangıç'} -> {report.until}: "
+              f"{report.added} oy, {report.removed} geri alma, {report.buckets} dakika kovası")
+    failures = check()
+    if args.bench:
+        asyncio.run(bench(args.bench, args.repeats))
+    if failures:
+        print(f"\n{failures} uyuşmazlık bulundu.")
+        sys.exit(1)
+    print("\nKovalar votes tablosuyla tutarlı.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# backend/scripts/export_results.py
+# Turnuva sonuçlarını dışa aktarır (API'deki GET /api/v1/admin/export/{dataset}
+# ile aynı sorgular ve biçimler, bkz. app/crud/crud_export.py, app/core/export.py).
+# Satırlar server-side cursor ile parça parça okunup yazılır; bellek kullanımı
+# satır sayısından bağımsızdır.
+#
+#   python scripts/export_results.py ranking                          # CSV, stdout
+#   python scripts/export_results.py ballots --format jsonl -o ballots.jsonl.gz --gzip
+#   python scripts/export_results.py ballots --format parquet -o ballots.parquet
+
+import argparse
+import os
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from app.core.config import settings  # noqa: E402
+from app.core.export import EXPORT_CSV, EXPORT_FORMATS, EXPORT_PARQUET, GzipEncoder, export_writer  # noqa: E402
+from app.crud.crud_export import EXPORT_DATASETS, export_columns, stream_export_rows  # noqa: E402
+from app.db.database import SessionLocal  # noqa: E402
+
+
+# Veri setini output'a (binary dosya nesnesi) yazar; (satır, byte) döndürür
+def export(db, dataset: str, export_format: str, output, chunk_size: int, compress: bool = False):
+    writer = export_writer(export_format, export_columns(dataset))
+    gzip = GzipEncoder() if compress else None
+    rows_written = bytes_written = 0
+
+    def emit(data: bytes):
+        nonlocal bytes_written
+        if gzip is not None:
+            data = gzip.compress(data)
+        output.write(data)
+        bytes_written += len(data)
+
+    emit(writer.begin())
+    for rows in stream_export_rows(db, dataset, chunk_size):
+        emit(writer.write(rows))
+        rows_written += len(rows)
+    emit(writer.finish())
+    if gzip is not None:
+        tail = gzip.flush()
+        output.write(tail)
+        bytes_written += len(tail)
+    return rows_written, bytes_written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Turnuva sonuçlarını dışa aktar (sıralama / oy pusulaları)")
+    parser.add_argument("dataset", choices=sorted(EXPORT_DATASETS))
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default=EXPORT_CSV)
+    parser.add_argument("-o", "--output", help="Çıktı dosyası (verilmezse stdout; Parquet için zorunlu)")
+    parser.add_argument("--gzip", action="store_true", help="Çıktıyı gzip ile sıkıştır (CSV / JSON Lines)")
+    parser.add_argument("--chunk-size", type=int, default=settings.EXPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    if args.format == EXPORT_PARQUET and not args.output:
+        parser.error("Parquet çıktısı için --output verin")
+
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+    started = time.perf_counter()
+    try:
+        with SessionLocal() as db:
+            rows, size = export(db, args.dataset, args.format, output, args.chunk_size, compress=args.gzip)
+    finally:
+        if args.output:
+            output.close()
+    elapsed = time.perf_counter() - started
+    print(
+        f"{args.dataset}: {rows} satır, {size / 1024:.1f} KiB, {elapsed:.2f} sn "
+        f"({rows / elapsed if elapsed > 0 else 0:.0f} satır/sn)",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
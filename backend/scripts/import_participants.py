@@ -1,9 +1,24 @@
 # backend/scripts/import_participants.py
+# Excel (.xlsx) veya CSV dosyasından katılımcıları akış (streaming) halinde aktarır.
+# Dosya satır satır okunur (openpyxl read-only / csv), sabit boyutlu parçalar
+# (chunk) halinde işlenir; her parça tek bir INSERT ... ON CONFLICT (serial_number)
+# DO UPDATE ile ayrı transaction'da yazılır. Bellek kullanımı dosya boyutundan
+# bağımsızdır (aynı anda sadece bir parça bellekte tutulur).
+#
+#   python scripts/import_participants.py dunyalar.xlsx
+#   python scripts/import_participants.py dunyalar.csv --dry-run      # sadece farkları göster
+#   python scripts/import_participants.py dunyalar.csv                # hata sonrası kaldığı yerden devam eder
+#   python scripts/import_participants.py dunyalar.csv --start-chunk 12
 
 import os
 import sys
-import pandas as pd
-from sqlalchemy.orm import Session
+import csv
+import json
+import time
+from itertools import islice
+from sqlalchemy import literal_column, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.sql import func
 from dotenv import load_dotenv
 import argparse
 
@@ -26,110 +41,239 @@ except ImportError as e:
 load_dotenv()
 print("Participant import script başlatıldı...")
 
-# DB Session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-# Ana import fonksiyonu
-def import_participants_from_excel(file_path: str, sheet_name: str = 'Sheet1',
-                                   serial_col: str = 'Serial No', # Varsayılan sütun adı
-                                   url_col: str = 'URL'):          # Varsayılan sütun adı
-    print(f"Excel dosyası okunuyor: {file_path}, Sayfa: {sheet_name}")
+DEFAULT_CHUNK_SIZE = 1000
+
+
+# Dosyanın satırlarını (satır no, seri no, url) olarak akış halinde üretir.
+# .xlsx openpyxl read-only modunda, diğer her şey CSV olarak okunur.
+def iter_participant_rows(file_path: str, sheet_name: str, serial_col: str, url_col: str):
+    if file_path.lower().endswith((".xlsx", ".xlsm")):
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            if sheet_name not in workbook.sheetnames:
+                raise ValueError(f"'{sheet_name}' sayfası bulunamadı. Sayfalar: {workbook.sheetnames}")
+            rows = workbook[sheet_name].iter_rows(values_only=True)
+            header = [str(value).strip() if value is not None else "" for value in next(rows, ())]
+            serial_index, url_index = _column_indexes(header, serial_col, url_col)
+            for row_number, values in enumerate(rows, start=2):
+                yield row_number, _cell(values, serial_index), _cell(values, url_index)
+        finally:
+            workbook.close()
+    else:
+        with open(file_path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.reader(f)
+            header = [value.strip() for value in next(reader, [])]
+            serial_index, url_index = _column_indexes(header, serial_col, url_col)
+            for row_number, values in enumerate(reader, start=2):
+                yield row_number, _cell(values, serial_index), _cell(values, url_index)
+
+
+def _column_indexes(header, serial_col: str, url_col: str):
+    missing = [col for col in (serial_col, url_col) if col not in header]
+    if missing:
+        raise ValueError(f"Gerekli sütunlar bulunamadı: {missing}. Dosyadaki sütunlar: {header}")
+    return header.index(serial_col), header.index(url_col)
+
+
+def _cell(values, index: int) -> str:
+    if index >= len(values) or values[index] is None:
+        return ""
+    return str(values[index]).strip()
+
+
+def chunked(iterable, size: int):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# Parçayı temizler: boş satırları atar, parça içinde tekrar eden seri numaralarında
+# son satır kazanır (tek INSERT ... ON CONFLICT aynı satırı iki kez güncelleyemez).
+# {serial_number: video_url} ve atlanan satır sayısını döndürür.
+def clean_chunk(rows):
+    participants = {}
+    skipped = 0
+    for row_number, serial_number, video_url in rows:
+        if not serial_number or not video_url:
+            print(f"Uyarı: Satır {row_number} atlanıyor (Serial No veya URL boş).")
+            skipped += 1
+            continue
+        if serial_number in participants:
+            skipped += 1
+            del participants[serial_number] # sıralamada son konumuna taşınsın
+        participants[serial_number] = video_url
+    return participants, skipped
+
+
+# Tek statement'lık upsert: yeni seri numaraları eklenir, video_url'i değişenler
+# güncellenir, aynı olanlara dokunulmaz (WHERE ... IS DISTINCT FROM).
+# RETURNING (xmax = 0): satır bu statement'ta eklendiyse true, güncellendiyse false.
+def upsert_chunk(db, participants: dict):
+    stmt = pg_insert(Participant).values(
+        [{"serial_number": serial, "video_url": url} for serial, url in participants.items()]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Participant.serial_number],
+        set_={"video_url": stmt.excluded.video_url, "updated_at": func.now()},
+        where=Participant.video_url.is_distinct_from(stmt.excluded.video_url),
+    ).returning(literal_column("xmax = 0"))
+    flags = db.execute(stmt).scalars().all()
+    inserted = sum(1 for flag in flags if flag)
+    updated = len(flags) - inserted
+    return inserted, updated, len(participants) - len(flags)
+
+
+# --dry-run: parçadaki seri numaralarının DB'deki hallerini tek sorguda okur ve
+# yapılacak değişiklikleri yazdırır (hiçbir şey yazılmaz). Önceki parçalar
+# yazılmadığından, dosyada parçalar arası tekrar eden bir seri no her parçada
+# "+" olarak görünebilir.
+def diff_chunk(db, participants: dict):
+    result = db.execute(
+        text("SELECT serial_number, video_url FROM participants WHERE serial_number = ANY(:serials)"),
+        {"serials": list(participants)},
+    )
+    existing = dict(result.all())
+    inserted = updated = 0
+    for serial_number, video_url in participants.items():
+        if serial_number not in existing:
+            print(f"  + {serial_number}  {video_url}")
+            inserted += 1
+        elif existing[serial_number] != video_url:
+            print(f"  ~ {serial_number}  {existing[serial_number]} -> {video_url}")
+            updated += 1
+    return inserted, updated, len(participants) - inserted - updated
+
+
+# Checkpoint: son başarıyla yazılan parçanın numarası. Dosya, parça boyutu veya
+# dosya değişmişse (boyut/mtime) geçersiz sayılır.
+def _checkpoint_path(file_path: str) -> str:
+    return file_path + ".import-checkpoint.json"
+
+
+def _checkpoint_identity(file_path: str, chunk_size: int) -> dict:
+    stat = os.stat(file_path)
+    return {"file": os.path.abspath(file_path), "size": stat.st_size, "mtime": stat.st_mtime, "chunk_size": chunk_size}
+
+
+def load_checkpoint(file_path: str, chunk_size: int) -> int:
     try:
-        df = pd.read_excel(file_path, sheet_name=sheet_name)
-        print(f"Dosya okundu. Toplam satır: {len(df)}")
-    except FileNotFoundError:
-        print(f"Hata: Belirtilen '{file_path}' dosyası bulunamadı.")
-        return
-    except Exception as e:
-        print(f"Hata: Excel dosyası okunurken bir sorun oluştu: {e}")
-        return
+        with open(_checkpoint_path(file_path)) as f:
+            data = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return 0
+    if data.get("identity") != _checkpoint_identity(file_path, chunk_size):
+        print("Uyarı: Checkpoint bu dosyaya/parça boyutuna ait değil, baştan başlanıyor.")
+        return 0
+    return int(data.get("completed_chunks", 0))
+
 
-    db_gen = get_db()
-    db: Session = next(db_gen)
-    print("Veritabanı bağlantısı kuruldu.")
+def save_checkpoint(file_path: str, chunk_size: int, completed_chunks: int):
+    path = _checkpoint_path(file_path)
+    with open(path + ".tmp", "w") as f:
+        json.dump({"identity": _checkpoint_identity(file_path, chunk_size), "completed_chunks": completed_chunks}, f)
+    os.replace(path + ".tmp", path)
 
-    added_count = 0
-    skipped_count = 0
 
-    # Gerekli sütunları kontrol et
-    required_cols = {serial_col, url_col}
-    if not required_cols.issubset(df.columns):
-        print(f"Hata: Excel dosyasında gerekli sütunlar bulunamadı. Beklenenler: {required_cols}")
-        print(f"Dosyadaki sütunlar: {list(df.columns)}")
-        db.close()
-        return
+# Ana import fonksiyonu. Başarılıysa True döner; bir parça yazılamazsa durur,
+# checkpoint son başarılı parçayı gösterir ve script tekrar çalıştırıldığında
+# oradan devam eder.
+def import_participants(file_path: str, sheet_name: str = 'Sheet1',
+                        serial_col: str = 'Serial No', # Varsayılan sütun adı
+                        url_col: str = 'URL',          # Varsayılan sütun adı
+                        chunk_size: int = DEFAULT_CHUNK_SIZE,
+                        dry_run: bool = False,
+                        start_chunk: int = None) -> bool:
+    if not os.path.exists(file_path):
+        print(f"Hata: Belirtilen '{file_path}' dosyası bulunamadı.")
+        return False
+
+    if start_chunk is None:
+        start_chunk = 0 if dry_run else load_checkpoint(file_path, chunk_size)
+    if start_chunk:
+        print(f"İlk {start_chunk} parça atlanıyor (kaldığı yerden devam).")
 
+    print(f"Dosya okunuyor: {file_path} (parça boyutu: {chunk_size}{', dry-run' if dry_run else ''})")
+    totals = {"rows": 0, "inserted": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+    started = time.perf_counter()
+    chunk_number = 0
     try:
-        for index, row in df.iterrows():
-            print(f"\nSatır {index + 1} işleniyor...")
-            try:
-                # Verileri al
-                serial_number = str(row[serial_col]).strip()
-                video_url = str(row[url_col]).strip()
-
-                # Gerekli alanlar boş mu kontrol et
-                if not serial_number or not video_url:
-                    print(f"Uyarı: Satır {index + 1} atlanıyor (Serial No veya URL boş). Serial No: '{serial_number}', URL: '{video_url}'")
-                    skipped_count += 1
+        with SessionLocal() as db:
+            rows = iter_participant_rows(file_path, sheet_name, serial_col, url_col)
+            for chunk_number, chunk in enumerate(chunked(rows, chunk_size), start=1):
+                if chunk_number <= start_chunk:
                     continue
+                participants, skipped = clean_chunk(chunk)
+                inserted = updated = unchanged = 0
+                if participants:
+                    try:
+                        if dry_run:
+                            inserted, updated, unchanged = diff_chunk(db, participants)
+                            db.rollback()
+                        else:
+                            inserted, updated, unchanged = upsert_chunk(db, participants)
+                            db.commit()
+                    except Exception as e:
+                        db.rollback()
+                        print(f"\nHata: Parça {chunk_number} (satır {chunk[0][0]}-{chunk[-1][0]}) yazılamadı: {str(getattr(e, 'orig', e)).strip()}")
+                        print("Değişiklikler bu parça için geri alındı. Script tekrar çalıştırıldığında "
+                              f"parça {chunk_number}'den devam edilecek (dosyayı düzenlerseniz "
+                              f"--start-chunk {chunk_number - 1} verin).")
+                        return False
+                if not dry_run:
+                    save_checkpoint(file_path, chunk_size, chunk_number)
 
-                # Bu serial_number ile kayıt var mı kontrol et (serial_number UNIQUE olmalı)
-                existing_participant = db.query(Participant).filter(Participant.serial_number == serial_number).first()
-
-                if existing_participant:
-                    print(f"Varolan Katılımcı: {serial_number} zaten kayıtlı, atlanıyor.")
-                    skipped_count += 1
-                else:
-                    # Yeni katılımcı oluştur (like_count varsayılan 0 olacak)
-                    new_participant = Participant(
-                        serial_number=serial_number,
-                        video_url=video_url
-                    )
-                    db.add(new_participant)
-                    print(f"Yeni Katılımcı Eklendi: {serial_number}")
-                    added_count += 1
-
-            except KeyError as e:
-                print(f"Hata: Satır {index + 1} işlenirken sütun bulunamadı: {e}. Sütun adlarını kontrol edin.")
-                skipped_count += 1
-            except Exception as e:
-                print(f"Hata: Satır {index + 1} işlenirken beklenmedik bir hata oluştu: {e}")
-                skipped_count += 1
-
-        print("\nDeğişiklikler veritabanına işleniyor...")
-        db.commit()
-        print("Değişiklikler başarıyla işlendi.")
-
+                totals["rows"] += len(chunk)
+                totals["inserted"] += inserted
+                totals["updated"] += updated
+                totals["unchanged"] += unchanged
+                totals["skipped"] += skipped
+                rate = totals["rows"] / (time.perf_counter() - started)
+                print(f"Parça {chunk_number}: +{inserted} ~{updated} ={unchanged} atlanan {skipped} "
+                      f"({totals['rows']} satır, {rate:.0f} satır/sn)")
+    except ValueError as e:
+        print(f"Hata: {e}")
+        return False
     except Exception as e:
-        print(f"\nVeritabanı işlemi sırasında kritik hata: {e}")
-        print("Değişiklikler geri alınıyor (rollback)...")
-        db.rollback()
-    finally:
-        print("\nVeritabanı bağlantısı kapatılıyor.")
-        db.close()
-
-    print("\n--- Import Özeti ---")
-    print(f"Toplam İşlenen Satır: {len(df)}")
-    print(f"Başarıyla Eklenen Katılımcı Sayısı: {added_count}")
-    print(f"Atlanan (Varolan veya Hatalı) Satır Sayısı: {skipped_count}")
+        print(f"Hata: Dosya okunurken veya veritabanına bağlanırken bir sorun oluştu: {e}")
+        return False
+
+    if not dry_run and os.path.exists(_checkpoint_path(file_path)):
+        os.remove(_checkpoint_path(file_path))
+
+    print(f"\n--- Import Özeti{' (dry-run, hiçbir şey yazılmadı)' if dry_run else ''} ---")
+    print(f"İşlenen Satır: {totals['rows']} ({time.perf_counter() - started:.2f} sn)")
+    print(f"Eklenen Katılımcı: {totals['inserted']}")
+    print(f"URL'i Güncellenen Katılımcı: {totals['updated']}")
+    print(f"Değişmeyen Katılımcı: {totals['unchanged']}")
+    print(f"Atlanan (Boş veya Tekrar) Satır: {totals['skipped']}")
     print("--------------------\nİşlem Tamamlandı.")
+    return True
 
 
 # Komut satırı argümanları
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Excel dosyasından katılımcı bilgilerini PostgreSQL veritabanına aktarır.")
-    parser.add_argument("excel_file", help="Katılımcı bilgilerini içeren Excel dosyasının yolu (.xlsx)")
+    parser = argparse.ArgumentParser(description="Excel veya CSV dosyasından katılımcı bilgilerini PostgreSQL veritabanına aktarır.")
+    parser.add_argument("excel_file", help="Katılımcı bilgilerini içeren dosyanın yolu (.xlsx veya .csv)")
     parser.add_argument("-s", "--sheet", default="Sheet1", help="Excel dosyasındaki sayfa adı (varsayılan: Sheet1)")
     parser.add_argument("--serialcol", default="Serial No", help="Seri Numarası sütununun adı (varsayılan: Serial No)")
     parser.add_argument("--urlcol", default="URL", help="Video URL sütununun adı (varsayılan: URL)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Tek statement'taki satır sayısı (varsayılan: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--dry-run", action="store_true", help="Hiçbir şey yazmadan eklenecek/güncellenecek kayıtları göster")
+    parser.add_argument("--start-chunk", type=int, default=None,
+                        help="Bu kadar parçayı atlayarak başla (varsayılan: checkpoint'ten devam)")
 
     args = parser.parse_args()
 
-    import_participants_from_excel(args.excel_file, sheet_name=args.sheet,
-                                   serial_col=args.serialcol,
-                                   url_col=args.urlcol)
\ No newline at end of file
+    ok = import_participants(args.excel_file, sheet_name=args.sheet,
+                             serial_col=args.serialcol,
+                             url_col=args.urlcol,
+                             chunk_size=args.chunk_size,
+                             dry_run=args.dry_run,
+                             start_chunk=args.start_chunk)
+    sys.exit(0 if ok else 1)
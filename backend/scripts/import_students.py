@@ -1,9 +1,20 @@
 # backend/scripts/import_students.py
+# Excel dosyasından öğrencileri toplu olarak aktarır. Aşamalar:
+#   1. Okuma            : pd.read_excel
+#   2. Temizleme        : pandas ile vektörel trim/lower, boş satırları ve dosya içi
+#                         tekrar eden email'leri ayıklama
+#   3. Varlık kontrolü  : tek sorgu (email = ANY(:emails)) ile zaten kayıtlı olanlar
+#   4. Hash'leme        : bcrypt, tüm çekirdeklere yayılmış process havuzunda
+#   5. Yazma            : parçalar (chunk) halinde çok satırlı INSERT ... ON CONFLICT DO NOTHING
+# Sonunda her aşamanın süresi ve throughput'u yazdırılır.
 
 import os
 import sys
+import time
 import pandas as pd
-from sqlalchemy.orm import Session
+from concurrent.futures import ProcessPoolExecutor
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from dotenv import load_dotenv
 import argparse
 
@@ -24,21 +35,110 @@ except ImportError as e:
 load_dotenv()
 print("Script başlatıldı...")
 
-# DB Session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+DEFAULT_CHUNK_SIZE = 1000
+
+
+# Aşama sürelerini ölçüp sonunda tablo olarak yazdırır
+class StageTimer:
+    def __init__(self):
+        self.stages = []
+
+    def record(self, name: str, rows: int, seconds: float):
+        self.stages.append((name, rows, seconds))
+
+    def run(self, name: str, rows: int, func, *args, **kwargs):
+        started = time.perf_counter()
+        result = func(*args, **kwargs)
+        self.record(name, rows, time.perf_counter() - started)
+        return result
+
+    def report(self):
+        total = sum(seconds for _, _, seconds in self.stages)
+        print("\n--- Aşama Süreleri ---")
+        print(f"{'aşama':<20}{'satır':>10}{'süre (sn)':>12}{'satır/sn':>12}{'pay':>8}")
+        for name, rows, seconds in self.stages:
+            rate = rows / seconds if seconds > 0 else 0.0
+            share = seconds / total * 100 if total > 0 else 0.0
+            print(f"{name:<20}{rows:>10}{seconds:>12.2f}{rate:>12.0f}{share:>7.1f}%")
+        print(f"{'toplam':<20}{'':>10}{total:>12.2f}")
+
+
+# Vektörel temizleme: trim, email küçük harf, boş email/şifreli satırları ve
+# dosya içinde tekrar eden email'leri (ilki kalır) ayıklar
+def clean_students(df: pd.DataFrame, fullname_col: str, email_col: str, password_col: str):
+    cleaned = pd.DataFrame({
+        "email": df[email_col].astype("string").str.strip().str.lower(),
+        "password": df[password_col].astype("string").str.strip(),
+        "full_name": df[fullname_col].astype("string").str.strip(),
+    })
+    valid = cleaned["email"].fillna("").ne("") & cleaned["password"].fillna("").ne("")
+    invalid_count = int((~valid).sum())
+    cleaned = cleaned[valid]
+    duplicated = cleaned["email"].duplicated(keep="first")
+    duplicate_count = int(duplicated.sum())
+    cleaned = cleaned[~duplicated]
+    # Boş isimler NULL olarak yazılsın
+    cleaned["full_name"] = cleaned["full_name"].replace("", pd.NA)
+    return cleaned.reset_index(drop=True), invalid_count, duplicate_count
+
+
+# Tek sorguda, verilen email'lerden veritabanında zaten kayıtlı olanları döndürür
+def fetch_existing_emails(emails) -> set:
+    with SessionLocal() as db:
+        result = db.execute(text("SELECT email FROM students WHERE email = ANY(:emails)"), {"emails": list(emails)})
+        return {row[0] for row in result}
+
+
+# Şifreleri process havuzunda hash'ler (bcrypt CPU'ya bağlı; her çekirdek bir process)
+def hash_passwords(passwords, workers: int):
+    hashes = []
+    started = time.perf_counter()
+    total = len(passwords)
+    progress_every = max(1, total // 20) # ~%5 adımlarla ilerleme
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, min(64, total // (workers * 8) or 1))
+        for hashed in executor.map(get_password_hash, passwords, chunksize=chunksize):
+            hashes.append(hashed)
+            done = len(hashes)
+            if done % progress_every == 0 or done == total:
+                rate = done / (time.perf_counter() - started)
+                print(f"  Hash'lenen: {done}/{total} ({rate:.0f} şifre/sn)")
+    return hashes
+
+
+# Parçalar halinde çok satırlı INSERT; her parça ayrı transaction'dır.
+# ON CONFLICT DO NOTHING: varlık kontrolünden sonra başka bir süreç aynı email'i
+# eklediyse satır sessizce atlanır. Eklenen satır sayısını döndürür.
+def insert_students(records, chunk_size: int) -> int:
+    inserted = 0
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        for start in range(0, len(records), chunk_size):
+            chunk = records[start:start + chunk_size]
+            stmt = pg_insert(Student).values(chunk).on_conflict_do_nothing(index_elements=["email"])
+            inserted += db.execute(stmt).rowcount
+            db.commit()
+            done = start + len(chunk)
+            rate = done / (time.perf_counter() - started)
+            print(f"  Yazılan: {done}/{len(records)} ({rate:.0f} satır/sn)")
+    return inserted
+
 
 def import_students_from_excel(file_path: str, sheet_name: str = 'Sheet1',
                                fullname_col: str = 'Ad Soyad', # Varsayılan sütun adı
                                email_col: str = 'Email',
-                               password_col: str = 'Şifre'):
+                               password_col: str = 'Şifre',
+                               workers: int = None,
+                               chunk_size: int = DEFAULT_CHUNK_SIZE):
+    workers = workers or os.cpu_count() or 1
+    timer = StageTimer()
+
     print(f"Excel dosyası okunuyor: {file_path}, Sayfa: {sheet_name}")
     try:
-        df = pd.read_excel(file_path, sheet_name=sheet_name)
+        # Tüm sütunlar metin olarak okunur (ör. sayısal şifreler "123.0" olmasın)
+        started = time.perf_counter()
+        df = pd.read_excel(file_path, sheet_name=sheet_name, dtype=str)
+        timer.record("okuma", len(df), time.perf_counter() - started)
         print(f"Dosya okundu. Toplam satır: {len(df)}")
     except FileNotFoundError:
         print(f"Hata: Belirtilen '{file_path}' dosyası bulunamadı.")
@@ -47,72 +147,52 @@ def import_students_from_excel(file_path: str, sheet_name: str = 'Sheet1',
         print(f"Hata: Excel dosyası okunurken bir sorun oluştu: {e}")
         return
 
-    db_gen = get_db()
-    db: Session = next(db_gen)
-    print("Veritabanı bağlantısı kuruldu.")
-
-    added_count = 0
-    skipped_count = 0
-
     required_cols = {fullname_col, email_col, password_col}
     if not required_cols.issubset(df.columns):
         print(f"Hata: Excel dosyasında gerekli sütunlar bulunamadı. Beklenenler: {required_cols}")
         print(f"Dosyadaki sütunlar: {list(df.columns)}")
-        db.close()
         return
 
-    try:
-        for index, row in df.iterrows():
-            print(f"\nSatır {index + 1} işleniyor...")
-            try:
-                full_name = str(row[fullname_col]).strip() if pd.notna(row[fullname_col]) else None
-                email = str(row[email_col]).strip().lower()
-                password = str(row[password_col]).strip()
-
-                if not email or not password:
-                    print(f"Uyarı: Satır {index + 1} atlanıyor (Email veya Şifre boş). Email: '{email}', Şifre: '***'")
-                    skipped_count += 1
-                    continue
-
-                existing_student = db.query(Student).filter(Student.email == email).first()
-
-                if existing_student:
-                    print(f"Varolan Öğrenci: {email} zaten kayıtlı, atlanıyor.")
-                    skipped_count += 1
-                else:
-                    hashed_password = get_password_hash(password)
-                    new_student = Student(
-                        email=email,
-                        hashed_password=hashed_password,
-                        full_name=full_name # Tek isim alanını ata
-                    )
-                    db.add(new_student)
-                    print(f"Yeni Öğrenci Eklendi: {email} - İsim: {full_name}")
-                    added_count += 1
-
-            except KeyError as e:
-                print(f"Hata: Satır {index + 1} işlenirken sütun bulunamadı: {e}. Sütun adlarını kontrol edin.")
-                skipped_count += 1
-            except Exception as e:
-                print(f"Hata: Satır {index + 1} işlenirken beklenmedik bir hata oluştu: {e}")
-                skipped_count += 1
-
-        print("\nDeğişiklikler veritabanına işleniyor...")
-        db.commit()
-        print("Değişiklikler başarıyla işlendi.")
+    students, invalid_count, duplicate_count = timer.run(
+        "temizleme", len(df), clean_students, df, fullname_col, email_col, password_col
+    )
+    print(f"Temizlendi: {len(students)} geçerli satır, {invalid_count} boş email/şifre, "
+          f"{duplicate_count} dosya içi tekrar.")
 
+    try:
+        existing = timer.run("varlık kontrolü", len(students), fetch_existing_emails, students["email"].tolist())
     except Exception as e:
-        print(f"\nVeritabanı işlemi sırasında kritik hata: {e}")
-        print("Değişiklikler geri alınıyor (rollback)...")
-        db.rollback()
-    finally:
-        print("\nVeritabanı bağlantısı kapatılıyor.")
-        db.close()
+        print(f"\nVeritabanı sorgusu sırasında kritik hata: {e}")
+        return
+    new_students = students[~students["email"].isin(existing)]
+    print(f"Zaten kayıtlı: {len(existing)}, eklenecek: {len(new_students)}")
 
+    added_count = 0
+    if len(new_students):
+        print(f"Şifreler {workers} process ile hash'leniyor...")
+        hashes = timer.run(
+            "hash'leme", len(new_students), hash_passwords,
+            new_students["password"].tolist(), workers,
+        )
+        records = [
+            {"email": email, "hashed_password": hashed, "full_name": None if pd.isna(full_name) else full_name}
+            for email, full_name, hashed in zip(new_students["email"], new_students["full_name"], hashes)
+        ]
+        print("Veritabanına yazılıyor...")
+        try:
+            added_count = timer.run("yazma", len(records), insert_students, records, chunk_size)
+        except Exception as e:
+            # Önceki parçalar commit edilmiştir; script tekrar çalıştırılırsa kayıtlı
+            # email'ler varlık kontrolünde atlanır
+            print(f"\nVeritabanı işlemi sırasında kritik hata: {e}")
+
+    timer.report()
     print("\n--- Import Özeti ---")
     print(f"Toplam İşlenen Satır: {len(df)}")
     print(f"Başarıyla Eklenen Öğrenci Sayısı: {added_count}")
-    print(f"Atlanan (Varolan veya Hatalı) Satır Sayısı: {skipped_count}")
+    print(f"Atlanan Satır Sayısı: {len(df) - added_count} "
+          f"(boş: {invalid_count}, tekrar: {duplicate_count}, kayıtlı: {len(existing)}, "
+          f"eşzamanlı eklenen: {len(new_students) - added_count})")
     print("--------------------\nİşlem Tamamlandı.")
 
 
@@ -125,10 +205,15 @@ if __name__ == "__main__":
     parser.add_argument("--fullnamecol", default="Ad Soyad", help="Tam İsim (Ad Soyad) sütununun adı (varsayılan: Ad Soyad)")
     parser.add_argument("--emailcol", default="Email", help="Email sütununun adı (varsayılan: Email)")
     parser.add_argument("--passcol", default="Şifre", help="Şifre sütununun adı (varsayılan: Şifre)")
+    parser.add_argument("--workers", type=int, default=None, help="Hash'leme process sayısı (varsayılan: çekirdek sayısı)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Tek INSERT'teki satır sayısı (varsayılan: {DEFAULT_CHUNK_SIZE})")
 
     args = parser.parse_args()
 
     import_students_from_excel(args.excel_file, sheet_name=args.sheet,
                                fullname_col=args.fullnamecol, # Güncellendi
                                email_col=args.emailcol,
-                               password_col=args.passcol)
\ No newline at end of file
+                               password_col=args.passcol,
+                               workers=args.workers,
+                               chunk_size=args.chunk_size)
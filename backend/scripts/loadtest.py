@@ -0,0 +1,291 @@
+# backend/scripts/loadtest.py
+# Oylama zirvesi yük testi: app.main:app'i yerel veritabanına karşı başlatır ve N
+# öğrenciyi simüle eder. Her sanal öğrenci giriş yapar, sonra süre dolana kadar
+# /worlds'e göz atar, /worlds/top5'i açar ve /votes ile oy verir/geri alır.
+# Tarayıcı gibi ETag'leri saklayıp If-None-Match gönderir (304 başarılı sayılır).
+#
+# Endpoint başına throughput, p50/p95/p99, hata oranı ve istek başına DB sorgu
+# sayısı (sunucu DB_QUERY_COUNT_HEADER=true ile başlatılır) raporlanır. Sonuçlar
+# JSON olarak kaydedilir; farklı commit'lerdeki koşular --compare ile
+# karşılaştırılır, gerileme varsa script 1 ile çıkar:
+#
+#   python scripts/loadtest.py --students 200 --duration 30 --output /tmp/before.json
+#   ... değişiklik ...
+#   python scripts/loadtest.py --students 200 --duration 30 --compare /tmp/before.json
+#
+# Eski bir commit'i ölçmek için --app-dir ile git worktree dizini verilebilir.
+# DATABASE_URL yerel (test) veritabanını göstermelidir; script bench öğrencileri oluşturur.
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import httpx
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+from benchlib import (  # noqa: E402
+    API_PREFIX, BENCH_PASSWORD, PROJECT_ROOT, EndpointStats, ServerProcess,
+    print_summary_table, seed_bench_participants, seed_bench_students,
+)
+
+ENDPOINTS = ["POST /auth/login", "GET /worlds", "GET /worlds/top5", "POST /votes"]
+# Karşılaştırmada gerileme sayılan hata oranı artışı (mutlak, 0.01 = 1 puan)
+ERROR_RATE_TOLERANCE = 0.01
+
+
+class SimulatedStudent:
+    def __init__(self, client: httpx.AsyncClient, email: str, stats: Dict[str, EndpointStats],
+                 rng: random.Random, think_ms: float, page_size: int):
+        self.client = client
+        self.email = email
+        self.stats = stats
+        self.rng = rng
+        self.think_ms = think_ms
+        self.page_size = page_size
+        self.headers: Dict[str, str] = {}
+        self.etags: Dict[str, str] = {}
+        self.participant_ids: List[int] = []
+
+    async def _request(self, name: str, method: str, url: str, ok_statuses=(200,), **kwargs) -> Optional[httpx.Response]:
+        stats = self.stats[name]
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            stats.record(0, (time.perf_counter() - started) * 1000, ok=False)
+            return None
+        stats.record(response.status_code, (time.perf_counter() - started) * 1000, response.status_code in ok_statuses)
+        stats.record_db(response.headers)
+        return response
+
+    # Koşullu GET: önceki ETag'i gönderir, 304'te eski gövdeyi kullanmış sayılır
+    async def _get_cached(self, name: str, url: str) -> Optional[httpx.Response]:
+        headers = {"If-None-Match": self.etags[url]} if url in self.etags else {}
+        response = await self._request(name, "GET", url, ok_statuses=(200, 304), headers=headers)
+        if response is not None and response.status_code == 200 and "etag" in response.headers:
+            self.etags[url] = response.headers["etag"]
+        return response
+
+    async def login(self) -> bool:
+        response = await self._request(
+            "POST /auth/login", "POST", f"{API_PREFIX}/auth/login",
+            data={"username": self.email, "password": BENCH_PASSWORD},
+        )
+        if response is None or response.status_code != 200:
+            return False
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return True
+
+    async def browse(self):
+        response = await self._get_cached("GET /worlds", f"{API_PREFIX}/worlds?limit={self.page_size}")
+        if response is not None and response.status_code == 200:
+            self.participant_ids = [world["id"] for world in response.json()]
+
+    async def vote(self):
+        if not self.participant_ids:
+            return
+        # 400 (oy limiti) beklenen bir iş kuralı cevabıdır, hata sayılmaz
+        await self._request(
+            "POST /votes", "POST", f"{API_PREFIX}/votes", ok_statuses=(200, 400),
+            json={"participant_id": self.rng.choice(self.participant_ids)}, headers=self.headers,
+        )
+
+    async def think(self):
+        if self.think_ms > 0:
+            await asyncio.sleep(self.rng.uniform(0.5, 1.5) * self.think_ms / 1000)
+
+    async def run(self, start_delay: float, stop_at: float):
+        await asyncio.sleep(start_delay)
+        if not await self.login():
+            return
+        while time.perf_counter() < stop_at:
+            await self.browse()
+            await self.think()
+            await self._get_cached("GET /worlds/top5", f"{API_PREFIX}/worlds/top5")
+            await self.think()
+            await self.vote()
+            await self.think()
+
+
+async def run_load(base_url: str, emails: List[str], duration: float, ramp_up: float,
+                   think_ms: float, page_size: int, seed: int) -> dict:
+    stats = {name: EndpointStats() for name in ENDPOINTS}
+    limits = httpx.Limits(max_connections=len(emails) + 10, max_keepalive_connections=len(emails) + 10)
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0, limits=limits) as client:
+        started = time.perf_counter()
+        stop_at = started + ramp_up + duration
+        students = [
+            SimulatedStudent(client, email, stats, random.Random(seed + index), think_ms, page_size)
+            for index, email in enumerate(emails)
+        ]
+        # Girişler ramp-up süresine yayılır (herkes aynı milisaniyede bcrypt'e girmesin)
+        await asyncio.gather(*(
+            student.run(ramp_up * index / max(1, len(students)), stop_at)
+            for index, student in enumerate(students)
+        ))
+        elapsed = time.perf_counter() - started
+
+    endpoints = {name: s.summary(elapsed) for name, s in stats.items()}
+    total = EndpointStats()
+    for s in stats.values():
+        total.latencies_ms.extend(s.latencies_ms)
+        total.errors += s.errors
+        for status, count in s.status_counts.items():
+            total.status_counts[status] = total.status_counts.get(status, 0) + count
+        total.db_queries.extend(s.db_queries)
+        total.db_time_ms.extend(s.db_time_ms)
+    return {"elapsed_s": elapsed, "endpoints": endpoints, "total": total.summary(elapsed)}
+
+
+def _git_revision(app_dir: str) -> dict:
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], cwd=app_dir, capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        "subject": git("log", "-1", "--format=%s"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+    }
+
+
+def print_db_table(endpoints: Dict[str, dict]):
+    rows = {name: s for name, s in endpoints.items() if "db_queries_avg" in s}
+    if not rows:
+        return
+    print(f"\n{'endpoint':<28}{'db sorgu/istek':>16}{'en fazla':>10}{'db ms/istek':>13}")
+    for name, s in rows.items():
+        print(f"{name:<28}{s['db_queries_avg']:>16.2f}{s['db_queries_max']:>10}{s['db_time_ms_avg']:>13.2f}")
+
+
+def _change(before: float, after: float) -> str:
+    if before == 0:
+        return "   yeni" if after else "      -"
+    return f"{(after - before) / before * 100:>+6.1f}%"
+
+
+# Önceki bir sonuç dosyasıyla karşılaştırır; gerilemelerin listesini döndürür.
+# Gerileme: p95 veya p99 eşikten fazla arttı, throughput eşikten fazla düştü,
+# hata oranı arttı ya da istek başına DB sorgu sayısı arttı.
+def compare_results(baseline: dict, current: dict, threshold_pct: float) -> List[str]:
+    regressions = []
+    limit = threshold_pct / 100
+    print(f"\n--- Karşılaştırma (önce: {(baseline['meta']['git']['commit'] or '?')[:10]}, "
+          f"sonra: {(current['meta']['git']['commit'] or '?')[:10]}) ---")
+    print(f"{'endpoint':<28}{'rps':>18}{'':>9}{'p95 ms':>18}{'':>9}{'p99 ms':>18}{'':>9}{'db sorgu':>14}")
+    for name, after in current["endpoints"].items():
+        before = baseline["endpoints"].get(name)
+        if before is None or not before["requests"]:
+            continue
+        queries = ""
+        if "db_queries_avg" in before and "db_queries_avg" in after:
+            queries = f"{before['db_queries_avg']:.2f} -> {after['db_queries_avg']:.2f}"
+            if after["db_queries_avg"] > before["db_queries_avg"] + 0.05:
+                regressions.append(f"{name}: istek başına DB sorgusu {queries}")
+        print(
+            f"{name:<28}{before['throughput_rps']:>8.1f} -> {after['throughput_rps']:>6.1f}"
+            f"{_change(before['throughput_rps'], after['throughput_rps']):>9}"
+            f"{before['p95_ms']:>8.1f} -> {after['p95_ms']:>6.1f}{_change(before['p95_ms'], after['p95_ms']):>9}"
+            f"{before['p99_ms']:>8.1f} -> {after['p99_ms']:>6.1f}{_change(before['p99_ms'], after['p99_ms']):>9}"
+            f"{queries:>14}"
+        )
+        for key in ("p95_ms", "p99_ms"):
+            if after[key] > before[key] * (1 + limit) and after[key] - before[key] > 1.0:
+                regressions.append(f"{name}: {key} {before[key]:.1f} -> {after[key]:.1f}")
+        if after["throughput_rps"] < before["throughput_rps"] * (1 - limit):
+            regressions.append(f"{name}: throughput {before['throughput_rps']:.1f} -> {after['throughput_rps']:.1f} rps")
+        if after["error_rate"] > before["error_rate"] + ERROR_RATE_TOLERANCE:
+            regressions.append(f"{name}: hata oranı {before['error_rate']:.2%} -> {after['error_rate']:.2%}")
+    if baseline["meta"]["params"] != current["meta"]["params"]:
+        print("Uyarı: iki koşunun parametreleri farklı; karşılaştırma yanıltıcı olabilir.")
+    return regressions
+
+
+def _parse_env(values: List[str]) -> Dict[str, str]:
+    env = {}
+    for value in values:
+        key, sep, val = value.partition("=")
+        if not sep:
+            raise SystemExit(f"--env KEY=VALUE biçiminde olmalı: {value}")
+        env[key] = val
+    return env
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Oylama zirvesi yük testi: giriş, /worlds, /worlds/top5 ve /votes.")
+    parser.add_argument("--students", type=int, default=100, help="Simüle edilen öğrenci sayısı (varsayılan: 100)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Ramp-up sonrası ölçüm süresi, saniye (varsayılan: 30)")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="Girişlerin yayıldığı süre, saniye (varsayılan: 5)")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="Adımlar arası ortalama bekleme, ms (varsayılan: 0)")
+    parser.add_argument("--page-size", type=int, default=50, help="/worlds?limit= değeri (varsayılan: 50)")
+    parser.add_argument("--participants", type=int, default=100, help="Tablo boşsa oluşturulacak dünya sayısı (varsayılan: 100)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker sayısı (varsayılan: 1)")
+    parser.add_argument("--seed", type=int, default=1, help="Rastgele seçimler için tohum (varsayılan: 1)")
+    parser.add_argument("--app-dir", default=PROJECT_ROOT, help="Ölçülecek backend dizini (ör. eski commit'in git worktree'si)")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="Sunucuya ek ortam değişkeni (tekrarlanabilir)")
+    parser.add_argument("--output", help="Sonuç JSON dosyası (varsayılan: loadtest-<commit>-<zaman>.json)")
+    parser.add_argument("--compare", metavar="BASELINE_JSON", help="Önceki bir sonuç dosyasıyla karşılaştır")
+    parser.add_argument("--threshold", type=float, default=20.0, help="Gerileme eşiği, yüzde (varsayılan: 20)")
+    args = parser.parse_args()
+
+    seed_bench_participants(args.participants)
+    emails = seed_bench_students(args.students)
+
+    git = _git_revision(args.app_dir)
+    server_env = {"DB_QUERY_COUNT_HEADER": "true", **_parse_env(args.env)}
+    print(f"{args.students} öğrenci, {args.duration:.0f} sn (+{args.ramp_up:.0f} sn ramp-up), "
+          f"{args.workers} worker, commit {(git['commit'] or '?')[:10]}{' (değişiklik var)' if git['dirty'] else ''}")
+    with ServerProcess(app_dir=args.app_dir, workers=args.workers, extra_env=server_env) as server:
+        result = asyncio.run(run_load(
+            server.base_url, emails, args.duration, args.ramp_up, args.think_ms, args.page_size, args.seed,
+        ))
+
+    result["meta"] = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git": git,
+        "app_dir": os.path.abspath(args.app_dir),
+        "host": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "server_env": server_env,
+        "params": {
+            "students": args.students, "duration": args.duration, "ramp_up": args.ramp_up,
+            "think_ms": args.think_ms, "page_size": args.page_size, "workers": args.workers, "seed": args.seed,
+        },
+    }
+
+    print_summary_table("Sonuçlar", {**result["endpoints"], "toplam": result["total"]})
+    print_db_table(result["endpoints"])
+    if not result["endpoints"]["GET /worlds"]["requests"]:
+        print("\nUyarı: hiçbir öğrenci giriş yapamadı; login hatalarını kontrol edin.")
+
+    output = args.output or "loadtest-{}-{}.json".format(
+        (git["commit"] or "unknown")[:10], datetime.now().strftime("%Y%m%d-%H%M%S")
+    )
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+    print(f"\nSonuçlar kaydedildi: {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_results(baseline, result, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} gerileme (eşik %{args.threshold:.0f}):")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+        print("\nGerileme yok.")
+
+
+if __name__ == "__main__":
+    main()
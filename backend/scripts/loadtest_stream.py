@@ -0,0 +1,147 @@
+# backend/scripts/loadtest_stream.py
+# /worlds/stream (SSE) için yerel yük testi: tek worker'a binlerce boşta bekleyen
+# bağlantı açar, sunucunun bellek kullanımını ölçer, ardından bir oy patlaması
+# gönderip güncellemenin kaç istemciye ve ne kadar sürede ulaştığını raporlar.
+#
+#   python scripts/loadtest_stream.py --connections 5000 --votes 20
+#
+# Bağlantılar hafif tutulmak için httpx yerine ham asyncio soketleriyle açılır.
+
+import argparse
+import asyncio
+import os
+import resource
+import sys
+import time
+
+import httpx
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+
+from benchlib import (  # noqa: E402
+    API_PREFIX, ServerProcess, login, percentile, seed_bench_participants, seed_bench_students,
+)
+
+
+def _raise_fd_limit(wanted: int):
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    target = min(hard, max(soft, wanted))
+    resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+    return target
+
+
+def _rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+class StreamClient:
+    def __init__(self):
+        self.reader = None
+        self.writer = None
+        self.snapshot_received = False
+        self.first_update_at = None
+        self.updates = 0
+
+    async def connect(self, host: str, port: int):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        self.writer.write(
+            f"GET {API_PREFIX}/worlds/stream HTTP/1.1\r\nHost: {host}\r\nAccept: text/event-stream\r\n\r\n".encode()
+        )
+        await self.writer.drain()
+
+    async def listen(self):
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    return
+                if line.startswith(b"event: snapshot"):
+                    self.snapshot_received = True
+                elif line.startswith(b"event: update"):
+                    self.updates += 1
+                    if self.first_update_at is None:
+                        self.first_update_at = time.perf_counter()
+        except (ConnectionError, asyncio.CancelledError):
+            return
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+async def run(base_url: str, host: str, port: int, server_pid: int, args) -> int:
+    clients = [StreamClient() for _ in range(args.connections)]
+    rss_before = _rss_mb(server_pid)
+    started = time.perf_counter()
+    # Bağlantıları gruplar halinde aç (SYN backlog taşmasın)
+    for i in range(0, len(clients), 200):
+        await asyncio.gather(*(c.connect(host, port) for c in clients[i:i + 200]))
+    listeners = [asyncio.create_task(c.listen()) for c in clients]
+
+    deadline = time.perf_counter() + 30
+    while time.perf_counter() < deadline and not all(c.snapshot_received for c in clients):
+        await asyncio.sleep(0.2)
+    connected = sum(c.snapshot_received for c in clients)
+    connect_seconds = time.perf_counter() - started
+    await asyncio.sleep(args.idle)
+    rss_after = _rss_mb(server_pid)
+    print(f"Açık bağlantı: {connected}/{len(clients)} ({connect_seconds:.1f} sn)")
+    print(f"Sunucu RSS: {rss_before:.1f} MB -> {rss_after:.1f} MB "
+          f"(bağlantı başına ~{(rss_after - rss_before) * 1024 / max(connected, 1):.1f} KB)")
+
+    # Oy patlaması: tek tick içinde birden fazla oy -> istemci başına tek mesaj beklenir
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0) as http:
+        email = seed_bench_students(1)[0]
+        token = await login(http, email)
+        headers = {"Authorization": f"Bearer {token}"}
+        # Öğrencinin zaten oy verdiği bir dünya seçilir ki oy limiti toggle'ı engellemesin
+        my_votes = (await http.get(f"{API_PREFIX}/votes/my-votes", headers=headers)).json()
+        if my_votes:
+            participant_id = my_votes[0]["participant_id"]
+        else:
+            participant_id = (await http.get(f"{API_PREFIX}/worlds")).json()[0]["id"]
+        burst_started = time.perf_counter()
+        for _ in range(args.votes):
+            await http.post(f"{API_PREFIX}/votes", json={"participant_id": participant_id}, headers=headers)
+    await asyncio.sleep(max(2.0, args.idle))
+
+    delivered = [c for c in clients if c.first_update_at is not None]
+    delays = sorted((c.first_update_at - burst_started) * 1000 for c in delivered)
+    messages = [c.updates for c in delivered]
+    print(f"Oy patlaması: {args.votes} oy; güncelleme alan istemci: {len(delivered)}/{connected}")
+    if delays:
+        print(f"İlk güncelleme gecikmesi p50={percentile(delays, 50):.0f} ms, p99={percentile(delays, 99):.0f} ms")
+        print(f"İstemci başına mesaj: min={min(messages)}, max={max(messages)} (oy sayısından az olmalı: birleştirme)")
+
+    for task in listeners:
+        task.cancel()
+    for c in clients:
+        c.close()
+    return 0 if connected == len(clients) and len(delivered) == connected else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/worlds/stream için binlerce boşta bağlantı yük testi.")
+    parser.add_argument("--connections", type=int, default=5000, help="Açılacak SSE bağlantısı (varsayılan: 5000)")
+    parser.add_argument("--votes", type=int, default=20, help="Patlamadaki oy sayısı (varsayılan: 20)")
+    parser.add_argument("--idle", type=float, default=3.0, help="Bağlantılar açıldıktan sonra bekleme, saniye (varsayılan: 3)")
+    args = parser.parse_args()
+
+    # Hem bu süreç hem de başlatılan sunucu için dosya tanıtıcı limitini yükselt
+    limit = _raise_fd_limit(args.connections * 2 + 256)
+    if limit < args.connections + 256:
+        print(f"Uyarı: dosya tanıtıcı limiti ({limit}) {args.connections} bağlantı için yetersiz olabilir.")
+
+    seed_bench_participants(100)
+    with ServerProcess(workers=1) as server:
+        code = asyncio.run(run(server.base_url, "127.0.0.1", server.port, server.process.pid, args))
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# backend/scripts/reconcile_like_counts.py
+# participants.like_count sayaçlarını votes tablosuyla uzlaştırır.
+# Varsayılan olarak sadece son çalışmadan bu yana oyu değişen dünyalar kontrol
+# edilir (bkz. app/crud/crud_reconcile.py); --full tüm dünyaları kontrol eder.
+#
+#   python scripts/reconcile_like_counts.py
+#   python scripts/reconcile_like_counts.py --full --batch-size 200
+
+import os
+import sys
+import time
+import argparse
+from dotenv import load_dotenv
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+try:
+    from app.crud import crud_reconcile
+    from app.db.database import SessionLocal
+except ImportError as e:
+    print(f"Hata: Gerekli modüller import edilemedi. Script'i 'backend' klasöründen çalıştırdığınızdan emin olun.")
+    print(f"Detay: {e}")
+    sys.exit(1)
+
+load_dotenv()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="participants.like_count sayaçlarını votes ile uzlaştırır.")
+    parser.add_argument("--full", action="store_true", help="Watermark'ı yok say, tüm dünyaları kontrol et")
+    parser.add_argument("--batch-size", type=int, default=500, help="Tek transaction'da kontrol edilen dünya sayısı (varsayılan: 500)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        report = crud_reconcile.reconcile_like_counts(db, batch_size=args.batch_size, full=args.full)
+
+    print(f"Aralık: {report.since or 'başlangıç'} -> {report.until}")
+    print(f"Kontrol edilen dünya: {report.checked} ({report.batches} grup, {time.perf_counter() - started:.2f} sn)")
+    if report.corrections:
+        print(f"Düzeltilen dünya: {len(report.corrections)}")
+        for correction in report.corrections:
+            print(f"  participant {correction.participant_id}: {correction.old_count} -> {correction.new_count}")
+    else:
+        print("Sapma bulunamadı.")
+    if report.busy:
+        print(f"Sayaç sürekli değiştiği için düzeltilemeyen dünya: {len(report.busy)} "
+              f"({', '.join(map(str, report.busy[:20]))}); tekrar çalıştırın")
+
+
+if __name__ == "__main__":
+    main()
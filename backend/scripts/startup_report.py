@@ -0,0 +1,114 @@
+# backend/scripts/startup_report.py
+# Soğuk başlangıç raporu: import süreleri paket bazında (python -X importtime),
+# lifespan adımlarının süreleri (bkz. app/core/warmup.py startup_report) ve
+# başlangıçtan sonraki ilk isteklerin gecikmeleri. Uygulama process içinde
+# (httpx ASGITransport) yerel veritabanına karşı çalıştırılır.
+#
+#   python scripts/startup_report.py
+#   python scripts/startup_report.py --no-warmup   # ısınma kapalıyken ilk istekler
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+import httpx
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, SCRIPT_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from benchlib import API_PREFIX, BENCH_EMAIL_TEMPLATE, BENCH_PASSWORD  # noqa: E402
+
+# Başlangıçtan hemen sonra sırayla atılan istekler (ad, method, yol, token gerekli mi)
+FIRST_REQUESTS = [
+    ("login", "POST", "/auth/login", False),
+    ("worlds", "GET", "/worlds?limit=100", False),
+    ("worlds/top5", "GET", "/worlds/top5", False),
+    ("votes/my-votes", "GET", "/votes/my-votes", True),
+    ("bootstrap", "GET", "/bootstrap", True),
+]
+
+
+# `import app.main`i ayrı bir process'te -X importtime ile çalıştırır;
+# kendi (self) süreleri üst seviye pakete göre toplanır: [(paket, ms)]
+def import_times(top: int):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    )
+    totals = defaultdict(float)
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        totals[name.split(".")[0]] += int(self_us) / 1000
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+# Seed ayrı process'te yapılır: get_password_hash ölçülen process'te bcrypt'i
+# önceden yüklemesin
+def seed():
+    subprocess.run(
+        [sys.executable, "-c", "import benchlib; benchlib.seed_bench_students(1); benchlib.seed_bench_participants(100)"],
+        cwd=SCRIPT_DIR, check=True,
+    )
+
+
+async def first_requests(email: str):
+    from app.main import app
+    from app.core.warmup import startup_report
+
+    latencies = []
+    started = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        lifespan_seconds = time.perf_counter() - started
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://report") as client:
+            headers = {}
+            for name, method, path, needs_token in FIRST_REQUESTS:
+                kwargs = {"headers": headers} if needs_token else {}
+                if name == "login":
+                    kwargs["data"] = {"username": email, "password": BENCH_PASSWORD}
+                request_started = time.perf_counter()
+                response = await client.request(method, f"{API_PREFIX}{path}", **kwargs)
+                latencies.append((name, response.status_code, (time.perf_counter() - request_started) * 1000))
+                if name == "login":
+                    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    return lifespan_seconds, startup_report, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Başlangıç süresi ve ilk istek gecikmeleri raporu")
+    parser.add_argument("--no-warmup", action="store_true", help="WARMUP_ENABLED=false ile ölç")
+    parser.add_argument("--top", type=int, default=15, help="Gösterilecek paket sayısı (import süreleri)")
+    args = parser.parse_args()
+    if args.no_warmup:
+        # Settings app import edilirken okunur; bu yüzden import'tan önce ayarlanır
+        os.environ["WARMUP_ENABLED"] = "false"
+
+    seed()
+    email = BENCH_EMAIL_TEMPLATE.format(index=0)
+
+    packages = import_times(args.top)
+    print(f"Import süreleri (import app.main, paket bazında kendi süresi, ilk {args.top}):")
+    for package, ms in packages:
+        print(f"  {package:<24} {ms:>9.1f} ms")
+
+    lifespan_seconds, report, latencies = asyncio.run(first_requests(email))
+    print(f"\nLifespan başlangıcı: {lifespan_seconds * 1000:.1f} ms (ısınma {'kapalı' if args.no_warmup else 'açık'})")
+    for step, seconds in report.steps.items():
+        print(f"  {step:<24} {seconds * 1000:>9.1f} ms")
+    if report.failed:
+        print(f"  başarısız adımlar: {', '.join(report.failed)}")
+
+    print("\nİlk istekler:")
+    for name, status_code, ms in latencies:
+        print(f"  {name:<24} {status_code:>4} {ms:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()